@@ -10,6 +10,16 @@ from layouts.login_layout import get_login_layout
 from layouts.main_layout import get_main_layout
 from callbacks.chart_callbacks import register_callbacks
 from callbacks.filter_callbacks import register_filter_callbacks
+from callbacks.background import create_background_manager
+from callbacks.admin_callbacks import register_admin_callbacks, register_admin_page
+import config
+from data_loader import start_data_refresher, start_stream_ingestion
+from charts.base_chart import BaseChart
+from charts.sampling import configure_point_budget
+from charts.serialization import configure_serialization
+from utils.callback_metrics import CallbackMetrics, instrument_callbacks, register_metrics_endpoint
+from utils.compression import register_compression
+from utils.payload_report import register_payload_report
 
 # Inicializar app
 app = dash.Dash(
@@ -18,9 +28,31 @@ app = dash.Dash(
         dbc.themes.BOOTSTRAP,
         "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
     ],
+    # dcc.Graph usa window.Plotly si existe: los typed arrays en base64
+    # necesitan una versión de plotly.js más nueva que la incluida en Dash,
+    # que se carga de config.PLOTLY_JS_URL (el CDN, salvo que se configure otra)
+    external_scripts=[config.PLOTLY_JS_URL] if config.FIGURE_BINARY_THRESHOLD else [],
     suppress_callback_exceptions=True
 )
 
+# Serialización de figuras: motor JSON rápido, base64 y redondeo opcionales
+configure_serialization(config.FIGURE_BINARY_THRESHOLD, config.FIGURE_FLOAT_DECIMALS)
+
+# Presupuesto de puntos de las dispersiones (muestreo + WebGL)
+configure_point_budget(config.SCATTER_POINT_BUDGET)
+
+# Compresión y cache HTTP. Va antes que el reporte de tamaños: Flask corre los
+# after_request en orden inverso y el reporte debe ver el JSON sin comprimir
+register_compression(
+    app,
+    min_size=config.COMPRESS_MIN_BYTES,
+    static_max_age=config.STATIC_MAX_AGE if config.HTTP_CACHE else 0,
+    etags=config.HTTP_CACHE
+)
+
+# Tamaño de las respuestas por callback (payload_report.format_report())
+payload_report = register_payload_report(app, log=config.PAYLOAD_LOG)
+
 app.title = "Iris Analytics Dashboard"
 
 # Layout principal
@@ -137,13 +169,60 @@ app.layout = get_main_layout()
 # REGISTRAR TODOS LOS CALLBACKS
 # ================================================================
 
+# Cache de figuras compartida entre usuarios (opcional)
+if config.FIGURE_CACHE_SIZE:
+    BaseChart.configure_cache(config.FIGURE_CACHE_SIZE)
+
+# Latencia de cada callback: los register_* reciben una app que los mide
+callback_metrics = CallbackMetrics() if config.CALLBACK_METRICS else None
+instrumented_app = instrument_callbacks(app, callback_metrics)
+if callback_metrics is not None:
+    register_metrics_endpoint(app, callback_metrics, config.METRICS_PATH, config.METRICS_PUBLIC)
+
 # Registrar callbacks
 # Callbacks de autenticación (PRIMERO)
-register_auth_callbacks(app)
+register_auth_callbacks(instrumented_app)
+
+# Gráficas pesadas en procesos aparte (None = en el hilo de la petición)
+background_manager = None
+if config.BACKGROUND_CALLBACKS:
+    background_manager = create_background_manager(config.BACKGROUND_CACHE_DIR)
+
+register_callbacks(instrumented_app, background_manager)
 
-register_callbacks(app)
+register_filter_callbacks(instrumented_app)
 
-register_filter_callbacks(app)
+# Rendimiento de los callbacks para administradores: página /admin (con su
+# propio login) y el panel del dashboard
+register_admin_page(app, callback_metrics, config.ADMIN_PATH)
+register_admin_callbacks(app, callback_metrics)
+
+# Figuras y KPIs de todas las combinaciones de filtros, antes de atender usuarios
+if config.WARMUP_ON_START:
+    from callbacks.warmup import warm_up
+    warm_up(config.WARMUP_WORKERS)
+
+# ================================================================
+# REFRESCO EN CALIENTE DE LA FUENTE DE DATOS
+# ================================================================
+
+def start_background_services():
+    """
+    Inicia los hilos de refresco de la fuente y de ingesta en streaming
+    Con gunicorn se llama en cada worker después del fork (ver
+    gunicorn.conf.py): los hilos del proceso maestro no pasan al hijo.
+    """
+    # Solo tiene sentido con una fuente externa (archivo o directorio)
+    if config.DATA_SOURCE_PATH:
+        start_data_refresher()
+
+    # Ingesta en streaming (spool y/o socket local)
+    if config.STREAMING_ENABLED:
+        start_stream_ingestion()
+
+
+if not config.DEFER_BACKGROUND_SERVICES:
+    start_background_services()
 
 # ================================================================
 # CSS PERSONALIZADO PARA LOGIN
@@ -200,5 +279,12 @@ register_filter_callbacks(app)
 # '''
 
 
+# Servidor de desarrollo (un proceso); en producción: gunicorn (ver wsgi.py)
 if __name__ == "__main__":
+    # El servidor de desarrollo también atiende en varios hilos: una figura de
+    # cada tipo antes de empezar (ver callbacks.warmup.prime_builders)
+    if not config.WARMUP_ON_START:
+        from callbacks.warmup import prime_builders
+        prime_builders()
+
     app.run_server(debug=True, host="0.0.0.0", port=8050)
\ No newline at end of file
@@ -0,0 +1,183 @@
+/*
+ * Callbacks del lado del cliente para el dashboard Iris
+ *
+ * Contador, validación y sugerencias de filtros se calculan en el navegador
+ * a partir del resumen especie × región que publica el servidor en
+ * "filter-summary-store" ({version, total, species, regions, counts}).
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    iris: (function () {
+
+        // ------------------------------------------------------------
+        // Utilidades
+        // ------------------------------------------------------------
+
+        function isAll(value) {
+            return value === undefined || value === null || value === 'all';
+        }
+
+        // Número de filas para la combinación de filtros ('all' no filtra)
+        function countRows(summary, species, region) {
+            var total = 0;
+            summary.species.forEach(function (name, i) {
+                if (!isAll(species) && name !== species) {
+                    return;
+                }
+                summary.regions.forEach(function (regionName, j) {
+                    if (isAll(region) || regionName === region) {
+                        total += summary.counts[i][j];
+                    }
+                });
+            });
+            return total;
+        }
+
+        // Valor más frecuente de una dimensión; los empates se resuelven por
+        // orden alfabético, igual que KpiCube.most_common en el servidor
+        function mostCommon(summary, by, species, region) {
+            var names = by === 'species' ? summary.species : summary.regions;
+            var best = null;
+            var bestCount = 0;
+
+            names.forEach(function (name) {
+                var count = by === 'species'
+                    ? countRows(summary, name, region)
+                    : countRows(summary, species, name);
+                if (count > bestCount) {
+                    best = name;
+                    bestCount = count;
+                }
+            });
+            return best;
+        }
+
+        function title(text) {
+            return text.replace(/\w\S*/g, function (word) {
+                return word.charAt(0).toUpperCase() + word.slice(1).toLowerCase();
+            });
+        }
+
+        // Representación JSON de componentes que entiende el renderer de Dash
+        function icon(className) {
+            return {type: 'I', namespace: 'dash_html_components', props: {className: className}};
+        }
+
+        function alert(children, color, dismissable) {
+            return {
+                type: 'Alert',
+                namespace: 'dash_bootstrap_components',
+                props: {
+                    children: children,
+                    color: color,
+                    className: dismissable ? 'py-2 px-3 mb-2' : 'py-2 px-3',
+                    dismissable: !!dismissable
+                }
+            };
+        }
+
+        function linkButton(label, id) {
+            return {
+                type: 'Button',
+                namespace: 'dash_bootstrap_components',
+                props: {
+                    children: label,
+                    id: id,
+                    color: 'link',
+                    size: 'sm',
+                    className: 'p-0 text-decoration-underline'
+                }
+            };
+        }
+
+        // ------------------------------------------------------------
+        // Callbacks
+        // ------------------------------------------------------------
+
+        return {
+            // Contador de registros filtrados y color según el porcentaje
+            filterCounter: function (species, region, summary) {
+                if (!summary) {
+                    return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+                }
+
+                var total = summary.total;
+                var filtered = countRows(summary, species, region);
+                var percentage = total ? (filtered / total) * 100 : 0;
+
+                var color;
+                if (percentage > 75) {
+                    color = 'success';
+                } else if (percentage > 50) {
+                    color = 'warning';
+                } else if (percentage > 25) {
+                    color = 'info';
+                } else {
+                    color = 'danger';
+                }
+
+                return [
+                    filtered + ' de ' + total + ' registros (' + percentage.toFixed(1) + '%)',
+                    color
+                ];
+            },
+
+            // Advierte cuando la combinación de filtros no tiene (o tiene pocos) datos
+            validateFilters: function (species, region, summary) {
+                if (!summary) {
+                    return window.dash_clientside.no_update;
+                }
+
+                var filtered = countRows(summary, species, region);
+
+                if (filtered === 0) {
+                    return alert([
+                        icon('fas fa-exclamation-triangle me-2'),
+                        '⚠️ No hay datos disponibles para esta combinación de filtros.'
+                    ], 'warning', false);
+                }
+
+                if (filtered < 5) {
+                    return alert([
+                        icon('fas fa-info-circle me-2'),
+                        '📊 Solo ' + filtered + ' registros disponibles. Los resultados pueden ser limitados.'
+                    ], 'info', false);
+                }
+
+                return [];
+            },
+
+            // Sugerencias de filtros con botones para aplicarlas
+            filterSuggestions: function (species, region, summary) {
+                if (!summary) {
+                    return window.dash_clientside.no_update;
+                }
+
+                var suggestions = [];
+
+                if (species === 'all' && region === 'all') {
+                    var topSpecies = mostCommon(summary, 'species', species, region);
+                    if (topSpecies !== null) {
+                        suggestions.push(alert([
+                            icon('fas fa-lightbulb me-2'),
+                            '💡 La especie más común es ' + title(topSpecies) + '. ',
+                            linkButton('Filtrar', {type: 'suggestion-btn', species: topSpecies})
+                        ], 'info', true));
+                    }
+                }
+
+                if (species !== 'all' && region === 'all') {
+                    var topRegion = mostCommon(summary, 'region', species, region);
+                    if (topRegion !== null) {
+                        suggestions.push(alert([
+                            icon('fas fa-map-marker-alt me-2'),
+                            '🌍 Para ' + species + ', la región principal es ' + topRegion + '. ',
+                            linkButton('Aplicar', {type: 'suggestion-btn', region: topRegion})
+                        ], 'success', true));
+                    }
+                }
+
+                return suggestions;
+            }
+        };
+    })()
+});
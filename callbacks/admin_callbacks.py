@@ -0,0 +1,172 @@
+"""
+Páginas de rendimiento de los callbacks (solo administradores)
+
+- register_admin_page: página Flask en /admin con su propio formulario de
+  login; el token queda en una cookie y se valida en el servidor con
+  has_role, igual que show_role_based_content.
+- register_admin_callbacks: el mismo reporte como panel del dashboard. Depende
+  de "session-store", que solo escribe el login de Dash: mientras app.py sirva
+  el layout principal sin ese ruteo, el panel queda oculto.
+"""
+from dash import Input, Output, html
+import dash_bootstrap_components as dbc
+from flask import make_response, redirect, render_template_string, request
+
+from auth.auth_system import auth
+from callbacks.auth_callbacks import has_role
+
+# Cookie con el token de sesión de la página de administración
+ADMIN_COOKIE = "iris_admin_token"
+
+ADMIN_PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+  <meta charset="utf-8">
+  <title>Rendimiento de Callbacks</title>
+  <link rel="stylesheet" href="{{ stylesheet }}">
+</head>
+<body class="bg-light">
+<div class="container py-4">
+  <h4 class="mb-3">Rendimiento de Callbacks</h4>
+  {% if admin %}
+    <form method="post" action="{{ path }}/logout" class="mb-3">
+      <a href="{{ path }}" class="btn btn-outline-primary btn-sm">Actualizar</a>
+      <button class="btn btn-outline-secondary btn-sm">Cerrar sesión</button>
+    </form>
+    {% if rows is none %}
+      <p class="text-muted">La medición de callbacks está desactivada (IRIS_CALLBACK_METRICS=0).</p>
+    {% elif not rows %}
+      <p class="text-muted">Todavía no se ejecutó ningún callback.</p>
+    {% else %}
+      <table class="table table-sm table-striped table-hover" style="font-size: 12px">
+        <thead><tr>
+          <th>Callback</th><th>Llamadas</th><th>Errores</th><th>Prom. ms</th>
+          <th>p50 ms</th><th>p95 ms</th><th>Máx. ms</th><th>KB</th>
+        </tr></thead>
+        <tbody>
+        {% for row in rows %}
+          <tr>
+            <td>{{ row.callback }}</td>
+            <td>{{ "{:,}".format(row.calls) }}</td>
+            <td{% if row.errors %} class="text-danger"{% endif %}>{{ "{:,}".format(row.errors) }}</td>
+            <td>{{ "{:,.1f}".format(row.mean_ms) }}</td>
+            <td>≤ {{ "{:,.0f}".format(row.p50_ms) }}</td>
+            <td>≤ {{ "{:,.0f}".format(row.p95_ms) }}</td>
+            <td>{{ "{:,.1f}".format(row.max_ms) }}</td>
+            <td>{{ "{:,.1f}".format(row.kb) }}</td>
+          </tr>
+        {% endfor %}
+        </tbody>
+      </table>
+    {% endif %}
+  {% else %}
+    {% if error %}<div class="alert alert-danger">{{ error }}</div>{% endif %}
+    <form method="post" action="{{ path }}" style="max-width: 360px">
+      <input class="form-control mb-2" type="email" name="email" placeholder="Email" required>
+      <input class="form-control mb-2" type="password" name="password" placeholder="Contraseña" required>
+      <button class="btn btn-primary w-100">Iniciar sesión</button>
+    </form>
+  {% endif %}
+</div>
+</body>
+</html>
+"""
+
+
+def register_admin_page(app, metrics, path="/admin"):
+    """
+    Publica la página de latencias de los callbacks para administradores
+    Args:
+        app: Aplicación Dash
+        metrics: CallbackMetrics con los contadores (None = sin medición)
+        path: Ruta de la página
+    """
+    path = "/" + path.strip("/")
+
+    def render(admin, error=None, status=200):
+        page = render_template_string(
+            ADMIN_PAGE,
+            admin=admin,
+            error=error,
+            path=path,
+            rows=metrics.summary() if admin and metrics is not None else None,
+            stylesheet=dbc.themes.BOOTSTRAP
+        )
+        return make_response(page, status)
+
+    def admin_page():
+        if request.method == "POST":
+            token, user = auth.authenticate(request.form.get("email", ""),
+                                            request.form.get("password", ""))
+            if token is None or user["role"] != "admin":
+                if token is not None:
+                    auth.logout(token)
+                return render(False, "Credenciales inválidas o usuario sin rol de administrador", 403)
+
+            response = redirect(path)
+            response.set_cookie(ADMIN_COOKIE, token, max_age=8 * 3600, httponly=True,
+                                secure=request.is_secure, samesite="Strict")
+            return response
+
+        session_data = {"authenticated": True, "token": request.cookies.get(ADMIN_COOKIE)}
+        return render(has_role(session_data, "admin", verify=True))
+
+    def admin_logout():
+        token = request.cookies.get(ADMIN_COOKIE)
+        if token:
+            auth.logout(token)
+        response = redirect(path)
+        response.delete_cookie(ADMIN_COOKIE)
+        return response
+
+    app.server.add_url_rule(path, "admin_page", admin_page, methods=["GET", "POST"])
+    app.server.add_url_rule(f"{path}/logout", "admin_logout", admin_logout, methods=["POST"])
+
+
+def register_admin_callbacks(app, metrics):
+    """
+    Registra el panel de latencia de los callbacks
+    Args:
+        app: Aplicación Dash
+        metrics: CallbackMetrics con los contadores (None = sin medición)
+    """
+
+    @app.callback(
+        Output("admin-metrics-table", "children"),
+        [Input("admin-metrics-refresh", "n_clicks"),
+         Input("session-store", "data")]
+    )
+    def update_admin_metrics(n_clicks, session_data):
+        """Tabla de latencias por callback; vacía si la sesión no es de admin"""
+        if not has_role(session_data, "admin", verify=True):
+            return html.Div()
+
+        if metrics is None:
+            return html.P("La medición de callbacks está desactivada (IRIS_CALLBACK_METRICS=0).",
+                          className="text-muted mb-0")
+
+        rows = metrics.summary()
+        if not rows:
+            return html.P("Todavía no se ejecutó ningún callback.", className="text-muted mb-0")
+
+        header = html.Thead(html.Tr([
+            html.Th("Callback"), html.Th("Llamadas"), html.Th("Errores"),
+            html.Th("Prom. ms"), html.Th("p50 ms"), html.Th("p95 ms"),
+            html.Th("Máx. ms"), html.Th("KB")
+        ]))
+        body = html.Tbody([
+            html.Tr([
+                html.Td(row['callback']),
+                html.Td(f"{row['calls']:,}"),
+                html.Td(f"{row['errors']:,}", className="text-danger" if row['errors'] else None),
+                html.Td(f"{row['mean_ms']:,.1f}"),
+                html.Td(f"≤ {row['p50_ms']:,.0f}"),
+                html.Td(f"≤ {row['p95_ms']:,.0f}"),
+                html.Td(f"{row['max_ms']:,.1f}"),
+                html.Td(f"{row['kb']:,.1f}")
+            ])
+            for row in rows
+        ])
+
+        return dbc.Table([header, body], size="sm", striped=True, hover=True,
+                         className="mb-0", style={"font-size": "12px"})
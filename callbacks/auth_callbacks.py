@@ -6,6 +6,24 @@ import dash_bootstrap_components as dbc
 from dash import html, dcc
 from auth.auth_system import auth
 
+def has_role(session_data, role, verify=False):
+    """
+    Indica si la sesión pertenece a un usuario con el rol indicado
+    Args:
+        session_data: Datos de "session-store"
+        role: Rol requerido (p. ej. "admin")
+        verify: Si True, valida el token en el servidor y usa el rol guardado
+            ahí (el store del navegador lo puede editar el usuario)
+    """
+    if not session_data or not session_data.get("authenticated"):
+        return False
+    
+    if verify:
+        is_valid, server_session = auth.validate_session(session_data.get("token"))
+        return is_valid and server_session["role"] == role
+    
+    return session_data["user"]["role"] == role
+
 def register_auth_callbacks(app):
     """Registra callbacks de autenticación"""
     
@@ -137,13 +155,8 @@ def register_auth_callbacks(app):
     )
     def show_role_based_content(session_data):
         """Muestra contenido basado en el rol del usuario"""
-        if session_data.get("authenticated"):
-            user_role = session_data["user"]["role"]
-            
-            # Ejemplo: solo admin puede ver ciertos elementos
-            if user_role == "admin":
-                return {"display": "block"}
-            else:
-                return {"display": "none"}
+        # Solo admin puede ver ciertos elementos (panel de rendimiento)
+        if has_role(session_data, "admin"):
+            return {"display": "block"}
         
         return {"display": "none"}
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Callbacks en segundo plano (Dash background callbacks) para gráficas pesadas
+
+Con `dash[diskcache]` instalado, las gráficas costosas se construyen en
+procesos aparte administrados por DiskcacheManager, con barra de progreso y
+botón de cancelar; el hilo que atiende la petición queda libre. Sin esas
+dependencias se registran como callbacks normales.
+"""
+import functools
+import os
+import tempfile
+
+from dash import Input, Output
+
+# Estilos del indicador "{prefijo}-status" mientras corre y al terminar
+STATUS_VISIBLE = {"display": "flex"}
+STATUS_HIDDEN = {"display": "none"}
+
+
+def create_background_manager(cache_dir=None):
+    """
+    Crea el administrador de callbacks en segundo plano
+    Args:
+        cache_dir: Directorio de resultados de diskcache (por defecto uno temporal)
+    Returns:
+        DiskcacheManager, o None si faltan las dependencias opcionales
+    """
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+
+        cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), 'iris-dashboard-callbacks')
+        return DiskcacheManager(diskcache.Cache(cache_dir))
+    except ImportError:
+        print("dash[diskcache] no está instalado (ver requirements-optional.txt); "
+              "las gráficas pesadas se calculan en el hilo de la petición")
+        return None
+
+
+def _ignore_progress(progress):
+    """set_progress de reemplazo cuando el callback no corre en segundo plano"""
+
+
+def heavy_callback(app, manager, prefix, *dependencies, **kwargs):
+    """
+    Decorador para registrar un callback pesado
+    La función recibe set_progress como primer argumento; set_progress((paso,
+    total)) actualiza la barra "{prefix}-progress". El botón
+    "{prefix}-cancel-btn" cancela la construcción en curso.
+    Args:
+        app: Aplicación Dash
+        manager: Administrador de create_background_manager (None = callback normal)
+        prefix: Prefijo de los ids del indicador de progreso en el layout
+        dependencies: Outputs e Inputs, como en app.callback
+    """
+    def decorator(function):
+        if manager is None:
+            @functools.wraps(function)
+            def run_in_request(*args):
+                return function(_ignore_progress, *args)
+
+            return app.callback(*dependencies, **kwargs)(run_in_request)
+
+        return app.callback(
+            *dependencies,
+            background=True,
+            manager=manager,
+            progress=[Output(f"{prefix}-progress", "value"),
+                      Output(f"{prefix}-progress", "max")],
+            running=[(Output(f"{prefix}-status", "style"), STATUS_VISIBLE, STATUS_HIDDEN),
+                     (Output(f"{prefix}-cancel-btn", "disabled"), False, True)],
+            cancel=[Input(f"{prefix}-cancel-btn", "n_clicks")],
+            **kwargs
+        )(function)
+
+    return decorator
@@ -1,41 +1,68 @@
 """
 Callbacks modulares usando las clases de gráficas
 """
-from dash import callback, Input, Output
-from data_loader import load_iris_data
+from dash import callback, Input, Output, State, no_update
+from data_loader import (
+    load_iris_data, filter_iris_data, get_dataset_snapshot, get_query_backend, get_kpi_totals,
+    get_histogram_counts, get_box_summaries, get_moments, get_correlation_matrix
+)
 from charts.time_series import TimeSeriesChart
 from charts.pie_chart import PieChart
 from charts.scatter_chart import ScatterChart
 from charts.bar_chart import BarChart
 from charts.histogram_chart import HistogramChart
+from charts.patching import can_patch, figure_patch
+from charts.serialization import compact_figure
 from charts.box_plot import BoxPlotChart  # ← NUEVO: Import del BoxPlot
 
 #NUEVO
 
 from charts.heatmap import HeatmapChart  # ← Agregar esta línea
+from callbacks.background import heavy_callback
 
-def register_callbacks(app):
-    """Registra todos los callbacks usando clases modulares"""
+def register_callbacks(app, background_manager=None):
+    """
+    Registra todos los callbacks usando clases modulares
+    Args:
+        app: Aplicación Dash
+        background_manager: Administrador de callbacks en segundo plano para
+            las gráficas pesadas (dispersión y mapa de calor); None las
+            calcula en el hilo de la petición
+    """
     
-
     @app.callback(
-    Output("heatmap-chart", "figure"),
-    [Input("species-filter", "value")]
+        Output("dataset-version-store", "data"),
+        Input("live-update-interval", "n_intervals"),
+        State("dataset-version-store", "data"),
+        # Sin llamada inicial: las gráficas que escuchan la versión reciben su
+        # primera figura completa y los cambios posteriores como parches
+        prevent_initial_call=True
     )
-    def update_heatmap_chart(species):
-        """Actualiza heatmap usando clase modular"""
-        df = load_iris_data()
+    def poll_dataset_version(n_intervals, current_version):
+        """Publica la versión del dataset solo cuando llegaron datos nuevos"""
+        version = get_dataset_snapshot().version
         
-        if species != "all":
-            df = df[df['species'] == species]
+        if version == current_version:
+            return no_update
         
-        # Crear instancia de HeatmapChart
-        chart = HeatmapChart(df)
+        return version
+    
+
+    @heavy_callback(
+        app, background_manager, "heatmap",
+        Output("heatmap-chart", "figure"),
+        [Input("species-filter", "value")]
+    )
+    def update_heatmap_chart(set_progress, species):
+        """Actualiza heatmap usando clase modular (en segundo plano si hay manager)"""
+        set_progress((0, 2))
+        fig = build_heatmap_figure(species, set_progress)
         
-        # Generar figura
-        fig = chart.get_figure()
+        # Las variables no cambian: basta con enviar las correlaciones
+        if can_patch("species-filter.value"):
+            return figure_patch(fig, trace_props=('z', 'text'))
         
-        return fig
+        return compact_figure(fig)
 
 
 
@@ -47,21 +74,12 @@ def register_callbacks(app):
          Output("avg-sepal", "children"),
          Output("species-count", "children")],
         [Input("species-filter", "value"),
-         Input("region-filter", "value")]
+         Input("region-filter", "value"),
+         Input("dataset-version-store", "data")]
     )
-    def update_metrics(species, region):
-        """Actualiza las métricas principales"""
-        df = load_iris_data()
-        
-        # Aplicar filtros
-        filtered_df = apply_filters(df, species, region)
-        
-        total_sessions = f"{filtered_df['sessions'].sum():,}"
-        total_users = f"{filtered_df['users'].sum():,}"
-        avg_sepal = f"{filtered_df['sepal length (cm)'].mean():.1f} cm"
-        species_count = filtered_df['species'].nunique()
-        
-        return total_sessions, total_users, avg_sepal, species_count
+    def update_metrics(species, region, data_version):
+        """Actualiza las métricas principales (también al llegar datos nuevos)"""
+        return build_metrics(species, region)
 
     @app.callback(
         Output("time-series-chart", "figure"),
@@ -70,16 +88,13 @@ def register_callbacks(app):
     )
     def update_time_series(species, region):
         """Actualiza gráfica de series de tiempo usando clase modular"""
-        df = load_iris_data()
-        filtered_df = apply_filters(df, species, region)
+        fig = build_time_series_figure(species, region)
         
-        # Crear instancia de la clase TimeSeriesChart
-        chart = TimeSeriesChart(filtered_df)
+        # Fechas y estilo son fijos: solo cambian los valores diarios
+        if can_patch("species-filter.value", "region-filter.value"):
+            return figure_patch(fig, trace_props=('y',))
         
-        # Generar la figura
-        fig = chart.get_figure(date_range_days=30)
-        
-        return fig
+        return compact_figure(fig)
 
     # ← NUEVO: Callback para el box plot
     @app.callback(
@@ -89,88 +104,72 @@ def register_callbacks(app):
     )
     def update_box_plot_chart(species, feature):
         """Actualiza box plot usando clase modular"""
-        df = load_iris_data()
-        
-        # Aplicar filtro de especies si es necesario (pero para box plot es mejor mostrar comparación)
-        # if species != "all":
-        #     df = df[df['species'] == species]
+        # El box plot compara todas las especies: el filtro no lo modifica
+        if can_patch("species-filter.value"):
+            return no_update
         
-        # Crear instancia de BoxPlotChart
-        chart = BoxPlotChart(df)
+        fig = build_box_plot_figure(feature)
         
-        # Generar figura mostrando distribución por especies
-        fig = chart.get_figure(
-            y_column=feature,
-            x_column='species',
-            color_column='species'
-        )
+        # Mismas cajas (una por especie): solo cambian los estadísticos, los
+        # outliers y el eje Y
+        if can_patch("boxplot-feature-selector.value"):
+            return figure_patch(
+                fig,
+                trace_props=('q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean',
+                             'x', 'y'),
+                layout_props=('yaxis.title.text',)
+            )
         
-        return fig
+        return compact_figure(fig)
 
     @app.callback(
         Output("pie-chart", "figure"),
-        [Input("region-filter", "value")]
+        [Input("region-filter", "value"),
+         Input("dataset-version-store", "data")]
     )
-    def update_pie_chart(region):
+    def update_pie_chart(region, data_version):
         """Actualiza gráfica de pie usando clase modular"""
-        df = load_iris_data()
+        fig = build_pie_figure(region)
         
-        # Para el pie chart, filtrar solo por región (mostrar todas las especies)
-        if region != "all":
-            df = df[df['region'] == region]
+        if can_patch("region-filter.value", "dataset-version-store.data"):
+            return figure_patch(
+                fig,
+                trace_props=('labels', 'values', 'marker.colors'),
+                layout_props=('annotations.0.text',)
+            )
         
-        # Crear instancia de PieChart
-        chart = PieChart(df)
-        
-        # Generar figura tipo dona
-        fig = chart.get_figure(value_column='species', is_donut=True)
-        
-        return fig
+        return compact_figure(fig)
 
-    @app.callback(
+    @heavy_callback(
+        app, background_manager, "scatter",
         Output("scatter-chart", "figure"),
         [Input("species-filter", "value"),
          Input("region-filter", "value")]
     )
-    def update_scatter_chart(species, region):
-        """Actualiza gráfica de dispersión usando clase modular"""
-        df = load_iris_data()
-        filtered_df = apply_filters(df, species, region)
-        
-        # Crear instancia de ScatterChart
-        chart = ScatterChart(filtered_df)
-        
-        # Generar figura con línea de regresión
-        fig = chart.get_figure(
-            x_column='sepal length (cm)',
-            y_column='petal length (cm)',
-            color_column='species',
-            add_regression=True
-        )
-        
-        return fig
+    def update_scatter_chart(set_progress, species, region):
+        """Actualiza gráfica de dispersión usando clase modular (en segundo plano si hay manager)"""
+        set_progress((0, 2))
+        # Siempre figura completa: el número de trazas (especies y línea de
+        # regresión) depende de ambos filtros
+        return compact_figure(build_scatter_figure(species, region, set_progress))
 
     @app.callback(
-        Output("bar-chart", "figure"),
-        [Input("species-filter", "value")]
+        [Output("bar-chart", "figure"),
+         Output("bar-chart-traces", "data")],
+        [Input("species-filter", "value"),
+         Input("dataset-version-store", "data")],
+        State("bar-chart-traces", "data")
     )
-    def update_bar_chart(species):
+    def update_bar_chart(species, data_version, current_traces):
         """Actualiza gráfica de barras usando clase modular"""
-        df = load_iris_data()
-        
-        if species != "all":
-            df = df[df['species'] == species]
+        fig = build_bar_figure(species)
         
-        # Crear instancia de BarChart
-        chart = BarChart(df)
+        # El parche asume las mismas trazas que la figura del navegador
+        if (can_patch("species-filter.value", "dataset-version-store.data")
+                and current_traces == len(fig.data)):
+            return figure_patch(fig, trace_props=('x', 'y', 'marker.color')), no_update
         
-        # Generar figura agrupando por región y sumando sesiones
-        fig = chart.get_figure(
-            x_column='region',
-            y_column='sessions'
-        )
-        
-        return fig
+        return compact_figure(fig), len(fig.data)
 
     # ← NUEVO: Callback para el histograma
     @app.callback(
@@ -180,41 +179,175 @@ def register_callbacks(app):
     )
     def update_histogram_chart(species, feature):
         """Actualiza histograma usando clase modular"""
-        df = load_iris_data()
-        
-        # Aplicar filtro de especies si es necesario
-        if species != "all":
-            df = df[df['species'] == species]
+        fig = build_histogram_figure(species, feature)
         
-        # Crear instancia de HistogramChart
-        chart = HistogramChart(df)
+        # Cambiar de variable conserva las trazas (una por especie); cambiar
+        # el filtro de especie cambia cuántas hay y requiere la figura completa
+        if can_patch("feature-selector.value"):
+            return figure_patch(
+                fig,
+                trace_props=('x', 'y', 'width', 'hovertemplate'),
+                layout_props=('xaxis.title.text',)
+            )
         
-        # Generar figura con overlapping por especies
-        fig = chart.get_figure(
-            column=feature,
-            color_column='species',
-            overlay=True,
-            bins=25
-        )
-        
-        return fig
+        return compact_figure(fig)
+
+# ================================================================
+# CONSTRUCCIÓN DE FIGURAS (compartida por callbacks y precalentamiento)
+# ================================================================
+
+def build_metrics(species, region):
+    """Textos de las tarjetas de KPIs para una combinación de filtros"""
+    # KPIs desde el cubo pre-agregado o el motor SQL (no recorre las filas en pandas)
+    totals = get_kpi_totals(species, region)
+    
+    total_sessions = f"{int(totals['sum']['sessions']):,}"
+    total_users = f"{int(totals['sum']['users']):,}"
+    avg_sepal = f"{totals['mean']['sepal length (cm)']:.1f} cm"
+    species_count = totals['species_count']
+    
+    return total_sessions, total_users, avg_sepal, species_count
+
+
+def build_heatmap_figure(species, set_progress=None):
+    """
+    Mapa de calor de correlaciones para una especie (o todas)
+    Args:
+        set_progress: Función opcional que recibe (paso, total)
+    """
+    # Correlaciones desde los momentos por especie × región (sin recorrer filas)
+    corr_matrix = get_correlation_matrix(species=species)
+    if set_progress:
+        set_progress((1, 2))
+    
+    # Crear instancia de HeatmapChart con la matriz ya calculada
+    chart = HeatmapChart(corr_matrix)
+    
+    # Generar figura
+    return chart.get_figure(correlation_matrix=True)
+
+
+def build_time_series_figure(species, region):
+    """Serie de tiempo de sesiones y usuarios para los filtros"""
+    filtered_df = filter_iris_data(species, region)
+    
+    # Crear instancia de la clase TimeSeriesChart
+    chart = TimeSeriesChart(filtered_df)
+    
+    # Generar la figura
+    return chart.get_figure(date_range_days=30)
+
+
+def build_box_plot_figure(feature):
+    """Box plot de una variable comparando todas las especies"""
+    # Estadísticos por especie calculados en el servidor (una vez por versión)
+    # Para box plot es mejor mostrar la comparación: no se aplica el filtro de especies
+    summaries = get_box_summaries(feature)
+    
+    # Crear instancia de BoxPlotChart con los estadísticos
+    chart = BoxPlotChart(summaries)
+    
+    # Generar figura mostrando distribución por especies
+    return chart.get_figure(
+        y_column=feature,
+        x_column='species',
+        color_column='species',
+        summarized=True
+    )
+
+
+def build_pie_figure(region):
+    """Dona de conteos por especie para una región (o todas)"""
+    # Para el pie chart, filtrar solo por región (mostrar todas las especies)
+    counts = get_query_backend().counts('species', region=region)
+    
+    # Crear instancia de PieChart con los conteos ya agregados
+    chart = PieChart(counts)
+    
+    # Generar figura tipo dona
+    return chart.get_figure(value_column='species', is_donut=True, weight_column='count')
+
+
+def build_scatter_figure(species, region, set_progress=None):
+    """
+    Dispersión con línea de regresión para los filtros
+    Args:
+        set_progress: Función opcional que recibe (paso, total)
+    """
+    filtered_df = filter_iris_data(species, region)
+    if set_progress:
+        set_progress((1, 2))
+    
+    # Crear instancia de ScatterChart
+    chart = ScatterChart(filtered_df)
+    
+    # Recta de regresión desde los momentos combinables (todas las filas)
+    regression = get_moments(species, region).regression(
+        'sepal length (cm)', 'petal length (cm)'
+    )
+    
+    # Generar figura con línea de regresión
+    return chart.get_figure(
+        x_column='sepal length (cm)',
+        y_column='petal length (cm)',
+        color_column='species',
+        add_regression=True,
+        regression=regression
+    )
+
+
+def build_bar_figure(species):
+    """Barras de sesiones por región para una especie (o todas)"""
+    # Sesiones por región ya sumadas por el backend de consultas
+    sessions_by_region = get_query_backend().group_sum(
+        'region', 'sessions', species=species
+    )
+    
+    # Crear instancia de BarChart
+    chart = BarChart(sessions_by_region)
+    
+    # Generar figura agrupando por región y sumando sesiones
+    return chart.get_figure(
+        x_column='region',
+        y_column='sessions'
+    )
+
+
+def build_histogram_figure(species, feature):
+    """Histograma superpuesto por especie de una variable"""
+    # Conteos por bin calculados en el servidor sobre columnas ya ordenadas
+    counts = get_histogram_counts(feature, species=species, bins=25)
+    
+    # Crear instancia de HistogramChart con los conteos ya agregados
+    chart = HistogramChart(counts)
+    
+    # Generar figura con overlapping por especies
+    return chart.get_figure(
+        column=feature,
+        color_column='species',
+        overlay=True,
+        binned=True
+    )
+
 
 def apply_filters(df, species=None, region=None):
     """
-    Función auxiliar para aplicar filtros
+    Función auxiliar para aplicar filtros a un DataFrame arbitrario
+    (para el dataset del dashboard usar filter_iris_data, que usa el índice)
     Args:
         df: DataFrame a filtrar
         species: Filtro de especies
         region: Filtro de región
     Returns:
-        DataFrame filtrado
+        DataFrame filtrado (copia superficial de df si no hay filtros activos)
     """
-    filtered_df = df.copy()
+    mask = None
     
     if species and species != "all":
-        filtered_df = filtered_df[filtered_df['species'] == species]
+        mask = df['species'] == species
     
     if region and region != "all":
-        filtered_df = filtered_df[filtered_df['region'] == region]
+        region_mask = df['region'] == region
+        mask = region_mask if mask is None else mask & region_mask
     
-    return filtered_df
\ No newline at end of file
+    return df.copy(deep=False) if mask is None else df[mask]
\ No newline at end of file
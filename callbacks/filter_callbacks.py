@@ -1,12 +1,44 @@
 """
 Callbacks para filtros inteligentes y dinámicos
 """
-from dash import callback, Input, Output, State, ALL, no_update, ctx
+from dash import callback, Input, Output, State, ALL, no_update, ctx, ClientsideFunction
 import dash_bootstrap_components as dbc
 from dash import html
-from data_loader import load_iris_data
+from data_loader import get_dataset_snapshot, get_query_backend, get_kpi_totals
+from utils.constants import FILTER_PRESETS
 import pandas as pd
 
+
+def build_filter_summary(snapshot=None):
+    """
+    Resumen compacto de conteos especie × región para los callbacks del navegador
+    Args:
+        snapshot: DatasetSnapshot (por defecto el vigente)
+    Returns:
+        Diccionario con version, total, species, regions y counts, donde
+        counts[i][j] es el número de filas de species[i] en regions[j]
+    """
+    snapshot = snapshot or get_dataset_snapshot()
+    cells = get_query_backend(snapshot).cell_counts()
+
+    species = sorted(str(value) for value in cells['species'].unique())
+    regions = sorted(str(value) for value in cells['region'].unique())
+    counts = [[0] * len(regions) for _ in species]
+
+    species_pos = {value: i for i, value in enumerate(species)}
+    region_pos = {value: j for j, value in enumerate(regions)}
+    for row in cells.itertuples(index=False):
+        counts[species_pos[str(row.species)]][region_pos[str(row.region)]] = int(row.count)
+
+    return {
+        'version': snapshot.version,
+        'total': int(sum(map(sum, counts))),
+        'species': species,
+        'regions': regions,
+        'counts': counts
+    }
+
+
 def register_filter_callbacks(app):
     """Registra callbacks para filtros inteligentes"""
     
@@ -20,12 +52,8 @@ def register_filter_callbacks(app):
     )
     def update_region_options(selected_species):
         """Actualiza opciones de región basado en la especie seleccionada"""
-        df = load_iris_data()
-        
-        if selected_species != 'all':
-            df = df[df['species'] == selected_species]
-        
-        available_regions = df['region'].unique()
+        snapshot = get_dataset_snapshot()
+        available_regions = snapshot.index.values('region', species=selected_species)
         
         options = [{"label": "Todas", "value": "all"}]
         options.extend([
@@ -39,39 +67,26 @@ def register_filter_callbacks(app):
     # 2. CONTADORES DINÁMICOS - Mostrar cuántos datos quedan
     # ================================================================
     
+    # El servidor solo envía el resumen especie × región (una vez por versión
+    # del dataset); contador, validación y sugerencias se calculan en el
+    # navegador (assets/custom.js) sin ida y vuelta al servidor.
+    
     @app.callback(
+        Output('filter-summary-store', 'data'),
+        Input('dataset-version-store', 'data')
+    )
+    def update_filter_summary(data_version):
+        """Publica el resumen de conteos por especie y región"""
+        return build_filter_summary()
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='iris', function_name='filterCounter'),
         [Output('filter-counter', 'children'),
          Output('filter-counter', 'color')],
         [Input('species-filter', 'value'),
-         Input('region-filter', 'value')]
+         Input('region-filter', 'value'),
+         Input('filter-summary-store', 'data')]
     )
-    def update_filter_counter(species, region):
-        """Muestra contador de registros filtrados"""
-        df = load_iris_data()
-        total_records = len(df)
-        
-        # Aplicar filtros
-        if species != 'all':
-            df = df[df['species'] == species]
-        if region != 'all':
-            df = df[df['region'] == region]
-        
-        filtered_records = len(df)
-        percentage = (filtered_records / total_records) * 100
-        
-        # Color según porcentaje
-        if percentage > 75:
-            color = "success"
-        elif percentage > 50:
-            color = "warning"
-        elif percentage > 25:
-            color = "info"
-        else:
-            color = "danger"
-        
-        counter_text = f"{filtered_records} de {total_records} registros ({percentage:.1f}%)"
-        
-        return counter_text, color
     
     # ================================================================
     # 3. RESET FILTERS - Botón para limpiar todos los filtros
@@ -117,19 +132,16 @@ def register_filter_callbacks(app):
     )
     def update_range_sliders(selected_species):
         """Actualiza rangos de sliders basado en datos filtrados"""
-        df = load_iris_data()
-        
-        if selected_species != 'all':
-            df = df[df['species'] == selected_species]
+        totals = get_kpi_totals(species=selected_species)
         
         # Rangos para sepal length
-        sepal_min = df['sepal length (cm)'].min()
-        sepal_max = df['sepal length (cm)'].max()
+        sepal_min = totals['min']['sepal length (cm)']
+        sepal_max = totals['max']['sepal length (cm)']
         sepal_values = [sepal_min, sepal_max]
         
         # Rangos para sepal width
-        width_min = df['sepal width (cm)'].min()
-        width_max = df['sepal width (cm)'].max()
+        width_min = totals['min']['sepal width (cm)']
+        width_max = totals['max']['sepal width (cm)']
         width_values = [width_min, width_max]
         
         return (sepal_min, sepal_max, sepal_values, 
@@ -139,45 +151,15 @@ def register_filter_callbacks(app):
     # 5. FILTROS INTELIGENTES - Sugerencias automáticas
     # ================================================================
     
-    @app.callback(
+    # Especie más común (sin filtros) o región principal de la especie elegida,
+    # con botones {'type': 'suggestion-btn', ...} para aplicar la sugerencia
+    app.clientside_callback(
+        ClientsideFunction(namespace='iris', function_name='filterSuggestions'),
         Output('filter-suggestions', 'children'),
         [Input('species-filter', 'value'),
-         Input('region-filter', 'value')]
+         Input('region-filter', 'value'),
+         Input('filter-summary-store', 'data')]
     )
-    def show_filter_suggestions(species, region):
-        """Muestra sugerencias inteligentes de filtros"""
-        df = load_iris_data()
-        suggestions = []
-        
-        # Sugerencia basada en datos
-        if species == 'all' and region == 'all':
-            # Mostrar la especie más común
-            most_common_species = df['species'].value_counts().index[0]
-            suggestions.append(
-                dbc.Alert([
-                    html.I(className="fas fa-lightbulb me-2"),
-                    f"💡 La especie más común es {most_common_species.title()}. ",
-                    dbc.Button("Filtrar", color="link", size="sm", 
-                              id={'type': 'suggestion-btn', 'species': most_common_species},
-                              className="p-0 text-decoration-underline")
-                ], color="info", className="py-2 px-3 mb-2", dismissable=True)
-            )
-        
-        if species != 'all' and region == 'all':
-            # Mostrar región más común para esa especie
-            species_data = df[df['species'] == species]
-            most_common_region = species_data['region'].value_counts().index[0]
-            suggestions.append(
-                dbc.Alert([
-                    html.I(className="fas fa-map-marker-alt me-2"),
-                    f"🌍 Para {species}, la región principal es {most_common_region}. ",
-                    dbc.Button("Aplicar", color="link", size="sm",
-                              id={'type': 'suggestion-btn', 'region': most_common_region},
-                              className="p-0 text-decoration-underline")
-                ], color="success", className="py-2 px-3 mb-2", dismissable=True)
-            )
-        
-        return suggestions
     
     # ================================================================
     # 6. PRESETS DE FILTROS - Configuraciones predefinidas
@@ -191,17 +173,8 @@ def register_filter_callbacks(app):
     )
     def apply_filter_preset(preset):
         """Aplica configuraciones predefinidas de filtros"""
-        presets = {
-            'all': ('all', 'all'),
-            'setosa-na': ('setosa', 'North America'),
-            'versicolor-eu': ('versicolor', 'Europe'),
-            'virginica-asia': ('virginica', 'Asia'),
-            'large-flowers': ('virginica', 'all'),  # Virginica tiene flores más grandes
-            'small-flowers': ('setosa', 'all')      # Setosa tiene flores más pequeñas
-        }
-        
-        if preset in presets:
-            return presets[preset]
+        if preset in FILTER_PRESETS:
+            return FILTER_PRESETS[preset]
         
         return no_update, no_update
     
@@ -240,31 +213,10 @@ def register_filter_callbacks(app):
     # 8. VALIDACIÓN DE FILTROS - Prevenir configuraciones inválidas
     # ================================================================
     
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='iris', function_name='validateFilters'),
         Output('filter-warning', 'children'),
         [Input('species-filter', 'value'),
-         Input('region-filter', 'value')]
+         Input('region-filter', 'value'),
+         Input('filter-summary-store', 'data')]
     )
-    def validate_filter_combination(species, region):
-        """Valida que la combinación de filtros tenga datos"""
-        df = load_iris_data()
-        
-        # Aplicar filtros
-        if species != 'all':
-            df = df[df['species'] == species]
-        if region != 'all':
-            df = df[df['region'] == region]
-        
-        if len(df) == 0:
-            return dbc.Alert([
-                html.I(className="fas fa-exclamation-triangle me-2"),
-                "⚠️ No hay datos disponibles para esta combinación de filtros."
-            ], color="warning", className="py-2 px-3")
-        
-        if len(df) < 5:
-            return dbc.Alert([
-                html.I(className="fas fa-info-circle me-2"),
-                f"📊 Solo {len(df)} registros disponibles. Los resultados pueden ser limitados."
-            ], color="info", className="py-2 px-3")
-        
-        return []
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Precalentamiento opcional al arrancar la app
+
+El espacio de filtros es pequeño y conocido: se construyen de antemano las
+figuras y KPIs de todas las combinaciones, para que la primera interacción
+de cada usuario sea tan rápida como las siguientes.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from callbacks.chart_callbacks import (
+    build_bar_figure,
+    build_box_plot_figure,
+    build_heatmap_figure,
+    build_histogram_figure,
+    build_metrics,
+    build_pie_figure,
+    build_scatter_figure,
+    build_time_series_figure
+)
+from charts.base_chart import BaseChart
+from data_loader import get_dataset_snapshot, get_query_backend
+from utils.constants import FEATURES, FILTER_PRESETS, REGIONS, SPECIES
+
+
+def _unique(values):
+    """Valores sin repetir, conservando el orden"""
+    return list(dict.fromkeys(values))
+
+
+def warmup_tasks():
+    """
+    Enumera lo que construye cada callback para todos los filtros conocidos
+    Returns:
+        Lista de (función, argumentos); incluye los presets de filtros
+    """
+    species_options = _unique(['all', *SPECIES, *(species for species, _ in FILTER_PRESETS.values())])
+    region_options = _unique(['all', *REGIONS, *(region for _, region in FILTER_PRESETS.values())])
+
+    tasks = []
+
+    # Gráficas y KPIs que dependen de especie y región
+    for species in species_options:
+        for region in region_options:
+            tasks.append((build_metrics, (species, region)))
+            tasks.append((build_time_series_figure, (species, region)))
+            tasks.append((build_scatter_figure, (species, region)))
+
+    # Gráficas que dependen solo de la especie (y de la variable elegida)
+    for species in species_options:
+        tasks.append((build_heatmap_figure, (species,)))
+        tasks.append((build_bar_figure, (species,)))
+        for feature in FEATURES:
+            tasks.append((build_histogram_figure, (species, feature)))
+
+    # Gráficas que dependen solo de la región o solo de la variable
+    for region in region_options:
+        tasks.append((build_pie_figure, (region,)))
+    for feature in FEATURES:
+        tasks.append((build_box_plot_figure, (feature,)))
+
+    return tasks
+
+
+def _split_first_of_each(tasks):
+    """Separa la primera tarea de cada función del resto"""
+    first_of_each = {}
+    for task in tasks:
+        first_of_each.setdefault(task[0], task)
+    parallel = [task for task in tasks if first_of_each[task[0]] is not task]
+    return list(first_of_each.values()), parallel
+
+
+def _run_serial(tasks):
+    """Ejecuta las tareas en orden; retorna cuántas fallaron"""
+    errors = 0
+    for function, args in tasks:
+        try:
+            function(*args)
+        except Exception as e:
+            errors += 1
+            print(f"Error al precalentar {function.__name__}{args}: {e}")
+    return errors
+
+
+def prime_builders():
+    """
+    Construye en serie una figura de cada tipo
+    plotly inicializa de forma diferida las plantillas compartidas (y carga
+    plotly.express y scikit-learn la primera vez) y esa inicialización no es
+    segura entre hilos: hay que hacerla antes de atender peticiones en
+    paralelo. En gunicorn con preload_app se hace en el maestro, antes del fork.
+    Returns:
+        Número de tareas que fallaron
+    """
+    serial, _ = _split_first_of_each(warmup_tasks())
+    return _run_serial(serial)
+
+
+def warm_up(max_workers=4):
+    """
+    Construye en paralelo todas las figuras y KPIs y los deja en cache
+    Activa la cache de figuras de BaseChart si no lo está (o la agranda si
+    no alcanza para todas las combinaciones).
+    Args:
+        max_workers: Hilos de construcción
+    Returns:
+        Diccionario con tasks, errors y seconds
+    """
+    start = time.perf_counter()
+    tasks = warmup_tasks()
+
+    figure_tasks = sum(1 for function, _ in tasks if function is not build_metrics)
+    cache = BaseChart.figure_cache
+    if cache is None or cache.maxsize < figure_tasks:
+        print(f"Cache de figuras ajustada a {figure_tasks * 2} entradas para el precalentamiento")
+        BaseChart.configure_cache(figure_tasks * 2)
+
+    # Dataset, índice y motor de consultas antes de repartir el trabajo
+    get_query_backend(get_dataset_snapshot())
+
+    # Una tarea de cada tipo en serie (ver prime_builders)
+    serial, parallel = _split_first_of_each(tasks)
+    errors = _run_serial(serial)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup') as executor:
+        futures = {executor.submit(function, *args): (function.__name__, args)
+                   for function, args in parallel}
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                errors += 1
+                name, args = futures[future]
+                print(f"Error al precalentar {name}{args}: {e}")
+
+    seconds = time.perf_counter() - start
+    print(f"Precalentamiento: {len(tasks)} figuras/KPIs en {seconds:.1f} s ({errors} errores)")
+
+    return {'tasks': len(tasks), 'errors': errors, 'seconds': seconds}
@@ -1,32 +1,56 @@
 """
 Módulo de gráficas modulares para dashboard
+
+Las clases se importan de forma diferida: `from charts import ScatterChart`
+solo carga el módulo de esa gráfica la primera vez que se usa.
 """
-from .base_chart import BaseChart
-from .time_series import TimeSeriesChart
-from .pie_chart import PieChart
-from .scatter_chart import ScatterChart
-from .bar_chart import BarChart
-from .histogram_chart import HistogramChart
+import importlib
+
+# Módulo donde vive cada clase
+_CHART_MODULES = {
+    'BaseChart': '.base_chart',
+    'TimeSeriesChart': '.time_series',
+    'PieChart': '.pie_chart',
+    'ScatterChart': '.scatter_chart',
+    'BarChart': '.bar_chart',
+    'HistogramChart': '.histogram_chart',
+    'SplomChart': '.splom'
+}
 
 # Exportar todas las clases
 __all__ = [
     'BaseChart',
-    'TimeSeriesChart', 
+    'TimeSeriesChart',
     'PieChart',
     'ScatterChart',
     'BarChart',
-    'HistogramChart'
+    'HistogramChart',
+    'SplomChart'
 ]
 
-# Diccionario para fácil acceso a las gráficas
-CHART_CLASSES = {
-    'time_series': TimeSeriesChart,
-    'pie': PieChart,
-    'scatter': ScatterChart,
-    'bar': BarChart,
-    'histogram': HistogramChart
+# Tipo de gráfica -> nombre de la clase
+CHART_TYPES = {
+    'time_series': 'TimeSeriesChart',
+    'pie': 'PieChart',
+    'scatter': 'ScatterChart',
+    'bar': 'BarChart',
+    'histogram': 'HistogramChart',
+    'splom': 'SplomChart'
 }
 
+def __getattr__(name):
+    """Importa la clase pedida solo cuando se accede a ella"""
+    if name in _CHART_MODULES:
+        module = importlib.import_module(_CHART_MODULES[name], __name__)
+        return getattr(module, name)
+
+    if name == 'CHART_CLASSES':
+        # Diccionario para fácil acceso a las gráficas
+        return {chart_type: __getattr__(class_name)
+                for chart_type, class_name in CHART_TYPES.items()}
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_chart_class(chart_type):
     """
     Obtiene una clase de gráfica por su tipo
@@ -35,7 +59,7 @@ def get_chart_class(chart_type):
     Returns:
         Clase de gráfica correspondiente
     """
-    return CHART_CLASSES.get(chart_type, BaseChart)
+    return __getattr__(CHART_TYPES.get(chart_type, 'BaseChart'))
 
 def create_chart(chart_type, data=None):
     """
@@ -59,7 +83,7 @@ df = pd.read_csv('datos.csv')
 chart = create_chart('time_series', df)
 fig = chart.get_figure()
 
-# Método 2: Importar clase directamente  
+# Método 2: Importar clase directamente
 chart = TimeSeriesChart(df)
 fig = chart.get_figure()
 
@@ -67,4 +91,4 @@ fig = chart.get_figure()
 from charts import *
 chart = ScatterChart(df)
 fig = chart.get_figure(x_column='x', y_column='y')
-"""
\ No newline at end of file
+"""
@@ -1,7 +1,6 @@
 """
 Gráficas de barras (vertical y horizontal)
 """
-import plotly.express as px
 import plotly.graph_objects as go
 from .base_chart import BaseChart
 
@@ -18,6 +17,8 @@ class BarChart(BaseChart):
             orientation: 'vertical' o 'horizontal'
             color_column: Columna para colorear barras
         """
+        import plotly.express as px
+
         if self.data is None or x_column not in self.data.columns:
             return go.Figure()
         
@@ -30,12 +31,12 @@ class BarChart(BaseChart):
             if y_column not in self.data.columns:
                 return go.Figure()
             # Agrupar datos
-            chart_data = self.data.groupby(x_column)[y_column].sum().reset_index()
+            chart_data = self.data.groupby(x_column, observed=True)[y_column].sum().reset_index()
         
         # Crear gráfica según orientación
         if orientation == 'horizontal':
             fig = px.bar(
-                chart_data,
+                self.express_frame(chart_data),
                 x=y_column,
                 y=x_column,
                 orientation='h',
@@ -45,7 +46,7 @@ class BarChart(BaseChart):
             )
         else:
             fig = px.bar(
-                chart_data,
+                self.express_frame(chart_data),
                 x=x_column,
                 y=y_column,
                 color=color_column if color_column and color_column in chart_data.columns else y_column,
@@ -70,13 +71,15 @@ class BarChart(BaseChart):
             y_column: Columna para valores
             group_column: Columna para agrupar barras
         """
+        import plotly.express as px
+
         required_columns = [x_column, y_column, group_column]
         if (self.data is None or 
             not all(col in self.data.columns for col in required_columns)):
             return go.Figure()
         
         fig = px.bar(
-            self.data,
+            self.express_frame(self.data),
             x=x_column,
             y=y_column,
             color=group_column,
@@ -100,13 +103,15 @@ class BarChart(BaseChart):
             y_column: Columna para valores
             stack_column: Columna para apilar
         """
+        import plotly.express as px
+
         required_columns = [x_column, y_column, stack_column]
         if (self.data is None or 
             not all(col in self.data.columns for col in required_columns)):
             return go.Figure()
         
         fig = px.bar(
-            self.data,
+            self.express_frame(self.data),
             x=x_column,
             y=y_column,
             color=stack_column,
@@ -1,12 +1,36 @@
 """
 Clase base para todas las gráficas del dashboard
 """
+import pandas as pd
 import plotly.graph_objects as go
 from abc import ABC, abstractmethod
+from utils.helpers import data_fingerprint, freeze
+from utils.lru_cache import LRUCache
 
 class BaseChart(ABC):
     """Clase base abstracta para todas las gráficas"""
     
+    # Cache de figuras compartida por todas las gráficas (desactivada hasta
+    # llamar a configure_cache)
+    figure_cache = None
+    
+    @classmethod
+    def configure_cache(cls, maxsize=64):
+        """
+        Activa (o desactiva con 0) la memoización de get_figure
+        Las figuras se reutilizan entre usuarios y callbacks: quien las recibe
+        debe tratarlas como solo lectura.
+        Args:
+            maxsize: Número máximo de figuras guardadas
+        """
+        BaseChart.figure_cache = LRUCache(maxsize) if maxsize > 0 else None
+    
+    @staticmethod
+    def cache_stats():
+        """Contadores de aciertos/fallos de la cache de figuras (None si está desactivada)"""
+        cache = BaseChart.figure_cache
+        return cache.stats() if cache is not None else None
+    
     def __init__(self, data=None):
         self.data = data
         self.colors = {
@@ -45,6 +69,23 @@ class BaseChart(ABC):
         fig.update_layout(**self.get_theme())
         return fig
     
+    @staticmethod
+    def express_frame(data):
+        """
+        DataFrame para plotly.express: las columnas categóricas del esquema
+        compacto pasan a object (px las agrupa sin `observed` y pandas avisa
+        en cada gráfica). Sin categóricas retorna el mismo DataFrame.
+        """
+        if not isinstance(data, pd.DataFrame):
+            return data
+        
+        categorical = [column for column, dtype in data.dtypes.items()
+                       if isinstance(dtype, pd.CategoricalDtype)]
+        if not categorical:
+            return data
+        
+        return data.astype({column: object for column in categorical})
+    
     def set_data(self, data):
         """Establece los datos para la gráfica"""
         self.data = data
@@ -55,7 +96,33 @@ class BaseChart(ABC):
         """Método abstracto que debe implementar cada gráfica"""
         pass
     
-    def get_figure(self, **kwargs):
-        """Retorna la figura con tema aplicado"""
+    def cache_key(self, **kwargs):
+        """
+        Llave de la figura: clase, huella de los datos y argumentos
+        Returns:
+            Tupla hashable, o None si algún argumento no es hashable
+        """
+        try:
+            return (type(self).__module__, type(self).__qualname__,
+                    data_fingerprint(self.data), freeze(kwargs))
+        except TypeError:
+            return None
+    
+    def build_figure(self, **kwargs):
+        """Crea la figura y le aplica el tema (sin cache)"""
         fig = self.create_figure(**kwargs)
-        return self.apply_theme(fig)
\ No newline at end of file
+        return self.apply_theme(fig)
+    
+    def get_figure(self, **kwargs):
+        """
+        Retorna la figura con tema aplicado
+        Con la cache activa, la misma clase con los mismos datos y argumentos
+        retorna la figura ya construida (compartida: tratar como solo lectura).
+        """
+        cache = BaseChart.figure_cache
+        key = self.cache_key(**kwargs) if cache is not None else None
+        
+        if key is None:
+            return self.build_figure(**kwargs)
+        
+        return cache.get_or_set(key, lambda: self.build_figure(**kwargs))
\ No newline at end of file
@@ -1,23 +1,32 @@
 """
 Gráfica de box plot (diagrama de caja) para análisis de distribuciones
 """
-import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 from .base_chart import BaseChart
 
 class BoxPlotChart(BaseChart):
     """Gráfica de box plot con diferentes configuraciones"""
     
-    def create_figure(self, y_column, x_column=None, color_column='species', **kwargs):
+    def create_figure(self, y_column, x_column=None, color_column='species',
+                      summarized=False, **kwargs):
         """
         Crea box plot
         Args:
             y_column: Columna numérica para el eje Y
             x_column: Columna categórica para el eje X (opcional)
             color_column: Columna para colorear cajas
+            summarized: Si True, los datos ya son los estadísticos por grupo
+                (ver create_summary_figure)
         """
+        if summarized:
+            return self.create_summary_figure(y_column, x_column, color_column)
+
         if self.data is None or y_column not in self.data.columns:
             return go.Figure()
+
+        # plotly.express solo hace falta con las filas crudas
+        import plotly.express as px
         
         # Si no se especifica x_column, usar color_column como x
         if x_column is None:
@@ -26,7 +35,7 @@ class BoxPlotChart(BaseChart):
         if x_column and x_column in self.data.columns:
             # Box plot por categorías
             fig = px.box(
-                self.data,
+                self.express_frame(self.data),
                 x=x_column,
                 y=y_column,
                 color=color_column if color_column in self.data.columns else None,
@@ -36,7 +45,7 @@ class BoxPlotChart(BaseChart):
         else:
             # Box plot simple
             fig = px.box(
-                self.data,
+                self.express_frame(self.data),
                 y=y_column,
                 color_discrete_sequence=[self.colors['primary']],
                 title=""
@@ -57,23 +66,92 @@ class BoxPlotChart(BaseChart):
         
         return fig
     
-    def create_violin_plot(self, y_column, x_column=None, color_column='species', **kwargs):
+    def create_summary_figure(self, y_column, x_column=None, color_column='species', **kwargs):
+        """
+        Crea box plot a partir de estadísticos calculados en el servidor
+        Una caja precalculada por grupo (q1, mediana, q3, bigotes) más una
+        traza con los outliers ya recortados: el tamaño no depende de las filas.
+        Args:
+            y_column: Columna numérica (título del eje Y)
+            x_column: Columna categórica (título del eje X)
+            color_column: Columna de color; los grupos vienen en la columna 'group'
+        """
+        required_columns = ['group', 'q1', 'median', 'q3', 'lowerfence', 'upperfence']
+        if (self.data is None or 
+            not all(col in self.data.columns for col in required_columns)):
+            return go.Figure()
+        
+        fig = go.Figure()
+        
+        for i, summary in enumerate(self.data.to_dict('records')):
+            group = summary['group']
+            color = self._group_color(group, color_column, i)
+            
+            fig.add_trace(go.Box(
+                x=[group],
+                q1=[summary['q1']],
+                median=[summary['median']],
+                q3=[summary['q3']],
+                lowerfence=[summary['lowerfence']],
+                upperfence=[summary['upperfence']],
+                mean=[summary['mean']] if 'mean' in summary else None,
+                name=group,
+                marker_color=color,
+                line=dict(width=2)
+            ))
+            
+            # Outliers (siempre una traza por grupo, aunque esté vacía)
+            outliers = summary.get('outliers')
+            outliers = outliers if outliers is not None else []
+            fig.add_trace(go.Scatter(
+                x=[group] * len(outliers),
+                y=outliers,
+                mode='markers',
+                name=group,
+                marker=dict(size=4, opacity=0.6, color=color),
+                hovertemplate=f"{group}<br>Outlier: %{{y}}<extra></extra>"
+            ))
+        
+        fig.update_layout(
+            xaxis_title=x_column.replace('_', ' ').title() if x_column else 'Categoría',
+            yaxis_title=y_column.replace('_', ' ').title(),
+            showlegend=False
+        )
+        
+        return fig
+    
+    def _group_color(self, group, color_column, index):
+        """Color de un grupo: el de la especie o uno de la paleta"""
+        if color_column == 'species' and group in self.species_colors:
+            return self.species_colors[group]
+        return list(self.colors.values())[index % len(self.colors)]
+    
+    def create_violin_plot(self, y_column, x_column=None, color_column='species',
+                           summarized=False, **kwargs):
         """
         Crea violin plot (combinación de box plot y densidad)
         Args:
             y_column: Columna numérica para el eje Y
             x_column: Columna categórica para el eje X
             color_column: Columna para colorear
+            summarized: Si True, los datos ya son densidades en una grilla
+                (ver create_summary_violin)
         """
+        if summarized:
+            return self.create_summary_violin(y_column, x_column, color_column)
+
         if self.data is None or y_column not in self.data.columns:
             return go.Figure()
+
+        # plotly.express solo hace falta con las filas crudas
+        import plotly.express as px
         
         if x_column is None:
             x_column = color_column if color_column in self.data.columns else None
         
         if x_column and x_column in self.data.columns:
             fig = px.violin(
-                self.data,
+                self.express_frame(self.data),
                 x=x_column,
                 y=y_column,
                 color=color_column if color_column in self.data.columns else None,
@@ -82,7 +160,7 @@ class BoxPlotChart(BaseChart):
             )
         else:
             fig = px.violin(
-                self.data,
+                self.express_frame(self.data),
                 y=y_column,
                 color_discrete_sequence=[self.colors['primary']],
                 title=""
@@ -94,4 +172,53 @@ class BoxPlotChart(BaseChart):
             showlegend=False
         )
         
-        return fig
\ No newline at end of file
+        return fig
+    
+    def create_summary_violin(self, y_column, x_column=None, color_column='species',
+                              half_width=0.4, **kwargs):
+        """
+        Crea violin plot a partir de densidades calculadas en el servidor
+        Cada violín es una figura rellena simétrica alrededor de su posición.
+        Args:
+            y_column: Columna numérica (título del eje Y)
+            x_column: Columna categórica (título del eje X)
+            color_column: Columna de color; los grupos vienen en la columna 'group'
+            half_width: Medio ancho máximo de cada violín (en unidades del eje X)
+        """
+        required_columns = ['group', 'value', 'density']
+        if (self.data is None or 
+            not all(col in self.data.columns for col in required_columns)):
+            return go.Figure()
+        
+        fig = go.Figure()
+        groups = []
+        
+        for i, (group, curve) in enumerate(self.data.groupby('group', observed=True, sort=False)):
+            groups.append(group)
+            values = curve['value'].to_numpy()
+            density = curve['density'].to_numpy()
+            
+            # Todos los violines con el mismo ancho máximo (como scalemode='width')
+            peak = density.max()
+            offset = half_width * density / peak if peak > 0 else density
+            
+            fig.add_trace(go.Scatter(
+                x=np.r_[i + offset, (i - offset)[::-1]],
+                y=np.r_[values, values[::-1]],
+                fill='toself',
+                mode='lines',
+                name=str(group),
+                line=dict(width=1, color=self._group_color(group, color_column, i)),
+                opacity=0.7,
+                hoveron='fills',
+                hoverinfo='name'
+            ))
+        
+        fig.update_layout(
+            xaxis=dict(tickmode='array', tickvals=list(range(len(groups))), ticktext=groups),
+            xaxis_title=x_column.replace('_', ' ').title() if x_column else 'Categoría',
+            yaxis_title=y_column.replace('_', ' ').title(),
+            showlegend=False
+        )
+        
+        return fig
@@ -2,23 +2,28 @@
 Gráfica de mapa de calor para correlaciones
 """
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
 from .base_chart import BaseChart
 
 class HeatmapChart(BaseChart):
     """Gráfica de mapa de calor para análisis de correlaciones"""
     
-    def create_figure(self, columns=None, correlation_method='pearson', **kwargs):
+    def create_figure(self, columns=None, correlation_method='pearson',
+                      correlation_matrix=False, **kwargs):
         """
         Crea mapa de calor de correlación
         Args:
             columns: Lista de columnas numéricas (si None, usa todas las numéricas)
             correlation_method: 'pearson', 'spearman', 'kendall'
+            correlation_matrix: Si True, los datos ya son la matriz de
+                correlación (p. ej. calculada con data.moments)
         """
         if self.data is None:
             return go.Figure()
         
+        if correlation_matrix:
+            return self._create_heatmap(self.data)
+        
         # Seleccionar columnas numéricas
         if columns is None:
             numeric_cols = self.data.select_dtypes(include=[np.number]).columns.tolist()
@@ -35,6 +40,13 @@ class HeatmapChart(BaseChart):
         # Calcular matriz de correlación
         corr_matrix = self.data[columns].corr(method=correlation_method)
         
+        return self._create_heatmap(corr_matrix)
+    
+    def _create_heatmap(self, corr_matrix):
+        """Heatmap de una matriz de correlación (DataFrame k × k)"""
+        if len(corr_matrix.columns) < 2:
+            return go.Figure()
+        
         # Crear el heatmap
         fig = go.Figure(data=go.Heatmap(
             z=corr_matrix.values,
@@ -1,7 +1,6 @@
 """
 Gráfica de histograma para distribuciones
 """
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from .base_chart import BaseChart
@@ -9,7 +8,8 @@ from .base_chart import BaseChart
 class HistogramChart(BaseChart):
     """Gráfica de histograma con diferentes configuraciones"""
     
-    def create_figure(self, column, bins=20, color_column=None, overlay=False, **kwargs):
+    def create_figure(self, column, bins=20, color_column=None, overlay=False,
+                      binned=False, **kwargs):
         """
         Crea histograma
         Args:
@@ -17,14 +17,22 @@ class HistogramChart(BaseChart):
             bins: Número de bins
             color_column: Columna para colorear por categoría
             overlay: Si True, superpone histogramas; si False, los separa
+            binned: Si True, los datos ya son conteos por bin (ver
+                create_binned_figure)
         """
+        if binned:
+            return self.create_binned_figure(column, color_column=color_column, overlay=overlay)
+
         if self.data is None or column not in self.data.columns:
             return go.Figure()
+
+        # plotly.express solo hace falta con las filas crudas
+        import plotly.express as px
         
         if color_column and color_column in self.data.columns:
             # Histograma por categorías
             fig = px.histogram(
-                self.data,
+                self.express_frame(self.data),
                 x=column,
                 color=color_column,
                 nbins=bins,
@@ -36,7 +44,7 @@ class HistogramChart(BaseChart):
         else:
             # Histograma simple
             fig = px.histogram(
-                self.data,
+                self.express_frame(self.data),
                 x=column,
                 nbins=bins,
                 color_discrete_sequence=[self.colors['primary']],
@@ -52,43 +60,120 @@ class HistogramChart(BaseChart):
         
         return fig
     
-    def create_density_plot(self, column, color_column=None, **kwargs):
+    def create_binned_figure(self, column, color_column=None, overlay=False, **kwargs):
         """
-        Crea gráfica de densidad
+        Crea histograma a partir de conteos ya calculados en el servidor
+        El navegador solo recibe la altura de cada barra, no las filas.
+        Args:
+            column: Columna numérica (título del eje X)
+            color_column: Columna de color; los grupos vienen en la columna 'group'
+            overlay: Si True, superpone las barras; si False, las agrupa
+        """
+        required_columns = ['group', 'bin_start', 'bin_end', 'count']
+        if (self.data is None or 
+            not all(col in self.data.columns for col in required_columns)):
+            return go.Figure()
+        
+        fig = go.Figure()
+        
+        for i, (group, bins) in enumerate(self.data.groupby('group', observed=True, sort=False)):
+            starts = bins['bin_start'].to_numpy()
+            ends = bins['bin_end'].to_numpy()
+            
+            if color_column == 'species' and group in self.species_colors:
+                color = self.species_colors[group]
+            else:
+                color = list(self.colors.values())[i % len(self.colors)]
+            
+            # Bins iguales: un solo ancho para toda la traza
+            widths = ends - starts
+            width = float(widths[0]) if np.allclose(widths, widths[0]) else widths
+            
+            fig.add_trace(go.Bar(
+                x=(starts + ends) / 2,
+                y=bins['count'].to_numpy(),
+                width=width,
+                name=str(group),
+                marker_color=color,
+                opacity=0.7 if overlay else 1,
+                hovertemplate=(
+                    f"{group}<br>{column}: %{{x:.2f}} (centro del bin)"
+                    "<br>Frecuencia: %{y}<extra></extra>"
+                )
+            ))
+        
+        fig.update_layout(
+            xaxis_title=column.replace('_', ' ').title(),
+            yaxis_title='Frecuencia',
+            barmode='overlay' if overlay else 'group',
+            bargap=0.1,
+            showlegend=color_column is not None
+        )
+        
+        return fig
+    
+    def create_density_plot(self, column, color_column=None, bandwidth=None, points=200,
+                            precomputed=False, **kwargs):
+        """
+        Crea gráfica de densidad (KDE gaussiana calculada en el servidor)
         Args:
             column: Columna numérica
             color_column: Columna para colorear por categoría
+            bandwidth: Ancho de banda común (None = regla de plotly por grupo)
+            points: Puntos de la grilla de evaluación
+            precomputed: Si True, los datos ya son curvas (group, value,
+                density), p. ej. de data_loader.get_density_curves
         """
-        if self.data is None or column not in self.data.columns:
+        import pandas as pd
+        from data.density import group_densities
+
+        if self.data is None:
             return go.Figure()
         
+        if precomputed:
+            curves = self.data
+        elif column not in self.data.columns:
+            return go.Figure()
+        else:
+            # Valores ordenados por grupo y todas las curvas en una pasada
+            values = self.data[column]
+            if color_column and color_column in self.data.columns:
+                groups = self.data[color_column].astype(str)
+            else:
+                groups = pd.Series('Todos', index=self.data.index)
+            arrays = {
+                group: np.sort(subset.dropna().to_numpy(dtype=np.float64))
+                for group, subset in values.groupby(groups, observed=True, sort=False)
+            }
+            grid, densities = group_densities(arrays, points=points, bandwidth=bandwidth)
+            frames = [pd.DataFrame({'group': group, 'value': grid, 'density': density})
+                      for group, density in densities.items()]
+            curves = (pd.concat(frames, ignore_index=True) if frames
+                      else pd.DataFrame(columns=['group', 'value', 'density']))
+        
         fig = go.Figure()
         
-        if color_column and color_column in self.data.columns:
-            # Densidad por categorías
-            for i, category in enumerate(self.data[color_column].unique()):
-                data_subset = self.data[self.data[color_column] == category][column]
-                
-                fig.add_trace(go.Histogram(
-                    x=data_subset,
-                    histnorm='probability density',
-                    name=str(category),
-                    opacity=0.7,
-                    marker_color=list(self.species_colors.values())[i] if color_column == 'species' else list(self.colors.values())[i]
-                ))
-        else:
-            # Densidad simple
-            fig.add_trace(go.Histogram(
-                x=self.data[column],
-                histnorm='probability density',
-                marker_color=self.colors['primary'],
-                opacity=0.7
+        for i, (group, curve) in enumerate(curves.groupby('group', observed=True, sort=False)):
+            if color_column == 'species' and group in self.species_colors:
+                color = self.species_colors[group]
+            else:
+                color = list(self.colors.values())[i % len(self.colors)]
+            
+            fig.add_trace(go.Scatter(
+                x=curve['value'].to_numpy(),
+                y=curve['density'].to_numpy(),
+                mode='lines',
+                fill='tozeroy',
+                name=str(group),
+                line=dict(color=color, width=2),
+                opacity=0.7,
+                hovertemplate=f"{group}<br>%{{x:.2f}}: %{{y:.3f}}<extra></extra>"
             ))
         
         fig.update_layout(
             xaxis_title=column.replace('_', ' ').title(),
             yaxis_title='Densidad',
-            barmode='overlay'
+            showlegend=bool(color_column)
         )
         
-        return fig
\ No newline at end of file
+        return fig
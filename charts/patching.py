@@ -0,0 +1,78 @@
+"""
+Actualizaciones parciales de figuras con dash.Patch
+
+Cuando un callback solo cambia los datos (no el número de trazas ni su
+tipo), basta con enviar los arreglos de las trazas y algunos textos del
+layout; el navegador conserva el resto de la figura (tema, ejes, leyenda).
+"""
+from .serialization import EXACT_TRACE_TYPES, compact_array
+
+
+def triggered_props():
+    """
+    Propiedades que dispararon el callback en curso
+    Returns:
+        Conjunto de 'id.propiedad' (vacío en la llamada inicial)
+    """
+    from dash import ctx
+
+    return set(ctx.triggered_prop_ids)
+
+
+def can_patch(*patchable_props):
+    """
+    Indica si la figura del navegador puede actualizarse con un parche
+    Args:
+        patchable_props: 'id.propiedad' que solo cambian los datos de las trazas
+    Returns:
+        True si el callback lo disparó solo alguna de esas propiedades; en la
+        llamada inicial (aún no hay figura en el navegador) retorna False
+    """
+    triggered = triggered_props()
+    return bool(triggered) and triggered <= set(patchable_props)
+
+
+def _lookup(obj, path):
+    """Valor de una ruta con puntos ('marker.color', 'annotations.0.text')"""
+    for key in path.split('.'):
+        obj = obj[int(key)] if key.isdigit() else obj[key]
+    return obj
+
+
+def _assign(patch, path, value):
+    """Asigna un valor en una ruta con puntos dentro de un Patch"""
+    keys = [int(key) if key.isdigit() else key for key in path.split('.')]
+    for key in keys[:-1]:
+        patch = patch[key]
+    patch[keys[-1]] = value
+
+
+def figure_patch(fig, trace_props=(), layout_props=()):
+    """
+    Crea un parche con solo los datos que cambiaron de una figura
+    Args:
+        fig: Figura nueva completa (go.Figure) con las mismas trazas que la
+            que ya muestra el navegador
+        trace_props: Rutas a copiar de cada traza, p. ej. ('x', 'marker.color');
+            se omiten las que el tipo de traza no tiene (p. ej. 'q1' en una
+            traza scatter)
+        layout_props: Rutas a copiar del layout, p. ej. ('xaxis.title.text',)
+    Returns:
+        dash.Patch listo para retornar desde el callback (los arreglos pasan
+        por la serialización compacta si está activa)
+    """
+    from dash import Patch
+
+    patch = Patch()
+
+    for i, trace in enumerate(fig.data):
+        allow_float32 = trace.type not in EXACT_TRACE_TYPES
+        for path in trace_props:
+            if path.split('.')[0] not in trace:
+                continue
+            _assign(patch['data'][i], path, compact_array(_lookup(trace, path), allow_float32))
+
+    for path in layout_props:
+        _assign(patch['layout'], path, _lookup(fig.layout, path))
+
+    return patch
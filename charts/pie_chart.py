@@ -7,18 +7,25 @@ from .base_chart import BaseChart
 class PieChart(BaseChart):
     """Gráfica de pie y dona para distribuciones"""
     
-    def create_figure(self, value_column='species', is_donut=True, **kwargs):
+    def create_figure(self, value_column='species', is_donut=True, weight_column=None, **kwargs):
         """
         Crea gráfica de pie o dona
         Args:
             value_column: Columna para agrupar y contar
             is_donut: Si True, crea dona; si False, pie completo
+            weight_column: Columna con conteos ya agregados (opcional); si se
+                indica, se suma en lugar de contar filas
         """
         if self.data is None or value_column not in self.data.columns:
             return go.Figure()
         
-        # Contar valores
-        value_counts = self.data[value_column].value_counts()
+        # Contar valores (las columnas categóricas incluyen categorías sin filas)
+        if weight_column and weight_column in self.data.columns:
+            value_counts = (self.data.groupby(value_column, observed=True)[weight_column]
+                            .sum().sort_values(ascending=False))
+        else:
+            value_counts = self.data[value_column].value_counts()
+        value_counts = value_counts[value_counts > 0]
         
         # Determinar colores
         if value_column == 'species':
@@ -0,0 +1,114 @@
+"""
+Muestreo de puntos para gráficas de dispersión con muchos datos
+"""
+import numpy as np
+
+# Puntos máximos por figura antes de muestrear y pasar a WebGL (ver
+# configure_point_budget; 0 = sin límite)
+_settings = {'point_budget': 10000}
+
+
+def configure_point_budget(max_points):
+    """
+    Cambia el presupuesto de puntos por defecto de las dispersiones
+    Args:
+        max_points: Puntos máximos a dibujar (0 = todos)
+    """
+    _settings['point_budget'] = max_points
+
+
+def resolve_budget(max_points=None):
+    """Presupuesto a usar: el indicado o el configurado (0 o None = sin límite)"""
+    return _settings['point_budget'] if max_points is None else max_points
+
+
+def _grid_cells(x, y, bins):
+    """Celda de una grilla bins × bins para cada punto (-1 si x o y es NaN)"""
+    codes = np.full(len(x), -1, dtype=np.int64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if not valid.any():
+        return codes
+
+    cells = []
+    for values in (x[valid], y[valid]):
+        low, high = values.min(), values.max()
+        scale = bins / (high - low) if high > low else 0.0
+        cells.append(np.minimum(((values - low) * scale).astype(np.int64), bins - 1))
+
+    codes[valid] = cells[0] * bins + cells[1]
+    return codes
+
+
+def _sample_group(x, y, quota, bins, rng):
+    """
+    Posiciones muestreadas de un grupo, proporcional a la densidad
+    Cada celda de la grilla conserva la misma fracción de sus puntos y al
+    menos uno, para que las zonas poco densas y los outliers sigan visibles.
+    """
+    n = len(x)
+    if quota >= n:
+        return np.arange(n)
+
+    codes = _grid_cells(x, y, bins)
+
+    # Orden aleatorio dentro de cada celda
+    order = np.lexsort((rng.random(n), codes))
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, counts)
+
+    keep = np.maximum(1, np.round(counts * (quota / n))).astype(np.int64)
+    return order[rank < np.repeat(keep, counts)]
+
+
+def stratified_sample(df, budget, x_column, y_column, group_column=None, bins=32, seed=0):
+    """
+    Muestra estratificada por grupo de color que conserva la densidad de puntos
+    Args:
+        df: DataFrame completo
+        budget: Número aproximado de filas a conservar
+        x_column: Columna del eje X
+        y_column: Columna del eje Y
+        group_column: Columna de color; cada grupo recibe una cuota
+            proporcional a su tamaño (y al menos una parte mínima)
+        bins: Celdas por eje de la grilla usada para estratificar
+        seed: Semilla (la misma muestra para los mismos datos)
+    Returns:
+        DataFrame con las filas muestreadas, en el orden original
+    """
+    if budget is None or len(df) <= budget:
+        return df
+
+    rng = np.random.default_rng(seed)
+    x = df[x_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df[y_column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    if group_column and group_column in df.columns:
+        groups = list(df.groupby(group_column, observed=True, sort=False).indices.values())
+    else:
+        groups = [np.arange(len(df))]
+
+    # Grupos pequeños no desaparecen: mínimo por grupo
+    minimum = max(1, budget // (10 * len(groups)))
+    selected = []
+    for positions in groups:
+        quota = max(minimum, int(round(budget * len(positions) / len(df))))
+        chosen = _sample_group(x[positions], y[positions], quota, bins, rng)
+        selected.append(positions[chosen])
+
+    return df.iloc[np.sort(np.concatenate(selected))]
+
+
+def add_sample_annotation(fig, shown, total):
+    """Indica en la figura cuántos puntos se muestran del total"""
+    fig.add_annotation(
+        text=f"Mostrando {shown:,} de {total:,} puntos",
+        xref='paper', yref='paper',
+        x=1, y=1,
+        xanchor='right', yanchor='top',
+        showarrow=False,
+        font=dict(size=10, color='#6b7280'),
+        bgcolor='rgba(255,255,255,0.7)'
+    )
+    return fig
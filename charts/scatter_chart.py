@@ -1,17 +1,17 @@
 """
 Gráfica de dispersión/scatter plot
 """
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-from sklearn.linear_model import LinearRegression
 from .base_chart import BaseChart
+from .sampling import add_sample_annotation, resolve_budget, stratified_sample
 
 class ScatterChart(BaseChart):
     """Gráfica de dispersión con opciones avanzadas"""
     
     def create_figure(self, x_column, y_column, color_column='species', 
-                     size_column=None, add_regression=False, **kwargs):
+                     size_column=None, add_regression=False,
+                     max_points=None, regression=None, **kwargs):
         """
         Crea gráfica de dispersión
         Args:
@@ -20,21 +20,38 @@ class ScatterChart(BaseChart):
             color_column: Columna para colorear puntos
             size_column: Columna para tamaño de puntos (opcional)
             add_regression: Si agregar línea de regresión
+            max_points: Puntos máximos a dibujar; por encima se usa WebGL y una
+                muestra estratificada por color (None = presupuesto
+                configurado, 0 = todos)
+            regression: Recta ya calculada (slope, intercept, r2, x_min,
+                x_max; ver data.moments); si None se ajusta con sklearn
         """
+        import plotly.express as px
+
         if (self.data is None or 
             x_column not in self.data.columns or 
             y_column not in self.data.columns):
             return go.Figure()
         
+        # Con muchos puntos se dibuja una muestra (la regresión usa todos)
+        total = len(self.data)
+        max_points = resolve_budget(max_points)
+        sampled = bool(max_points) and total > max_points
+        plot_data = self.data
+        if sampled:
+            plot_data = stratified_sample(self.data, max_points, x_column, y_column,
+                                          group_column=color_column)
+
         # Crear gráfica base con plotly express
         fig = px.scatter(
-            self.data,
+            self.express_frame(plot_data),
             x=x_column,
             y=y_column,
             color=color_column if color_column in self.data.columns else None,
             size=size_column if size_column and size_column in self.data.columns else None,
             color_discrete_map=self.species_colors if color_column == 'species' else None,
             opacity=0.7,
+            render_mode='webgl' if sampled else 'auto',
             title=""
         )
         
@@ -49,18 +66,26 @@ class ScatterChart(BaseChart):
         
         # Agregar línea de regresión si se solicita
         if add_regression:
-            self._add_regression_line(fig, x_column, y_column)
+            self._add_regression_line(fig, x_column, y_column, regression)
         
         # Actualizar labels
         fig.update_layout(
             xaxis_title=x_column.replace('_', ' ').title(),
             yaxis_title=y_column.replace('_', ' ').title()
         )
+
+        if sampled:
+            add_sample_annotation(fig, len(plot_data), total)
         
         return fig
     
-    def _add_regression_line(self, fig, x_column, y_column):
+    def _add_regression_line(self, fig, x_column, y_column, regression=None):
         """Añade línea de regresión a la gráfica"""
+        if regression is not None:
+            return self._add_fitted_line(fig, regression)
+        
+        from sklearn.linear_model import LinearRegression
+        
         try:
             # Preparar datos sin valores NaN
             mask = ~(self.data[x_column].isna() | self.data[y_column].isna())
@@ -92,15 +117,41 @@ class ScatterChart(BaseChart):
         
         return fig
     
-    def create_matrix_plot(self, columns=None, **kwargs):
+    def _add_fitted_line(self, fig, regression):
+        """Añade una recta ya ajustada (los extremos bastan para dibujarla)"""
+        x_range = np.array([regression['x_min'], regression['x_max']])
+        
+        fig.add_trace(go.Scatter(
+            x=x_range,
+            y=regression['intercept'] + regression['slope'] * x_range,
+            mode='lines',
+            name=f"Regresión (R² = {regression['r2']:.3f})",
+            line=dict(color='#6b7280', width=2, dash='dash'),
+            hovertemplate='Línea de Regresión<extra></extra>'
+        ))
+        
+        return fig
+    
+    def create_matrix_plot(self, columns=None, max_points=None, **kwargs):
         """
         Crea matriz de scatter plots
         Args:
             columns: Lista de columnas para la matriz
+            max_points: Filas a partir de las cuales se usa SplomChart (una
+                traza WebGL con muestra); None = presupuesto configurado
         """
+        import plotly.express as px
+
         if self.data is None:
             return go.Figure()
         
+        max_points = resolve_budget(max_points)
+        if max_points and len(self.data) > max_points:
+            from .splom import SplomChart
+            return SplomChart(self.data).create_figure(
+                columns=columns, color_column='species', max_points=max_points
+            )
+        
         if columns is None:
             # Usar columnas numéricas por defecto
             numeric_columns = self.data.select_dtypes(include=[np.number]).columns
@@ -113,7 +164,7 @@ class ScatterChart(BaseChart):
             return go.Figure()
         
         fig = px.scatter_matrix(
-            self.data,
+            self.express_frame(self.data),
             dimensions=columns,
             color='species' if 'species' in self.data.columns else None,
             color_discrete_map=self.species_colors,
@@ -136,13 +187,15 @@ class ScatterChart(BaseChart):
             size_column: Columna para tamaño de burbujas
             color_column: Columna para color
         """
+        import plotly.express as px
+
         required_columns = [x_column, y_column, size_column]
         if (self.data is None or 
             not all(col in self.data.columns for col in required_columns)):
             return go.Figure()
         
         fig = px.scatter(
-            self.data,
+            self.express_frame(self.data),
             x=x_column,
             y=y_column,
             size=size_column,
@@ -1,9 +1,9 @@
 """
 Gráfica de dispersión para el análisis de correlaciones
 """
-import plotly.express as px
 import plotly.graph_objects as go
 from .base_chart import BaseChart
+from .sampling import add_sample_annotation, resolve_budget, stratified_sample
 
 class ScatterPlot(BaseChart):
     """
@@ -19,23 +19,37 @@ class ScatterPlot(BaseChart):
         }
     
     def create_figure(self, x_col='Sepal Length (Cm)', y_col='Sepal Width (Cm)', 
-                     color_col='Species', size_col=None, title=None):
+                     color_col='Species', size_col=None, title=None,
+                     max_points=None):
         """
         Crea la gráfica de dispersión
+        Con más de max_points filas dibuja en WebGL una muestra estratificada
+        por especie; la línea de regresión se calcula con todos los datos.
         """
+        import plotly.express as px
+
         if self.data is None:
             return go.Figure()
+
+        total = len(self.data)
+        max_points = resolve_budget(max_points)
+        sampled = bool(max_points) and total > max_points
+        plot_data = self.data
+        if sampled:
+            plot_data = stratified_sample(self.data, max_points, x_col, y_col,
+                                          group_column=color_col)
         
         # Crear la gráfica base
         fig = px.scatter(
-            self.data,
+            self.express_frame(plot_data),
             x=x_col,
             y=y_col,
             color=color_col,
             size=size_col if size_col else None,
             color_discrete_map=self.color_map,
             title=title or f'{y_col} vs {x_col}',
-            opacity=0.7
+            opacity=0.7,
+            render_mode='webgl' if sampled else 'auto'
         )
         
         # Personalizar markers
@@ -62,12 +76,15 @@ class ScatterPlot(BaseChart):
         # Añadir datos personalizados para hover
         for trace in fig.data:
             species = trace.name
-            species_data = self.data[self.data[color_col] == species]
+            species_data = plot_data[plot_data[color_col] == species]
             trace.customdata = species_data[[color_col]].values
             trace.hovertemplate = hover_template
         
         # Añadir línea de regresión si se solicita
         self.add_regression_line(fig, x_col, y_col)
+
+        if sampled:
+            add_sample_annotation(fig, len(plot_data), total)
         
         return fig
     
@@ -113,10 +130,13 @@ class ScatterPlot(BaseChart):
         
         return fig
     
-    def create_matrix_plot(self, columns=None):
+    def create_matrix_plot(self, columns=None, max_points=None):
         """
         Crea una matriz de gráficas de dispersión
+        Con más de max_points filas usa SplomChart (una traza WebGL con muestra).
         """
+        import plotly.express as px
+
         if self.data is None:
             return go.Figure()
         
@@ -124,8 +144,16 @@ class ScatterPlot(BaseChart):
             columns = ['Sepal Length (Cm)', 'Sepal Width (Cm)', 
                       'Petal Length (Cm)', 'Petal Width (Cm)']
         
+        max_points = resolve_budget(max_points)
+        if max_points and len(self.data) > max_points:
+            from .splom import SplomChart
+            return SplomChart(self.data).create_figure(
+                columns=columns, color_column='Species', max_points=max_points,
+                color_map=self.color_map
+            ).update_layout(title='Feature Correlation Matrix')
+        
         fig = px.scatter_matrix(
-            self.data,
+            self.express_frame(self.data),
             dimensions=columns,
             color='Species',
             color_discrete_map=self.color_map,
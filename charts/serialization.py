@@ -0,0 +1,163 @@
+"""
+Serialización compacta de figuras para las respuestas de los callbacks
+
+- Arreglos numéricos grandes como typed arrays en base64 ({dtype, bdata}),
+  que plotly.js (>= 2.28) decodifica sin parsear número por número.
+- Redondeo configurable de flotantes (menos dígitos en el JSON).
+- Motor JSON rápido de plotly (orjson) si está instalado.
+
+Desactivada por defecto: compact_figure retorna la figura tal cual hasta
+llamar a configure_serialization.
+"""
+import base64
+
+import numpy as np
+
+# dtype de numpy -> código de typed array de plotly.js (no admite 64 bits enteros)
+TYPED_ARRAY_CODES = {
+    'int8': 'i1',
+    'uint8': 'u1',
+    'int16': 'i2',
+    'uint16': 'u2',
+    'int32': 'i4',
+    'uint32': 'u4',
+    'float32': 'f4',
+    'float64': 'f8'
+}
+
+# Propiedades que plotly.js trata como texto aunque tengan números
+TEXT_PROPERTIES = {'text', 'hovertext', 'texttemplate', 'hovertemplate', 'ids', 'labels'}
+
+# Trazas que calculan bins o cuartiles en el navegador: sus flotantes no se
+# reducen a float32 (un valor en el borde de un bin podría cambiar de bin)
+EXACT_TRACE_TYPES = {'histogram', 'histogram2d', 'histogram2dcontour', 'box', 'violin'}
+
+# Configuración activa (ver configure_serialization)
+_settings = {'binary_threshold': 0, 'float_decimals': None}
+
+
+def configure_serialization(binary_threshold=0, float_decimals=None, json_engine='orjson'):
+    """
+    Activa la serialización compacta
+    Args:
+        binary_threshold: Elementos mínimos para enviar un arreglo en base64
+            (0 = nunca; requiere cargar plotly.js >= 2.28, ver config.PLOTLY_JS_URL)
+        float_decimals: Decimales a conservar en arreglos de flotantes (None = todos)
+        json_engine: Motor JSON de plotly ('orjson' si está instalado)
+    """
+    _settings['binary_threshold'] = binary_threshold
+    _settings['float_decimals'] = float_decimals
+
+    if json_engine:
+        import plotly.io as pio
+
+        try:
+            pio.json.config.default_engine = json_engine
+        except ValueError as e:
+            print(f"Error al configurar el motor JSON de plotly: {e}")
+
+
+def is_enabled():
+    """Indica si hay alguna transformación activa"""
+    return bool(_settings['binary_threshold']) or _settings['float_decimals'] is not None
+
+
+def encode_typed_array(array):
+    """
+    Codifica un arreglo numérico como typed array de plotly.js
+    Returns:
+        Diccionario {dtype, bdata[, shape]}, o None si el tipo no se admite
+    """
+    if array.dtype.kind in 'iu' and array.dtype.itemsize == 8:
+        # plotly.js no tiene enteros de 64 bits: int32 si alcanza, si no float64
+        info = np.iinfo(np.int32)
+        if array.size and (array.min() < info.min or array.max() > info.max):
+            array = array.astype(np.float64)
+        else:
+            array = array.astype(np.int32)
+
+    code = TYPED_ARRAY_CODES.get(array.dtype.name)
+    if code is None:
+        return None
+
+    # plotly.js lee los bytes en little-endian y en orden C
+    data = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+    encoded = {'dtype': code, 'bdata': base64.b64encode(data.tobytes()).decode('ascii')}
+    if array.ndim > 1:
+        encoded['shape'] = ','.join(str(size) for size in array.shape)
+    return encoded
+
+
+def _text_bytes_per_value(array, sample_size=64):
+    """Bytes por elemento que ocuparía el arreglo como texto JSON (estimado con una muestra)"""
+    flat = array.ravel()
+    sample = flat[::max(1, flat.size // sample_size)][:sample_size]
+    # str() de un escalar de numpy da la representación más corta de su tipo,
+    # igual que el motor JSON (5.1 en float32 no se escribe 5.099999904632568)
+    return (len(','.join(str(value) for value in sample)) + 1) / len(sample)
+
+
+def compact_array(value, allow_float32=True):
+    """
+    Versión compacta de un valor de traza (solo cambia arreglos numéricos)
+    El arreglo pasa a base64 solo si ocupa menos que como texto: flotantes
+    con pocos decimales ("5.1") son más cortos en JSON que 8 bytes en base64.
+    Args:
+        value: Arreglo de numpy, lista u otro valor
+        allow_float32: Permite enviar como float32 los flotantes redondeados
+            que caben sin pérdida en ese tipo
+    Returns:
+        Arreglo redondeado, typed array en base64 o el valor original
+    """
+    if not isinstance(value, np.ndarray) or value.dtype.kind not in 'iuf' or value.size == 0:
+        return value
+
+    decimals = _settings['float_decimals']
+    if value.dtype.kind == 'f' and decimals is not None:
+        value = np.round(value, decimals)
+
+    threshold = _settings['binary_threshold']
+    if not threshold or value.size < threshold:
+        return value
+
+    binary = value
+    if (allow_float32 and decimals is not None and value.dtype == np.float64
+            and np.nanmax(np.abs(value), initial=0) < 10 ** (6 - decimals)):
+        # float32 conserva ~7 cifras significativas: alcanza para esos decimales
+        binary = value.astype(np.float32)
+
+    if binary.dtype.itemsize * 4 / 3 >= _text_bytes_per_value(value):
+        return value
+
+    return encode_typed_array(binary) or value
+
+
+def _compact_trace(trace, allow_float32=True):
+    """Aplica compact_array a las propiedades (anidadas) de una traza"""
+    compacted = {}
+    for key, value in trace.items():
+        if key in TEXT_PROPERTIES:
+            compacted[key] = value
+        elif isinstance(value, dict):
+            compacted[key] = _compact_trace(value, allow_float32)
+        else:
+            compacted[key] = compact_array(value, allow_float32)
+    return compacted
+
+
+def compact_figure(fig):
+    """
+    Figura lista para la respuesta del callback
+    Args:
+        fig: go.Figure (o diccionario de figura)
+    Returns:
+        La misma figura si la serialización compacta está desactivada; si no,
+        un diccionario con los arreglos grandes en base64 y flotantes redondeados
+    """
+    if not is_enabled() or fig is None:
+        return fig
+
+    figure = fig.to_plotly_json() if hasattr(fig, 'to_plotly_json') else dict(fig)
+    figure['data'] = [_compact_trace(trace, trace.get('type') not in EXACT_TRACE_TYPES)
+                      for trace in figure.get('data', [])]
+    return figure
@@ -0,0 +1,140 @@
+"""
+Matriz de dispersión (SPLOM) para muchos datos
+Una sola traza go.Splom en WebGL: cada columna viaja una vez y todas las
+celdas de la matriz la comparten. El color va como códigos enteros en lugar
+de una traza por especie.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.helpers import data_fingerprint
+from utils.lru_cache import LRUCache
+from .base_chart import BaseChart
+from .sampling import add_sample_annotation, resolve_budget, stratified_sample
+
+# Columnas ya muestreadas por (huella de datos, columnas, color, presupuesto)
+_dimensions_cache = LRUCache(16)
+
+
+class SplomChart(BaseChart):
+    """Matriz de dispersión escalable con una sola traza WebGL"""
+
+    def create_figure(self, columns=None, color_column='species', max_points=None,
+                      color_map=None, show_upper_half=False, **kwargs):
+        """
+        Crea la matriz de dispersión
+        Args:
+            columns: Columnas numéricas (si None, las 4 primeras numéricas)
+            color_column: Columna categórica para colorear
+            max_points: Filas máximas a dibujar; por encima se usa una muestra
+                estratificada por color, compartida por todas las celdas
+                (None = presupuesto configurado, 0 = todas)
+            color_map: Diccionario categoría -> color (por defecto el de especies)
+            show_upper_half: Si mostrar también la mitad superior (espejo de
+                la inferior)
+        """
+        if self.data is None:
+            return go.Figure()
+
+        if columns is None:
+            numeric_columns = self.data.select_dtypes(include=[np.number]).columns
+            columns = numeric_columns[:4]
+
+        columns = [col for col in columns if col in self.data.columns]
+        if len(columns) < 2:
+            return go.Figure()
+
+        if color_column not in self.data.columns:
+            color_column = None
+
+        budget = resolve_budget(max_points)
+        key = None
+        try:
+            key = (data_fingerprint(self.data), tuple(columns), color_column, budget)
+        except TypeError:
+            pass
+
+        if key is None:
+            prepared = self._prepare(columns, color_column, budget)
+        else:
+            prepared = _dimensions_cache.get_or_set(
+                key, lambda: self._prepare(columns, color_column, budget)
+            )
+
+        return self._build(prepared, color_map or self.species_colors, show_upper_half)
+
+    def _prepare(self, columns, color_column, budget):
+        """Arreglos de la traza: muestra (si hace falta), columnas y códigos de color"""
+        total = len(self.data)
+        data = self.data
+        if budget and total > budget:
+            data = stratified_sample(self.data, budget, columns[0], columns[1],
+                                     group_column=color_column)
+
+        prepared = {
+            'columns': columns,
+            'values': [data[col].to_numpy() for col in columns],
+            'shown': len(data),
+            'total': total,
+            'categories': [],
+            'codes': None
+        }
+
+        if color_column:
+            groups = data[color_column].astype('category').cat.remove_unused_categories()
+            prepared['categories'] = [str(category) for category in groups.cat.categories]
+            prepared['codes'] = groups.cat.codes.to_numpy()
+
+        return prepared
+
+    def _build(self, prepared, color_map, show_upper_half):
+        """Figura a partir de los arreglos preparados"""
+        categories = prepared['categories']
+        palette = list(self.colors.values())
+        colors = [color_map.get(category, palette[i % len(palette)])
+                  for i, category in enumerate(categories)]
+
+        marker = dict(size=3, opacity=0.6, line=dict(width=0))
+        if categories:
+            # Escala discreta: el código i cae exactamente en la parada i
+            last = max(len(categories) - 1, 1)
+            colorscale = [[i / last, color] for i, color in enumerate(colors)]
+            if len(colorscale) == 1:
+                colorscale.append([1, colors[0]])
+            marker.update(
+                color=prepared['codes'],
+                colorscale=colorscale,
+                cmin=0,
+                cmax=last,
+                showscale=False
+            )
+        else:
+            marker['color'] = self.colors['primary']
+
+        fig = go.Figure(go.Splom(
+            dimensions=[
+                dict(label=col.replace('_', ' ').title(), values=values)
+                for col, values in zip(prepared['columns'], prepared['values'])
+            ],
+            marker=marker,
+            diagonal_visible=False,
+            showupperhalf=show_upper_half,
+            showlegend=False,
+            hoverinfo='skip' if prepared['shown'] > 20000 else None
+        ))
+
+        # Leyenda: una entrada por categoría (la traza splom no tiene una por color)
+        for category, color in zip(categories, colors):
+            fig.add_trace(go.Scatter(
+                x=[None], y=[None],
+                mode='markers',
+                name=category,
+                marker=dict(size=8, color=color)
+            ))
+
+        fig.update_layout(dragmode='select', hovermode='closest')
+
+        if prepared['shown'] < prepared['total']:
+            add_sample_annotation(fig, prepared['shown'], prepared['total'])
+
+        return fig
@@ -26,9 +26,9 @@ class TimeSeriesChart(BaseChart):
         avg_users = self.data['users'].mean() if 'users' in self.data.columns else 35
         
         # Generar datos simulados con variación realista
-        np.random.seed(42)
-        daily_sessions = np.random.poisson(avg_sessions, date_range_days)
-        daily_users = (daily_sessions * np.random.uniform(0.6, 0.8, date_range_days)).astype(int)
+        rng = np.random.RandomState(42)
+        daily_sessions = rng.poisson(avg_sessions, date_range_days)
+        daily_users = (daily_sessions * rng.uniform(0.6, 0.8, date_range_days)).astype(int)
         
         # Crear la figura
         fig = go.Figure()
@@ -77,8 +77,8 @@ class TimeSeriesChart(BaseChart):
         dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
         avg_value = self.data[metric_column].mean()
         
-        np.random.seed(42)
-        daily_values = np.random.poisson(avg_value, 30)
+        rng = np.random.RandomState(42)
+        daily_values = rng.poisson(avg_value, 30)
         
         fig = go.Figure()
         
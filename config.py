@@ -0,0 +1,88 @@
+"""
+Configuración del dashboard (sobrescribible con variables de entorno)
+"""
+import os
+
+# Fuente de datos: archivo o directorio (csv, parquet o json).
+# Si no se define, se usa el dataset Iris con columnas simuladas.
+DATA_SOURCE_PATH = os.environ.get("IRIS_DATA_SOURCE")
+DATA_SOURCE_PATTERN = os.environ.get("IRIS_DATA_PATTERN", "*.csv")
+
+# Segundos entre revisiones de la fuente de datos (0 desactiva el refresco)
+DATA_REFRESH_INTERVAL = float(os.environ.get("IRIS_DATA_REFRESH_INTERVAL", "30"))
+
+# Esquema compacto: categóricas para texto y enteros reducidos para contadores
+COMPACT_SCHEMA = os.environ.get("IRIS_COMPACT_SCHEMA", "1") == "1"
+# Reduce además las mediciones a float32 (pierde precisión decimal)
+COMPACT_FLOAT32 = os.environ.get("IRIS_COMPACT_FLOAT32", "0") == "1"
+
+# Filas sintéticas para pruebas de carga (0 usa las 150 filas originales)
+SYNTHETIC_ROWS = int(os.environ.get("IRIS_SYNTHETIC_ROWS", "0"))
+SYNTHETIC_SEED = int(os.environ.get("IRIS_SYNTHETIC_SEED", "42"))
+
+# Ingesta en streaming: directorio de spool y/o puerto TCP local (0 desactiva)
+STREAM_SPOOL_DIR = os.environ.get("IRIS_STREAM_SPOOL_DIR")
+STREAM_SOCKET_PORT = int(os.environ.get("IRIS_STREAM_SOCKET_PORT", "0"))
+STREAM_SOCKET_HOST = os.environ.get("IRIS_STREAM_SOCKET_HOST", "127.0.0.1")
+STREAMING_ENABLED = bool(STREAM_SPOOL_DIR or STREAM_SOCKET_PORT)
+
+# No iniciar los hilos de refresco e ingesta al importar app.py: gunicorn los
+# inicia en cada worker después del fork (lo activa gunicorn.conf.py)
+DEFER_BACKGROUND_SERVICES = os.environ.get("IRIS_DEFER_BACKGROUND_SERVICES", "0") == "1"
+
+# Cada cuánto el navegador revisa si hay datos nuevos (milisegundos)
+LIVE_UPDATE_INTERVAL_MS = int(os.environ.get("IRIS_LIVE_UPDATE_INTERVAL_MS", "5000"))
+
+# Motor de consultas para KPIs y agregados: 'cube' (pandas, en memoria),
+# 'duckdb' o 'sqlite' (filtros y agregaciones dentro del motor SQL)
+QUERY_BACKEND = os.environ.get("IRIS_QUERY_BACKEND", "cube")
+
+# Vistas filtradas compartidas entre callbacks (por versión y filtros)
+FILTERED_VIEW_CACHE_SIZE = int(os.environ.get("IRIS_FILTERED_VIEW_CACHE_SIZE", "32"))
+
+# Memoización de figuras en BaseChart.get_figure (0 la desactiva)
+FIGURE_CACHE_SIZE = int(os.environ.get("IRIS_FIGURE_CACHE_SIZE", "0"))
+
+# Precalentamiento al arrancar: figuras y KPIs de todas las combinaciones de
+# filtros (activa la cache de figuras)
+WARMUP_ON_START = os.environ.get("IRIS_WARMUP_ON_START", "0") == "1"
+WARMUP_WORKERS = int(os.environ.get("IRIS_WARMUP_WORKERS", "4"))
+
+# Gráficas pesadas (dispersión, mapa de calor) como background callbacks en
+# procesos aparte; requiere `pip install "dash[diskcache]"`
+BACKGROUND_CALLBACKS = os.environ.get("IRIS_BACKGROUND_CALLBACKS", "0") == "1"
+BACKGROUND_CACHE_DIR = os.environ.get("IRIS_BACKGROUND_CACHE_DIR")
+
+# Serialización compacta de figuras: arreglos con al menos N elementos como
+# typed arrays en base64 y decimales a conservar en flotantes (vacío = todos).
+# Desactivada por defecto: al activarla las páginas cargan plotly.js >= 2.28
+# desde PLOTLY_JS_URL (por defecto el CDN cdn.plot.ly; sin acceso a él las
+# gráficas no se dibujan). Sin red externa, apuntar PLOTLY_JS_URL a una copia
+# servida por la propia aplicación.
+FIGURE_BINARY_THRESHOLD = int(os.environ.get("IRIS_FIGURE_BINARY_THRESHOLD", "0"))
+PLOTLY_JS_URL = os.environ.get("IRIS_PLOTLY_JS_URL", "https://cdn.plot.ly/plotly-2.35.2.min.js")
+FIGURE_FLOAT_DECIMALS = (int(os.environ["IRIS_FIGURE_FLOAT_DECIMALS"])
+                         if os.environ.get("IRIS_FIGURE_FLOAT_DECIMALS") else None)
+
+# Puntos máximos por dispersión: por encima se dibuja en WebGL una muestra
+# estratificada por especie (0 = todos los puntos)
+SCATTER_POINT_BUDGET = int(os.environ.get("IRIS_SCATTER_POINT_BUDGET", "10000"))
+
+# Compresión gzip/brotli de respuestas de al menos N bytes (0 la desactiva),
+# ETag en layout y dependencias, y segundos de cache de los assets con versión
+COMPRESS_MIN_BYTES = int(os.environ.get("IRIS_COMPRESS_MIN_BYTES", "1024"))
+HTTP_CACHE = os.environ.get("IRIS_HTTP_CACHE", "1") == "1"
+STATIC_MAX_AGE = int(os.environ.get("IRIS_STATIC_MAX_AGE", "31536000"))
+
+# Latencia, errores y bytes por callback: panel de administración y texto de
+# Prometheus en IRIS_METRICS_PATH (solo desde la misma máquina salvo
+# IRIS_METRICS_PUBLIC=1)
+CALLBACK_METRICS = os.environ.get("IRIS_CALLBACK_METRICS", "1") == "1"
+METRICS_PATH = os.environ.get("IRIS_METRICS_PATH", "/metrics")
+METRICS_PUBLIC = os.environ.get("IRIS_METRICS_PUBLIC", "0") == "1"
+
+# Página de rendimiento de los callbacks para administradores (login propio)
+ADMIN_PATH = os.environ.get("IRIS_ADMIN_PATH", "/admin")
+
+# Imprime el tamaño de cada respuesta de callback
+PAYLOAD_LOG = os.environ.get("IRIS_PAYLOAD_LOG", "0") == "1"
@@ -0,0 +1,99 @@
+"""
+Procesamiento del DataFrame del dashboard: esquema compacto y utilidades
+"""
+import numpy as np
+import pandas as pd
+
+
+def frame_memory(df):
+    """Memoria ocupada por el DataFrame en bytes (incluye strings)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def compact_frame(df, float32=False, max_category_ratio=0.5):
+    """
+    Convierte el DataFrame a un esquema compacto
+    Args:
+        df: DataFrame original
+        float32: Si True, reduce las columnas float64 a float32
+        max_category_ratio: Proporción máxima de valores únicos para que una
+            columna de texto se convierta a categórica
+    Returns:
+        Tupla (DataFrame compacto, reporte de memoria)
+    """
+    before = frame_memory(df)
+    columns = {}
+
+    for column in df.columns:
+        series = df[column]
+
+        if series.dtype == object:
+            # Texto con pocos valores distintos -> códigos categóricos
+            if len(series) and series.nunique() / len(series) <= max_category_ratio:
+                series = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            # Contadores -> el entero con signo más pequeño que los contiene
+            # (plotly.express trata los enteros sin signo como discretos)
+            series = pd.to_numeric(series, downcast='integer')
+        elif float32 and series.dtype == np.float64:
+            series = series.astype(np.float32)
+
+        columns[column] = series
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    after = frame_memory(compacted)
+
+    report = {
+        'before_bytes': before,
+        'after_bytes': after,
+        'saved_bytes': before - after,
+        'ratio': before / after if after else 1.0,
+        'dtypes': {column: str(dtype) for column, dtype in compacted.dtypes.items()}
+    }
+
+    return compacted, report
+
+
+def format_memory_report(report):
+    """Texto legible del reporte de memoria de compact_frame"""
+    return (
+        f"Memoria del dataset: {report['before_bytes'] / 1024:,.1f} KB -> "
+        f"{report['after_bytes'] / 1024:,.1f} KB "
+        f"(ahorro {report['saved_bytes'] / 1024:,.1f} KB, {report['ratio']:.1f}x)"
+    )
+
+
+def append_frames(base, batch):
+    """
+    Agrega filas nuevas al final de un DataFrame conservando las categóricas
+    Args:
+        base: DataFrame existente (puede tener columnas categóricas)
+        batch: DataFrame con las filas nuevas (mismas columnas)
+    Returns:
+        Nuevo DataFrame con base + batch
+    """
+    batch = batch.reindex(columns=base.columns)
+    base_columns = {}
+    batch_columns = {}
+
+    for column in base.columns:
+        series = base[column]
+        new_values = batch[column]
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Unir categorías para que pd.concat no degrade la columna a object
+            categories = series.cat.categories.union(pd.Index(new_values.dropna().astype(object).unique()))
+            series = series.cat.set_categories(categories)
+            new_values = pd.Series(
+                pd.Categorical(new_values, categories=categories),
+                index=batch.index
+            )
+
+        base_columns[column] = series
+        batch_columns[column] = new_values
+
+    return pd.concat(
+        [pd.DataFrame(base_columns, index=base.index),
+         pd.DataFrame(batch_columns, index=batch.index)],
+        ignore_index=True
+    )
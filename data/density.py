@@ -0,0 +1,123 @@
+"""
+Densidad (KDE gaussiana) por grupos sobre una grilla fija
+
+Los valores ordenados se reparten en una grilla fina (binning lineal con
+searchsorted y sumas acumuladas) y la matriz de pesos (grupos × puntos) se
+convoluciona con el kernel de cada grupo en una sola pasada de FFT. El costo
+depende de la grilla, no de las filas (salvo una suma acumulada por curva,
+que queda en cache junto con el resultado).
+"""
+import numpy as np
+
+# Puntos de la grilla fina por cada punto de la grilla de salida
+OVERSAMPLE = 8
+
+# El kernel se trunca en ± KERNEL_WIDTH anchos de banda
+KERNEL_WIDTH = 4
+
+
+def rule_of_thumb_bandwidth(values):
+    """
+    Ancho de banda de plotly.js: 1.059 · min(σ, IQR / 1.349) · n^(-1/5)
+    Args:
+        values: Arreglo ordenado sin NaN
+    Returns:
+        Ancho de banda positivo
+    """
+    q1, q3 = np.percentile(values, [25, 75])
+    std = values.std()
+    spread = min(std, (q3 - q1) / 1.349) or std or 1.0
+    return 1.059 * spread * len(values) ** -0.2
+
+
+def density_grid(arrays, bandwidths, points=200):
+    """
+    Grilla común que cubre todos los grupos más dos anchos de banda
+    Args:
+        arrays: Arreglos ordenados (uno por grupo, no vacíos)
+        bandwidths: Ancho de banda de cada grupo
+        points: Puntos de la grilla
+    """
+    margin = 2 * max(bandwidths)
+    low = min(float(values[0]) for values in arrays) - margin
+    high = max(float(values[-1]) for values in arrays) + margin
+    return np.linspace(low, high, points)
+
+
+def _linear_binning(values, fine, step):
+    """
+    Pesos de cada punto de la grilla fina (binning lineal)
+    Cada valor reparte su peso entre los dos puntos vecinos según su
+    distancia. Con los valores ordenados, la suma de los valores de cada
+    intervalo sale de sumas acumuladas: no hay que recorrerlos uno a uno.
+    Returns:
+        Arreglo len(fine) que suma 1
+    """
+    positions = np.searchsorted(values, fine, side='left')
+    positions[-1] = len(values)
+    cumulative = np.r_[0.0, np.cumsum(values, dtype=np.float64)]
+
+    # Conteo y suma de valores en cada intervalo [fine[j], fine[j + 1])
+    count = np.diff(positions).astype(np.float64)
+    total = np.diff(cumulative[positions])
+
+    right = (total - count * fine[:-1]) / step
+    weights = np.zeros(len(fine))
+    weights[:-1] += count - right
+    weights[1:] += right
+    return weights / len(values)
+
+
+def binned_kde(arrays, grid, bandwidths):
+    """
+    Densidad de varios grupos en la misma grilla, en una pasada vectorizada
+    Args:
+        arrays: Arreglos ordenados sin NaN (uno por grupo, no vacíos)
+        grid: Grilla de salida equiespaciada que cubre todos los valores
+        bandwidths: Ancho de banda de cada grupo
+    Returns:
+        Matriz (grupos, len(grid)); cada fila integra ~1 sobre la grilla
+    """
+    points = len(grid)
+    fine = np.linspace(grid[0], grid[-1], (points - 1) * OVERSAMPLE + 1)
+    step = fine[1] - fine[0] if len(fine) > 1 else 1.0
+    counts = np.stack([_linear_binning(values, fine, step) for values in arrays])
+
+    # Kernels de todos los grupos sobre los mismos desplazamientos
+    bandwidths = np.asarray(bandwidths, dtype=np.float64)[:, None]
+    half = int(min(len(fine) - 1, np.ceil(KERNEL_WIDTH * bandwidths.max() / step)))
+    offsets = np.arange(-half, half + 1) * step
+    kernels = np.exp(-0.5 * (offsets / bandwidths) ** 2) / (bandwidths * np.sqrt(2 * np.pi))
+
+    # Convolución lineal por FFT (relleno con ceros para no dar la vuelta)
+    size = len(fine) + len(offsets) - 1
+    spectrum = np.fft.rfft(counts, size, axis=1) * np.fft.rfft(kernels, size, axis=1)
+    density = np.fft.irfft(spectrum, size, axis=1)[:, half:half + len(fine)]
+
+    # El redondeo de la FFT puede dejar valores negativos minúsculos
+    return np.maximum(density[:, ::OVERSAMPLE], 0.0)
+
+
+def group_densities(arrays, points=200, bandwidth=None, grid=None):
+    """
+    Curvas de densidad de varios grupos
+    Args:
+        arrays: Diccionario grupo -> arreglo ordenado sin NaN
+        points: Puntos de la grilla
+        bandwidth: Ancho de banda común; None = regla de plotly por grupo
+        grid: Grilla explícita; None = común a todos los grupos
+    Returns:
+        Tupla (grilla, diccionario grupo -> densidad); los grupos sin
+        valores se omiten
+    """
+    groups = [group for group, values in arrays.items() if len(values)]
+    if not groups:
+        return np.array([]), {}
+
+    values = [arrays[group] for group in groups]
+    bandwidths = [bandwidth or rule_of_thumb_bandwidth(array) for array in values]
+    if grid is None:
+        grid = density_grid(values, bandwidths, points)
+
+    matrix = binned_kde(values, grid, bandwidths)
+    return grid, dict(zip(groups, matrix))
@@ -0,0 +1,156 @@
+"""
+Índice de filas por valor para los filtros categóricos (especie, región)
+"""
+import numpy as np
+import pandas as pd
+
+from data.data_processor import append_frames
+
+EMPTY_ROWS = np.array([], dtype=np.intp)
+
+
+def _is_contiguous(rows):
+    """True si las filas forman un rango continuo"""
+    return len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows)
+
+
+def _intersect(a, b):
+    """
+    Intersección de dos arreglos ordenados de ids de fila
+    Si uno de ellos es un rango continuo basta con recortar el otro por
+    búsqueda binaria, sin recorrer todas las filas.
+    """
+    if len(a) == 0 or len(b) == 0:
+        return EMPTY_ROWS
+    if _is_contiguous(a):
+        a, b = b, a
+    if _is_contiguous(b):
+        start, stop = np.searchsorted(a, [b[0], b[-1] + 1])
+        return a[start:stop]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+class FilterIndex:
+    """
+    Índice de ids de fila por cada valor de las columnas de filtro
+
+    Al construirse ordena el DataFrame por las columnas indexadas, de modo
+    que una especie (o una especie dentro de una región) ocupa un rango
+    continuo de filas y se puede servir como vista sin copiar datos.
+    """
+
+    def __init__(self, frame, columns=('species', 'region')):
+        """
+        Args:
+            frame: DataFrame a indexar
+            columns: Columnas categóricas a indexar, en orden de prioridad
+        """
+        self.columns = [column for column in columns if column in frame.columns]
+
+        if self.columns:
+            codes = [pd.factorize(frame[column], sort=True)[0] for column in self.columns]
+            # np.lexsort usa la última llave como la principal
+            order = np.lexsort(codes[::-1])
+            frame = frame.take(order).reset_index(drop=True)
+
+        self.frame = frame
+        self.row_ids = {column: self._build_row_ids(frame[column]) for column in self.columns}
+
+    def merged_with(self, batch):
+        """
+        Índice con un lote de filas nuevas agregadas al final, sin reordenar
+        Las filas existentes conservan sus ids; los ids del lote se agregan
+        al final de cada valor (siguen ordenados). Copia las columnas una vez
+        (O(n)) pero no ordena: el costo del índice es O(lote · log lote).
+        Los bloques de valores dejan de ser continuos y esas selecciones se
+        copian en lugar de servirse como vista.
+        Args:
+            batch: DataFrame con las filas nuevas (mismas columnas)
+        Returns:
+            Nuevo FilterIndex
+        """
+        offset = len(self.frame)
+
+        index = FilterIndex.__new__(FilterIndex)
+        index.columns = self.columns
+        index.frame = append_frames(self.frame, batch)
+        index.row_ids = {}
+
+        for column in self.columns:
+            row_ids = dict(self.row_ids[column])
+            for value, ids in self._build_row_ids(batch[column]).items():
+                current = row_ids.get(value)
+                ids = ids + offset
+                row_ids[value] = ids if current is None else np.concatenate([current, ids])
+            index.row_ids[column] = dict(sorted(row_ids.items()))
+
+        return index
+
+    @staticmethod
+    def _build_row_ids(series):
+        """Mapea cada valor a los ids (ordenados) de las filas que lo contienen"""
+        codes, uniques = pd.factorize(series, sort=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        return {
+            value: order[bounds[i]:bounds[i + 1]]
+            for i, value in enumerate(uniques)
+        }
+
+    def rows(self, **filters):
+        """
+        Resuelve una combinación de filtros
+        Args:
+            **filters: columna=valor; los valores None o 'all' se ignoran
+        Returns:
+            Arreglo ordenado de ids de fila, o None si no hay filtros activos
+        """
+        selected = None
+
+        for column, value in filters.items():
+            if value is None or value == 'all':
+                continue
+
+            if column in self.row_ids:
+                ids = self.row_ids[column].get(value, EMPTY_ROWS)
+            else:
+                ids = np.flatnonzero(self.frame[column].to_numpy() == value)
+
+            selected = ids if selected is None else _intersect(selected, ids)
+
+        return selected
+
+    def select(self, **filters):
+        """
+        Retorna las filas que cumplen los filtros
+        Sin filtros o con un rango continuo de filas se retorna una copia
+        superficial (sin copiar datos): agregar columnas no afecta al índice.
+        """
+        rows = self.rows(**filters)
+
+        if rows is None:
+            return self.frame.copy(deep=False)
+        if len(rows) == 0:
+            return self.frame.iloc[0:0].copy(deep=False)
+        if _is_contiguous(rows):
+            return self.frame.iloc[rows[0]:rows[-1] + 1].copy(deep=False)
+        return self.frame.take(rows)
+
+    def count(self, **filters):
+        """Número de filas que cumplen los filtros, sin materializarlas"""
+        rows = self.rows(**filters)
+        return len(self.frame) if rows is None else len(rows)
+
+    def values(self, column, **filters):
+        """
+        Valores de una columna indexada presentes tras aplicar los filtros
+        Returns:
+            Lista ordenada de valores
+        """
+        rows = self.rows(**filters)
+        values = self.row_ids[column]
+
+        if rows is None:
+            return list(values)
+        return [value for value, ids in values.items() if len(_intersect(rows, ids))]
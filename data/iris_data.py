@@ -0,0 +1,151 @@
+"""
+Generador vectorizado de datos sintéticos tipo Iris para pruebas de carga
+
+Uso desde la línea de comandos (escribe los bloques como archivos en disco):
+    python -m data.iris_data --rows 10000000 --output data/synthetic
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SPECIES = ['setosa', 'versicolor', 'virginica']
+REGIONS = ['North America', 'Europe', 'Asia', 'South America']
+FEATURES = [
+    'sepal length (cm)',
+    'sepal width (cm)',
+    'petal length (cm)',
+    'petal width (cm)'
+]
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+_reference_stats = None
+
+
+def get_reference_stats():
+    """
+    Media y factor de Cholesky de la covarianza de cada especie,
+    calculados sobre el dataset Iris original
+    Returns:
+        Tupla (medias [especies x 4], cholesky [especies x 4 x 4])
+    """
+    global _reference_stats
+
+    if _reference_stats is None:
+        from sklearn.datasets import load_iris
+
+        iris = load_iris()
+        means = np.array([iris.data[iris.target == i].mean(axis=0) for i in range(len(SPECIES))])
+        cholesky = np.array([
+            np.linalg.cholesky(np.cov(iris.data[iris.target == i], rowvar=False))
+            for i in range(len(SPECIES))
+        ])
+        _reference_stats = means, cholesky
+
+    return _reference_stats
+
+
+def generate_chunk(rng, size):
+    """
+    Genera un bloque de filas sintéticas
+    Args:
+        rng: numpy.random.Generator local (no se toca el estado global)
+        size: Número de filas
+    Returns:
+        DataFrame con el mismo esquema que load_iris_data
+    """
+    means, cholesky = get_reference_stats()
+
+    species_codes = rng.integers(0, len(SPECIES), size)
+    measurements = rng.standard_normal((size, len(FEATURES)))
+
+    # Normal multivariada por especie: media + L·z
+    for code in range(len(SPECIES)):
+        rows = species_codes == code
+        measurements[rows] = means[code] + measurements[rows] @ cholesky[code].T
+
+    # Misma resolución que el dataset original (0.1 cm) y sin valores negativos
+    measurements = np.clip(np.round(measurements, 1), 0.1, None)
+
+    sessions = rng.poisson(50, size) + 20
+    users = (sessions * rng.uniform(0.6, 0.9, size)).astype(int)
+    page_views = (sessions * rng.uniform(2, 5, size)).astype(int)
+    region_codes = rng.integers(0, len(REGIONS), size)
+
+    df = pd.DataFrame(measurements, columns=FEATURES)
+    df['species'] = pd.Categorical.from_codes(species_codes, SPECIES)
+    df['sessions'] = sessions
+    df['users'] = users
+    df['page_views'] = page_views
+    df['region'] = pd.Categorical.from_codes(region_codes, REGIONS)
+
+    return df
+
+
+def iter_iris_chunks(n_rows, seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Itera bloques de datos sintéticos reproducibles
+    Args:
+        n_rows: Número total de filas
+        seed: Semilla del generador local
+        chunk_size: Filas por bloque (acota la memoria temporal)
+    """
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, n_rows, chunk_size):
+        yield generate_chunk(rng, min(chunk_size, n_rows - start))
+
+
+def generate_iris_frame(n_rows, seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Genera n_rows filas sintéticas en un solo DataFrame"""
+    chunks = list(iter_iris_chunks(n_rows, seed, chunk_size))
+    if not chunks:
+        # Sin filas: DataFrame vacío con las mismas columnas y tipos
+        return generate_chunk(np.random.default_rng(seed), 0)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def write_iris_chunks(output_dir, n_rows, seed=42, chunk_size=DEFAULT_CHUNK_SIZE,
+                      file_format='csv'):
+    """
+    Escribe los bloques a disco, un archivo por bloque, sin tenerlos todos en
+    memoria. El directorio resultante se puede usar como IRIS_DATA_SOURCE.
+    Args:
+        output_dir: Directorio de salida
+        file_format: 'csv' o 'parquet' (requiere pyarrow)
+    Returns:
+        Lista de rutas escritas
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+
+    for i, chunk in enumerate(iter_iris_chunks(n_rows, seed, chunk_size)):
+        path = os.path.join(output_dir, f'part-{i:05d}.{file_format}')
+        if file_format == 'parquet':
+            chunk.to_parquet(path, index=False)
+        else:
+            chunk.to_csv(path, index=False)
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera datos sintéticos tipo Iris')
+    parser.add_argument('--rows', type=int, required=True, help='Número de filas')
+    parser.add_argument('--output', required=True, help='Directorio de salida')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    args = parser.parse_args()
+
+    paths = write_iris_chunks(args.output, args.rows, args.seed, args.chunk_size, args.format)
+    print(f"{args.rows:,} filas escritas en {len(paths)} archivos ({args.output})")
+
+
+if __name__ == '__main__':
+    main()
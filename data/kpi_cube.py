@@ -0,0 +1,166 @@
+"""
+Cubo pre-agregado de KPIs por especie × región
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ('species', 'region')
+COUNTERS = ('sessions', 'users', 'page_views')
+MEASUREMENTS = (
+    'sepal length (cm)',
+    'sepal width (cm)',
+    'petal length (cm)',
+    'petal width (cm)'
+)
+
+
+class KpiCube:
+    """
+    Agregados por celda (especie, región): conteo, suma de contadores y
+    suma/mínimo/máximo de cada medición. Solo se guardan celdas con filas.
+    Cualquier combinación de filtros ('all' en uno o ambos ejes) se responde
+    combinando celdas, sin tocar las filas originales.
+    """
+
+    def __init__(self, frame, dimensions=DIMENSIONS, counters=COUNTERS,
+                 measurements=MEASUREMENTS):
+        """
+        Args:
+            frame: DataFrame con las filas del dataset
+            dimensions: Columnas categóricas que forman las celdas
+            counters: Columnas que se suman
+            measurements: Columnas numéricas con suma, mínimo y máximo
+        """
+        self.dimensions = [column for column in dimensions if column in frame.columns]
+        self.counters = [column for column in counters if column in frame.columns]
+        self.measurements = [column for column in measurements if column in frame.columns]
+
+        aggregations = {'count': (self.dimensions[0], 'size')}
+        for column in self.counters:
+            aggregations[f'sum:{column}'] = (column, 'sum')
+        for column in self.measurements:
+            aggregations[f'sum:{column}'] = (column, 'sum')
+            aggregations[f'min:{column}'] = (column, 'min')
+            aggregations[f'max:{column}'] = (column, 'max')
+
+        cells = frame.groupby(self.dimensions, observed=True).agg(**aggregations)
+        self.cells = cells.reset_index()
+
+    def merge(self, other):
+        """
+        Combina dos cubos (p. ej. el actual y el de un lote nuevo de filas)
+        El costo depende solo del número de celdas.
+        Returns:
+            Nuevo KpiCube con las celdas de ambos
+        """
+        cells = pd.concat([self.cells, other.cells.reindex(columns=self.cells.columns)],
+                          ignore_index=True)
+
+        operations = {}
+        for column in self.cells.columns:
+            if column in self.dimensions:
+                continue
+            operations[column] = column.split(':')[0] if ':' in column else 'sum'
+
+        # Tras concatenar, las dimensiones pueden quedar como object
+        for column in self.dimensions:
+            cells[column] = cells[column].astype(object)
+
+        merged = cells.groupby(self.dimensions, sort=True).agg(operations).reset_index()
+
+        cube = KpiCube.__new__(KpiCube)
+        cube.dimensions = self.dimensions
+        cube.counters = self.counters
+        cube.measurements = self.measurements
+        cube.cells = merged
+        return cube
+
+    def merged_with(self, batch):
+        """Cubo actualizado con un lote de filas nuevas, en O(lote + celdas)"""
+        return self.merge(KpiCube(batch, self.dimensions, self.counters, self.measurements))
+
+    def _select(self, species=None, region=None):
+        """Celdas que cumplen los filtros ('all' o None no filtra)"""
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+
+        for column, value in (('species', species), ('region', region)):
+            if value is not None and value != 'all' and column in self.dimensions:
+                mask &= (cells[column] == value).to_numpy()
+
+        return cells[mask]
+
+    def count(self, species=None, region=None):
+        """Número de filas para la combinación de filtros"""
+        return int(self._select(species, region)['count'].sum())
+
+    def totals(self, species=None, region=None):
+        """
+        KPIs para una combinación de filtros
+        Returns:
+            Diccionario con count, species_count y los diccionarios
+            sum, min, max y mean por columna
+        """
+        cells = self._select(species, region)
+        count = int(cells['count'].sum())
+
+        totals = {
+            'count': count,
+            'species_count': int(cells['species'].nunique()) if 'species' in self.dimensions else 0,
+            'sum': {},
+            'min': {},
+            'max': {},
+            'mean': {}
+        }
+
+        for column in self.counters + self.measurements:
+            total = cells[f'sum:{column}'].sum()
+            totals['sum'][column] = total
+            totals['mean'][column] = total / count if count else float('nan')
+
+        for column in self.measurements:
+            totals['min'][column] = cells[f'min:{column}'].min()
+            totals['max'][column] = cells[f'max:{column}'].max()
+
+        return totals
+
+    def counts(self, by, species=None, region=None):
+        """
+        Conteo de filas por una dimensión (equivalente a value_counts)
+        Returns:
+            DataFrame con columnas [by, 'count'] ordenado de mayor a menor
+        """
+        return self.group_sum(by, 'count', species, region)
+
+    def group_sum(self, by, column, species=None, region=None):
+        """
+        Suma de una columna agrupada por una dimensión
+        Args:
+            by: Dimensión de agrupación ('species' o 'region')
+            column: Contador a sumar, o 'count' para el número de filas
+        Returns:
+            DataFrame con columnas [by, column] ordenado de mayor a menor
+        """
+        cells = self._select(species, region)
+        source = 'count' if column == 'count' else f'sum:{column}'
+
+        grouped = cells.groupby(by, observed=True)[source].sum()
+        grouped = grouped.sort_values(ascending=False, kind='stable')
+
+        return pd.DataFrame({by: grouped.index.astype(object), column: grouped.to_numpy()})
+
+    def most_common(self, by, species=None, region=None):
+        """Valor más frecuente de una dimensión (None si no hay filas)"""
+        counts = self.counts(by, species, region)
+        return counts[by].iloc[0] if len(counts) else None
+
+    def cell_counts(self):
+        """
+        Conteo de filas por celda (especie, región)
+        Returns:
+            DataFrame con las dimensiones y 'count', solo celdas con filas
+        """
+        cells = self.cells[self.dimensions + ['count']].copy()
+        for column in self.dimensions:
+            cells[column] = cells[column].astype(object)
+        return cells
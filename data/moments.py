@@ -0,0 +1,213 @@
+"""
+Momentos de segundo orden combinables por especie × región
+
+Cada celda guarda conteo, medias, co-momentos centrados (Σ (x - x̄)(y - ȳ)),
+mínimos y máximos de las columnas numéricas. Dos celdas se combinan con la
+fórmula de Chan et al. sin volver a las filas, así que correlaciones,
+regresiones y tablas tipo describe() de cualquier combinación de filtros
+cuestan O(celdas · k²).
+"""
+import numpy as np
+import pandas as pd
+
+from data.kpi_cube import COUNTERS, DIMENSIONS, MEASUREMENTS
+
+
+class Moments:
+    """Momentos de un conjunto de filas (una celda o varias combinadas)"""
+
+    def __init__(self, columns, count, mean, comoment, minimum, maximum):
+        """
+        Args:
+            columns: Nombres de las k columnas
+            count: Número de filas
+            mean: Medias (k,)
+            comoment: Co-momentos centrados (k, k)
+            minimum: Mínimos (k,)
+            maximum: Máximos (k,)
+        """
+        self.columns = list(columns)
+        self.count = int(count)
+        self.mean = mean
+        self.comoment = comoment
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def empty(cls, columns):
+        """Momentos de cero filas"""
+        k = len(columns)
+        return cls(columns, 0, np.zeros(k), np.zeros((k, k)),
+                   np.full(k, np.inf), np.full(k, -np.inf))
+
+    @classmethod
+    def from_values(cls, columns, values):
+        """
+        Momentos de una matriz de valores
+        Args:
+            columns: Nombres de las columnas
+            values: Arreglo (n, k) sin NaN
+        """
+        if len(values) == 0:
+            return cls.empty(columns)
+
+        values = np.asarray(values, dtype=np.float64)
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return cls(columns, len(values), mean, centered.T @ centered,
+                   values.min(axis=0), values.max(axis=0))
+
+    def merge(self, other):
+        """
+        Combina dos conjuntos de momentos (Chan, Golub y LeVeque)
+        Returns:
+            Nuevos Moments equivalentes a calcularlos sobre todas las filas
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.count / count)
+        comoment = (self.comoment + other.comoment
+                    + np.outer(delta, delta) * (self.count * other.count / count))
+        return Moments(self.columns, count, mean, comoment,
+                       np.minimum(self.minimum, other.minimum),
+                       np.maximum(self.maximum, other.maximum))
+
+    def _positions(self, columns):
+        if columns is None:
+            return list(range(len(self.columns))), self.columns
+        columns = [column for column in columns if column in self.columns]
+        return [self.columns.index(column) for column in columns], columns
+
+    def covariance(self, columns=None, ddof=1):
+        """Matriz de covarianzas como DataFrame (NaN si no hay suficientes filas)"""
+        positions, columns = self._positions(columns)
+        dof = self.count - ddof
+        values = self.comoment[np.ix_(positions, positions)] / dof if dof > 0 else np.nan
+        return pd.DataFrame(values, index=columns, columns=columns, dtype=np.float64)
+
+    def correlation(self, columns=None):
+        """
+        Matriz de correlación de Pearson (igual que DataFrame.corr)
+        Returns:
+            DataFrame k × k; NaN en columnas constantes
+        """
+        positions, columns = self._positions(columns)
+        comoment = self.comoment[np.ix_(positions, positions)]
+        scale = np.sqrt(np.diag(comoment))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = comoment / np.outer(scale, scale)
+        np.fill_diagonal(values, np.where(scale > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(values, -1, 1), index=columns, columns=columns)
+
+    def regression(self, x_column, y_column):
+        """
+        Regresión lineal por mínimos cuadrados de y sobre x
+        Returns:
+            Diccionario con slope, intercept, r2, count, x_min y x_max, o
+            None si hay menos de dos filas o x es constante
+        """
+        if x_column not in self.columns or y_column not in self.columns or self.count < 2:
+            return None
+
+        i, j = self.columns.index(x_column), self.columns.index(y_column)
+        sxx, syy, sxy = self.comoment[i, i], self.comoment[j, j], self.comoment[i, j]
+        if sxx <= 0:
+            return None
+
+        slope = sxy / sxx
+        return {
+            'slope': float(slope),
+            'intercept': float(self.mean[j] - slope * self.mean[i]),
+            'r2': float(sxy * sxy / (sxx * syy)) if syy > 0 else 1.0,
+            'count': self.count,
+            'x_min': float(self.minimum[i]),
+            'x_max': float(self.maximum[i])
+        }
+
+    def describe(self, columns=None):
+        """
+        Tabla tipo DataFrame.describe() sin percentiles (no son combinables)
+        Returns:
+            DataFrame con filas count, mean, std, min y max
+        """
+        positions, columns = self._positions(columns)
+        nan = np.full(len(positions), np.nan)
+        variance = np.diag(self.comoment)[positions] / (self.count - 1) if self.count > 1 else nan
+
+        return pd.DataFrame(
+            [
+                np.full(len(positions), float(self.count)),
+                self.mean[positions] if self.count else nan,
+                np.sqrt(variance),
+                self.minimum[positions] if self.count else nan,
+                self.maximum[positions] if self.count else nan
+            ],
+            index=['count', 'mean', 'std', 'min', 'max'],
+            columns=columns
+        )
+
+
+class MomentCube:
+    """
+    Moments por celda (especie, región): cualquier combinación de filtros
+    ('all' en uno o ambos ejes) se responde combinando celdas.
+    Las filas con NaN en alguna de las columnas no se cuentan.
+    """
+
+    def __init__(self, frame, dimensions=DIMENSIONS, columns=MEASUREMENTS + COUNTERS):
+        """
+        Args:
+            frame: DataFrame con las filas del dataset
+            dimensions: Columnas categóricas que forman las celdas
+            columns: Columnas numéricas
+        """
+        self.dimensions = [column for column in dimensions if column in frame.columns]
+        self.columns = [column for column in columns if column in frame.columns]
+        self.cells = {}
+
+        if not self.dimensions:
+            return
+
+        values = frame[self.columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values).any(axis=1)
+
+        for key, positions in frame.groupby(self.dimensions, observed=True).indices.items():
+            key = key if isinstance(key, tuple) else (key,)
+            positions = positions[valid[positions]]
+            self.cells[tuple(str(value) for value in key)] = Moments.from_values(
+                self.columns, values[positions]
+            )
+
+    def merged_with(self, batch):
+        """Cubo actualizado con un lote de filas nuevas, en O(lote + celdas · k²)"""
+        other = MomentCube(batch, self.dimensions, self.columns)
+
+        cube = MomentCube.__new__(MomentCube)
+        cube.dimensions = self.dimensions
+        cube.columns = self.columns
+        cube.cells = dict(self.cells)
+        for key, moments in other.cells.items():
+            current = cube.cells.get(key)
+            cube.cells[key] = moments if current is None else current.merge(moments)
+        return cube
+
+    def moments(self, species=None, region=None):
+        """
+        Momentos de la combinación de filtros ('all' o None no filtra)
+        Returns:
+            Moments con las celdas que cumplen los filtros
+        """
+        filters = {'species': species, 'region': region}
+        result = Moments.empty(self.columns)
+
+        for key, moments in self.cells.items():
+            if all(filters.get(dimension) in (None, 'all', value)
+                   for dimension, value in zip(self.dimensions, key)):
+                result = result.merge(moments)
+        return result
@@ -0,0 +1,196 @@
+"""
+Columnas numéricas ordenadas por grupo, para histogramas en el servidor
+"""
+import numpy as np
+import pandas as pd
+
+from data.kpi_cube import MEASUREMENTS
+
+
+class SortedColumns:
+    """
+    Valores ordenados (sin NaN) de cada medición por grupo (especie)
+    Con los arreglos ordenados, los conteos de cualquier conjunto de bordes
+    salen de una búsqueda binaria: O(bins · log n) por grupo, sin recorrer
+    las filas.
+    """
+
+    def __init__(self, frame, group_column='species', columns=MEASUREMENTS):
+        """
+        Args:
+            frame: DataFrame con las filas del dataset
+            group_column: Columna categórica que separa los grupos
+            columns: Columnas numéricas a ordenar
+        """
+        self.group_column = group_column
+        self.columns = [column for column in columns if column in frame.columns]
+        self.arrays = {}
+
+        if group_column not in frame.columns:
+            return
+
+        for group, positions in frame.groupby(group_column, observed=True, sort=True).indices.items():
+            rows = frame.iloc[positions]
+            self.arrays[str(group)] = {
+                column: self._sorted_values(rows[column]) for column in self.columns
+            }
+
+    @staticmethod
+    def _sorted_values(series):
+        values = series.to_numpy()
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        return np.sort(values, kind='stable')
+
+    @property
+    def groups(self):
+        """Grupos presentes, en orden"""
+        return list(self.arrays)
+
+    def merged_with(self, batch):
+        """Columnas ordenadas con un lote de filas nuevas, en O(n + lote · log lote)"""
+        other = SortedColumns(batch, self.group_column, self.columns)
+
+        merged = SortedColumns.__new__(SortedColumns)
+        merged.group_column = self.group_column
+        merged.columns = self.columns
+        merged.arrays = dict(self.arrays)
+
+        for group, columns in other.arrays.items():
+            current = merged.arrays.get(group)
+            if current is None:
+                merged.arrays[group] = columns
+                continue
+            # Intercala el lote ordenado en el arreglo ya ordenado
+            merged.arrays[group] = {
+                column: np.insert(current[column],
+                                  np.searchsorted(current[column], values, side='right'),
+                                  values)
+                for column, values in columns.items()
+            }
+        return merged
+
+    def value_range(self, column, groups=None):
+        """
+        Mínimo y máximo de una columna en los grupos indicados
+        Returns:
+            Tupla (mínimo, máximo), o None si no hay valores
+        """
+        arrays = [self.arrays[group][column] for group in self._select(groups)
+                  if len(self.arrays[group][column])]
+        if not arrays:
+            return None
+        return (min(float(values[0]) for values in arrays),
+                max(float(values[-1]) for values in arrays))
+
+    def _select(self, groups):
+        if groups is None:
+            return self.groups
+        return [str(group) for group in groups if str(group) in self.arrays]
+
+    def histogram(self, column, bins=20, edges=None, groups=None):
+        """
+        Conteos por bin y grupo
+        Args:
+            column: Columna numérica
+            bins: Número de bins iguales entre el mínimo y el máximo
+            edges: Bordes explícitos (reemplaza a bins); los bins son
+                [a, b) salvo el último, que incluye su borde derecho
+            groups: Grupos a incluir (None = todos)
+        Returns:
+            DataFrame con columnas group, bin_start, bin_end y count
+        """
+        groups = self._select(groups)
+        if column not in self.columns or not groups:
+            return pd.DataFrame(columns=['group', 'bin_start', 'bin_end', 'count'])
+
+        if edges is None:
+            value_range = self.value_range(column, groups) or (0.0, 1.0)
+            low, high = value_range
+            if high <= low:
+                low, high = low - 0.5, high + 0.5
+            edges = np.linspace(low, high, bins + 1)
+        edges = np.asarray(edges, dtype=np.float64)
+
+        frames = []
+        for group in groups:
+            values = self.arrays[group][column]
+            positions = np.searchsorted(values, edges, side='left')
+            positions[-1] = np.searchsorted(values, edges[-1], side='right')
+            frames.append(pd.DataFrame({
+                'group': group,
+                'bin_start': edges[:-1],
+                'bin_end': edges[1:],
+                'count': np.diff(positions)
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    def box_summary(self, column, group, max_outliers=100):
+        """
+        Estadísticos de un box plot (mismos criterios que plotly.js)
+        Cuartiles por interpolación lineal; los bigotes llegan al dato más
+        extremo dentro de 1.5 · IQR y el resto son outliers.
+        Args:
+            column: Columna numérica
+            group: Grupo (especie)
+            max_outliers: Outliers a conservar como máximo (repartidos de
+                forma pareja entre los ordenados, incluidos los extremos)
+        Returns:
+            Diccionario con count, mean, q1, median, q3, lowerfence,
+            upperfence, outliers y outlier_count (None si no hay valores)
+        """
+        values = self.arrays.get(str(group), {}).get(column)
+        if values is None or len(values) == 0:
+            return None
+
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        low = np.searchsorted(values, q1 - 1.5 * iqr, side='left')
+        high = np.searchsorted(values, q3 + 1.5 * iqr, side='right')
+
+        outliers = np.concatenate([values[:low], values[high:]])
+        if len(outliers) > max_outliers:
+            outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int)]
+
+        return {
+            'count': int(len(values)),
+            'mean': float(values.mean()),
+            'q1': float(q1),
+            'median': float(median),
+            'q3': float(q3),
+            'lowerfence': float(values[low]),
+            'upperfence': float(values[high - 1]),
+            'outliers': outliers.astype(np.float64),
+            'outlier_count': int(low + len(values) - high)
+        }
+
+    def densities(self, column, groups=None, points=200, bandwidth=None):
+        """
+        Densidad (KDE gaussiana) de cada grupo en una grilla común
+        Todos los grupos se evalúan juntos (ver data.density.binned_kde);
+        la grilla cubre el rango de todos los grupos, así que no depende de
+        cuáles se pidan.
+        Args:
+            column: Columna numérica
+            groups: Grupos a incluir (None = todos)
+            points: Puntos de la grilla
+            bandwidth: Ancho de banda común; None = regla de plotly.js por grupo
+        Returns:
+            Tupla (grilla, diccionario grupo -> densidad)
+        """
+        from data.density import density_grid, group_densities, rule_of_thumb_bandwidth
+
+        if column not in self.columns:
+            return np.array([]), {}
+
+        arrays = {group: self.arrays[group][column] for group in self.groups
+                  if len(self.arrays[group][column])}
+        if not arrays:
+            return np.array([]), {}
+
+        bandwidths = [bandwidth or rule_of_thumb_bandwidth(values) for values in arrays.values()]
+        grid = density_grid(list(arrays.values()), bandwidths, points)
+
+        selected = self._select(groups)
+        return group_densities({group: arrays[group] for group in selected if group in arrays},
+                               bandwidth=bandwidth, grid=grid)
@@ -0,0 +1,211 @@
+"""
+Fuentes de datos intercambiables y refresco en caliente del dataset
+"""
+import glob
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+
+class DataSource(ABC):
+    """
+    Clase base para las fuentes de datos del dashboard
+
+    Una fuente se divide en partes (archivos, generadores...). Cada parte
+    tiene una firma barata de calcular; solo se vuelven a leer las partes
+    cuya firma cambió desde la última lectura.
+    """
+
+    def __init__(self):
+        self._parts = {}  # parte -> (firma, DataFrame)
+        self._missing = False  # ya se avisó que la fuente no está disponible
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def scan(self):
+        """
+        Lista las partes disponibles
+        Returns:
+            Diccionario {parte: firma}
+        """
+        pass
+
+    @abstractmethod
+    def read_part(self, part):
+        """Lee una parte y la retorna como DataFrame"""
+        pass
+
+    def load(self):
+        """
+        Lee la fuente completa y retorna el DataFrame combinado
+        Lanza FileNotFoundError si la fuente no tiene partes que leer
+        """
+        with self._lock:
+            self._parts = {}
+            frame, _ = self._sync(force=True)
+        return frame
+
+    def poll(self):
+        """
+        Revisa si la fuente cambió
+        Returns:
+            DataFrame nuevo si alguna parte cambió, None en caso contrario
+            (también si la fuente desapareció: se conserva la foto anterior)
+        """
+        with self._lock:
+            frame, changed = self._sync()
+        return frame if changed else None
+
+    def files(self):
+        """
+        Archivos de la última lectura, en el orden en que se unieron
+        Returns:
+            Lista de rutas, o None si la fuente no son archivos
+        """
+        return None
+
+    def _sync(self, force=False):
+        """Relee solo las partes nuevas o modificadas"""
+        signatures = self.scan()
+
+        # Archivo borrado o renombrado: un DataFrame vacío (sin columnas)
+        # rompería el índice y los cubos de la foto
+        if not signatures:
+            location = getattr(self, 'path', type(self).__name__)
+            if force:
+                raise FileNotFoundError(f"La fuente de datos no tiene nada que leer: {location}")
+            if not self._missing:
+                print(f"La fuente de datos {location} no está disponible; se conserva la foto actual")
+                self._missing = True
+            return None, False
+
+        self._missing = False
+
+        changed = force or set(signatures) != set(self._parts)
+
+        parts = {}
+        for part, signature in signatures.items():
+            cached = self._parts.get(part)
+            if cached is not None and cached[0] == signature:
+                parts[part] = cached
+            else:
+                parts[part] = (signature, self.read_part(part))
+                changed = True
+
+        self._parts = parts
+
+        if not changed:
+            return None, False
+        return self._combine([parts[part][1] for part in sorted(parts)]), True
+
+    def _combine(self, frames):
+        """Une las partes en un solo DataFrame"""
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+
+def read_table(path):
+    """Lee un archivo tabular según su extensión (csv, parquet o json)"""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    if extension == '.json':
+        return pd.read_json(path, orient='records', lines=True)
+    return pd.read_csv(path)
+
+
+def file_signature(path):
+    """Firma barata de un archivo: fecha de modificación y tamaño"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileDataSource(DataSource):
+    """Fuente de un solo archivo"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def scan(self):
+        if not os.path.exists(self.path):
+            return {}
+        return {self.path: file_signature(self.path)}
+
+    def read_part(self, part):
+        return read_table(part)
+
+    def files(self):
+        return sorted(self._parts)
+
+
+class DirectoryDataSource(DataSource):
+    """Fuente formada por todos los archivos de un directorio"""
+
+    def __init__(self, path, pattern='*.csv'):
+        super().__init__()
+        self.path = path
+        self.pattern = pattern
+
+    def scan(self):
+        paths = glob.glob(os.path.join(self.path, self.pattern))
+        return {path: file_signature(path) for path in paths if os.path.isfile(path)}
+
+    def read_part(self, part):
+        return read_table(part)
+
+    def files(self):
+        return sorted(self._parts)
+
+
+class GeneratorDataSource(DataSource):
+    """Fuente generada por una función (datos simulados, APIs, etc.)"""
+
+    def __init__(self, generator, signature=None):
+        """
+        Args:
+            generator: Función sin argumentos que retorna un DataFrame
+            signature: Función opcional que retorna una firma; cuando cambia
+                se vuelve a llamar al generador
+        """
+        super().__init__()
+        self.generator = generator
+        self.signature = signature
+
+    def scan(self):
+        return {'generated': self.signature() if self.signature else None}
+
+    def read_part(self, part):
+        return self.generator()
+
+
+class DataRefresher(threading.Thread):
+    """Hilo en segundo plano que vigila la fuente y publica nuevas fotos"""
+
+    def __init__(self, cache, interval=30):
+        """
+        Args:
+            cache: DatasetCache a refrescar
+            interval: Segundos entre revisiones
+        """
+        super().__init__(name='data-refresher', daemon=True)
+        self.cache = cache
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.cache.refresh()
+            except Exception as e:
+                print(f"Error al refrescar la fuente de datos: {e}")
+
+    def stop(self):
+        """Detiene el hilo tras la revisión en curso"""
+        self._stop_event.set()
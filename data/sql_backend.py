@@ -0,0 +1,200 @@
+"""
+Backend de consultas SQL embebido (DuckDB o SQLite) para filtros y agregados
+
+Ofrece la misma interfaz que KpiCube (count, totals, counts, group_sum,
+most_common), de modo que los callbacks reciben solo el resultado agregado
+y las clases de gráficas no cambian.
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from data.kpi_cube import COUNTERS, MEASUREMENTS
+from data.sources import read_table
+
+DIMENSIONS = ('species', 'region')
+
+
+def quote(identifier):
+    """Cita un nombre de columna para SQL (tienen espacios y paréntesis)"""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def literal(value):
+    """Cadena SQL entre comillas simples (p. ej. una ruta con apóstrofos)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class SqlQueryBackend:
+    """Ejecuta filtros y agregaciones dentro de un motor SQL embebido"""
+
+    def __init__(self, frame=None, engine='duckdb', files=None, table='iris'):
+        """
+        Args:
+            frame: DataFrame a consultar (ignorado si se indican files)
+            engine: 'duckdb' (recomendado) o 'sqlite'
+            files: Lista de archivos csv/parquet/json que DuckDB lee
+                directamente, sin pasar los datos por pandas (p. ej.
+                DataSource.files())
+            table: Nombre de la tabla o vista
+        """
+        if engine == 'duckdb':
+            try:
+                import duckdb
+            except ImportError:
+                print("DuckDB no está instalado; se usa SQLite como backend de consultas")
+                engine = 'sqlite'
+
+        self.engine = engine
+        self.table = table
+        self._lock = threading.Lock()
+
+        if engine == 'duckdb':
+            self.connection = duckdb.connect()
+            if files:
+                self.connection.execute(
+                    f"CREATE VIEW {quote(table)} AS {self._file_scan(files)}"
+                )
+            else:
+                # register no copia los datos: DuckDB lee el DataFrame en sitio
+                self.connection.register(table, frame)
+        else:
+            if frame is None:
+                frame = pd.concat([read_table(path) for path in files], ignore_index=True) \
+                    if files else pd.DataFrame()
+            self.connection = sqlite3.connect(':memory:', check_same_thread=False)
+            frame.to_sql(table, self.connection, index=False)
+            for column in DIMENSIONS:
+                if column in frame.columns:
+                    self.connection.execute(
+                        f"CREATE INDEX {quote('idx_' + column)} ON {quote(table)} ({quote(column)})"
+                    )
+
+        columns = set(self._query(f"SELECT * FROM {quote(table)} LIMIT 0").columns)
+        self.dimensions = [column for column in DIMENSIONS if column in columns]
+        self.counters = [column for column in COUNTERS if column in columns]
+        self.measurements = [column for column in MEASUREMENTS if column in columns]
+
+    @staticmethod
+    def _file_scan(files):
+        """
+        Consulta DuckDB que lee una lista de archivos
+        Los archivos se agrupan por formato (csv, parquet, json) y los grupos
+        se unen por nombre de columna, como pd.concat en DataSource.
+        """
+        groups = {}
+        for path in files:
+            extension = os.path.splitext(path)[1].lower()
+            groups.setdefault(extension, []).append(path)
+
+        selects = []
+        for extension, paths in groups.items():
+            listing = '[' + ', '.join(literal(path) for path in paths) + ']'
+            if extension == '.parquet':
+                reader = f"read_parquet({listing}, union_by_name = true)"
+            elif extension == '.json':
+                reader = f"read_json_auto({listing}, format = 'newline_delimited')"
+            else:
+                reader = f"read_csv_auto({listing}, union_by_name = true)"
+            selects.append(f"SELECT * FROM {reader}")
+
+        return ' UNION ALL BY NAME '.join(selects)
+
+    def _query(self, sql, params=()):
+        """Ejecuta una consulta y retorna el resultado como DataFrame"""
+        with self._lock:
+            if self.engine == 'duckdb':
+                return self.connection.execute(sql, list(params)).df()
+            return pd.read_sql_query(sql, self.connection, params=list(params))
+
+    def _where(self, species=None, region=None):
+        """Cláusula WHERE con parámetros ('all' o None no filtra)"""
+        conditions = []
+        params = []
+
+        for column, value in (('species', species), ('region', region)):
+            if value is not None and value != 'all' and column in self.dimensions:
+                conditions.append(f"{quote(column)} = ?")
+                params.append(value)
+
+        clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return clause, params
+
+    def count(self, species=None, region=None):
+        """Número de filas para la combinación de filtros"""
+        where, params = self._where(species, region)
+        result = self._query(f"SELECT COUNT(*) AS n FROM {quote(self.table)}{where}", params)
+        return int(result['n'].iloc[0])
+
+    def totals(self, species=None, region=None):
+        """KPIs para una combinación de filtros (mismo formato que KpiCube.totals)"""
+        where, params = self._where(species, region)
+
+        expressions = ["COUNT(*) AS count"]
+        if 'species' in self.dimensions:
+            expressions.append(f"COUNT(DISTINCT {quote('species')}) AS species_count")
+        for column in self.counters + self.measurements:
+            expressions.append(f"SUM({quote(column)}) AS {quote('sum:' + column)}")
+        for column in self.measurements:
+            expressions.append(f"MIN({quote(column)}) AS {quote('min:' + column)}")
+            expressions.append(f"MAX({quote(column)}) AS {quote('max:' + column)}")
+
+        row = self._query(
+            f"SELECT {', '.join(expressions)} FROM {quote(self.table)}{where}", params
+        ).iloc[0]
+        count = int(row['count'])
+
+        totals = {
+            'count': count,
+            'species_count': int(row['species_count']) if 'species_count' in row else 0,
+            'sum': {},
+            'min': {},
+            'max': {},
+            'mean': {}
+        }
+
+        for column in self.counters + self.measurements:
+            total = row[f'sum:{column}'] if count else 0
+            totals['sum'][column] = total
+            totals['mean'][column] = total / count if count else float('nan')
+
+        for column in self.measurements:
+            totals['min'][column] = row[f'min:{column}'] if count else float('nan')
+            totals['max'][column] = row[f'max:{column}'] if count else float('nan')
+
+        return totals
+
+    def counts(self, by, species=None, region=None):
+        """Conteo de filas por una dimensión, de mayor a menor"""
+        return self.group_sum(by, 'count', species, region)
+
+    def group_sum(self, by, column, species=None, region=None):
+        """
+        Suma de una columna agrupada por una dimensión
+        Returns:
+            DataFrame con columnas [by, column] ordenado de mayor a menor
+        """
+        where, params = self._where(species, region)
+        value = "COUNT(*)" if column == 'count' else f"SUM({quote(column)})"
+
+        return self._query(
+            f"SELECT {quote(by)}, {value} AS {quote(column)} "
+            f"FROM {quote(self.table)}{where} "
+            f"GROUP BY {quote(by)} ORDER BY {quote(column)} DESC, {quote(by)}",
+            params
+        )
+
+    def most_common(self, by, species=None, region=None):
+        """Valor más frecuente de una dimensión (None si no hay filas)"""
+        counts = self.counts(by, species, region)
+        return counts[by].iloc[0] if len(counts) else None
+
+    def cell_counts(self):
+        """Conteo de filas por celda (especie, región), como KpiCube.cell_counts"""
+        dimensions = ', '.join(quote(column) for column in self.dimensions)
+        return self._query(
+            f"SELECT {dimensions}, COUNT(*) AS count FROM {quote(self.table)} "
+            f"GROUP BY {dimensions} ORDER BY {dimensions}"
+        )
@@ -0,0 +1,159 @@
+"""
+Ingesta en streaming (append-only) de lotes de filas nuevas
+"""
+import glob
+import json
+import os
+import shutil
+import socketserver
+import threading
+
+import pandas as pd
+
+from data.sources import read_table
+
+
+class SpoolDirectoryIngestor(threading.Thread):
+    """
+    Vigila un directorio de "spool": cada archivo nuevo es un lote de filas.
+    Los productores deben escribir a un nombre temporal y renombrar al final
+    para que nunca se lea un archivo a medias.
+
+    Cada archivo se mueve primero a processing/ (así se agrega una sola vez
+    aunque falle un paso posterior), luego a processed/ si se ingirió o a
+    failed/ si no se pudo leer.
+    """
+
+    def __init__(self, cache, path, pattern='*.csv', interval=2):
+        """
+        Args:
+            cache: DatasetCache que recibe los lotes
+            path: Directorio de spool
+            pattern: Patrón de archivos a ingerir
+            interval: Segundos entre revisiones
+        """
+        super().__init__(name='spool-ingestor', daemon=True)
+        self.cache = cache
+        self.path = path
+        self.pattern = pattern
+        self.interval = interval
+        self.processing_path = os.path.join(path, 'processing')
+        self.processed_path = os.path.join(path, 'processed')
+        self.failed_path = os.path.join(path, 'failed')
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """
+        Ingiere los archivos que hay ahora en el directorio
+        Returns:
+            Número de archivos agregados al dataset
+        """
+        for folder in (self.processing_path, self.processed_path, self.failed_path):
+            os.makedirs(folder, exist_ok=True)
+
+        ingested = 0
+        for path in sorted(glob.glob(os.path.join(self.path, self.pattern))):
+            if os.path.isfile(path) and self.ingest_file(path):
+                ingested += 1
+        return ingested
+
+    def ingest_file(self, path):
+        """
+        Agrega un archivo del spool al dataset, como máximo una vez
+        Returns:
+            True si sus filas se agregaron
+        """
+        name = os.path.basename(path)
+        claimed = os.path.join(self.processing_path, name)
+        try:
+            os.replace(path, claimed)
+        except OSError as e:
+            print(f"Error al tomar {path}: {e}")
+            return False
+
+        try:
+            batch = read_table(claimed)
+        except Exception as e:
+            print(f"Error al leer {path}, se mueve a failed/: {e}")
+            self._move(claimed, self.failed_path)
+            return False
+
+        try:
+            if len(batch):
+                self.cache.append(batch)
+        except Exception as e:
+            print(f"Error al ingerir {path}, se mueve a failed/: {e}")
+            self._move(claimed, self.failed_path)
+            return False
+
+        # Si este paso falla el archivo queda en processing/ y no se vuelve a leer
+        self._move(claimed, self.processed_path)
+        return True
+
+    @staticmethod
+    def _move(path, folder):
+        try:
+            shutil.move(path, os.path.join(folder, os.path.basename(path)))
+        except Exception as e:
+            print(f"Error al mover {path} a {folder}: {e}")
+
+    def stop(self):
+        """Detiene el hilo tras la revisión en curso"""
+        self._stop_event.set()
+
+
+class _RowStreamHandler(socketserver.StreamRequestHandler):
+    """Lee filas JSON (una por línea) y las agrega por lotes"""
+
+    def handle(self):
+        rows = []
+
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                print(f"Fila inválida en el socket de ingesta: {e}")
+                continue
+
+            if len(rows) >= self.server.batch_size:
+                self.server.cache.append(pd.DataFrame(rows))
+                rows = []
+
+        if rows:
+            self.server.cache.append(pd.DataFrame(rows))
+
+
+class SocketIngestor(threading.Thread):
+    """
+    Servidor TCP local que recibe filas como JSON, una por línea, por ejemplo:
+        {"species": "setosa", "region": "Asia", "sessions": 60, ...}
+    """
+
+    def __init__(self, cache, host='127.0.0.1', port=9099, batch_size=500):
+        """
+        Args:
+            cache: DatasetCache que recibe los lotes
+            host: Interfaz de escucha (por defecto solo local)
+            port: Puerto TCP
+            batch_size: Filas por lote agregado al dataset
+        """
+        super().__init__(name='socket-ingestor', daemon=True)
+        self.server = socketserver.ThreadingTCPServer((host, port), _RowStreamHandler)
+        self.server.daemon_threads = True
+        self.server.cache = cache
+        self.server.batch_size = batch_size
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        """Detiene el servidor"""
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,22 +1,595 @@
 """
 Cargador de datos simple
 """
+import os
+import threading
+from datetime import datetime
+
 import pandas as pd
-from sklearn.datasets import load_iris
 import numpy as np
 
-def load_iris_data():
-    """Carga y prepara el dataset Iris"""
+import config
+from data.data_processor import append_frames, compact_frame, format_memory_report
+from data.filter_index import FilterIndex
+from data.iris_data import generate_iris_frame
+from data.kpi_cube import KpiCube, MEASUREMENTS
+from data.moments import MomentCube
+from data.sorted_columns import SortedColumns
+from data.sql_backend import SqlQueryBackend
+from data.sources import (
+    DataRefresher,
+    DirectoryDataSource,
+    FileDataSource,
+    GeneratorDataSource,
+)
+from data.streaming import SocketIngestor, SpoolDirectoryIngestor
+from utils.helpers import register_fingerprint
+from utils.lru_cache import LRUCache
+
+
+def _build_iris_frame():
+    """Construye el DataFrame Iris con las columnas simuladas"""
+    from sklearn.datasets import load_iris
+
     iris = load_iris()
     df = pd.DataFrame(iris.data, columns=iris.feature_names)
     df['species'] = iris.target_names[iris.target]
-    
-    # Datos simulados adicionales
-    np.random.seed(42)
+
+    # Datos simulados adicionales (generador local: no altera np.random global)
+    rng = np.random.RandomState(42)
     n = len(df)
-    df['sessions'] = np.random.poisson(50, n) + 20
-    df['users'] = (df['sessions'] * np.random.uniform(0.6, 0.9, n)).astype(int)
-    df['page_views'] = (df['sessions'] * np.random.uniform(2, 5, n)).astype(int)
-    df['region'] = np.random.choice(['North America', 'Europe', 'Asia', 'South America'], n)
-    
-    return df
\ No newline at end of file
+    df['sessions'] = rng.poisson(50, n) + 20
+    df['users'] = (df['sessions'] * rng.uniform(0.6, 0.9, n)).astype(int)
+    df['page_views'] = (df['sessions'] * rng.uniform(2, 5, n)).astype(int)
+    df['region'] = rng.choice(['North America', 'Europe', 'Asia', 'South America'], n)
+
+    return df
+
+
+class DatasetSnapshot:
+    """Foto inmutable del dataset con su número de versión"""
+
+    def __init__(self, version, frame, memory_report=None, pending=(), derived=None,
+                 base_index=None, files=None):
+        """
+        Args:
+            version: Número de versión de la foto
+            frame: DataFrame base de la foto
+            memory_report: Reporte del esquema compacto (opcional)
+            pending: Lotes agregados por streaming que aún no se unieron a
+                frame; se unen solo cuando alguien necesita las filas
+            derived: Estructuras derivadas ya calculadas (p. ej. el cubo
+                actualizado de forma incremental)
+            base_index: FilterIndex ya construido sobre frame (los lotes
+                pendientes se le agregan sin reordenar)
+            files: Archivos de los que salen exactamente las filas de la foto
+                (None si las filas no están todas en disco, p. ej. con lotes
+                recibidos por streaming)
+        """
+        self.version = version
+        self.files = tuple(files) if files else None
+        self.created_at = datetime.now()
+        self.memory_report = memory_report
+        self._base = frame
+        self._base_index = base_index
+        self._pending = list(pending)
+        self._num_rows = len(frame) + sum(len(batch) for batch in self._pending)
+        self._index = None
+        self._derived = dict(derived or {})
+        # Reentrante: construir una estructura derivada puede pedir el índice
+        self._derived_lock = threading.RLock()
+
+    @property
+    def index(self):
+        """
+        FilterIndex de la foto (une los lotes pendientes la primera vez)
+        Si la foto anterior ya tenía índice, los lotes se le agregan al
+        final sin volver a ordenar todas las filas.
+        """
+        if self._index is None:
+            with self._derived_lock:
+                if self._index is None:
+                    index = self._base_index or FilterIndex(self._base)
+                    if self._pending:
+                        index = index.merged_with(pd.concat(self._pending, ignore_index=True))
+                    self._index = self._base_index = index
+                    self._base = index.frame
+                    self._pending = []
+        return self._index
+
+    @property
+    def _frame(self):
+        return self.index.frame
+
+    def append(self, version, batch):
+        """
+        Crea la foto siguiente agregando un lote de filas, en O(lote)
+        Las estructuras derivadas que saben actualizarse (merged_with) se
+        actualizan con el lote; las demás se recalculan cuando se pidan.
+        """
+        with self._derived_lock:
+            base, base_index = self._base, self._base_index
+            pending = self._pending + [batch]
+            derived = {
+                key: value.merged_with(batch)
+                for key, value in self._derived.items()
+                if hasattr(value, 'merged_with')
+            }
+        return DatasetSnapshot(version, base, self.memory_report, pending, derived, base_index)
+
+    @property
+    def data(self):
+        """
+        Retorna el DataFrame de la foto
+        Returns:
+            Copia superficial (sin copiar datos): agregar o quitar columnas
+            no afecta a la foto, pero los valores deben tratarse como solo lectura
+        """
+        return self._frame.copy(deep=False)
+
+    def get_derived(self, key, factory):
+        """
+        Estructura derivada de los datos, calculada una sola vez por foto
+        Args:
+            key: Llave de la estructura (p. ej. 'kpi_cube')
+            factory: Función que recibe el DataFrame y construye la estructura
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = factory(self._frame)
+                    self._derived[key] = value
+        return value
+
+    @property
+    def cube(self):
+        """Cubo de KPIs por especie × región de esta foto"""
+        return self.get_derived('kpi_cube', KpiCube)
+
+    def select(self, species=None, region=None):
+        """Filas de la foto que cumplen los filtros (copia superficial, sin copiar datos)"""
+        return self.index.select(species=species, region=region)
+
+    def __len__(self):
+        return self._num_rows
+
+
+class DatasetCache:
+    """Cache del dataset a nivel de proceso, versionada e invalidable"""
+
+    def __init__(self, source, compact=True, float32=False):
+        """
+        Args:
+            source: DataSource de donde se leen los datos
+            compact: Si True, guarda los datos con el esquema compacto
+                (categóricas, enteros reducidos)
+            float32: Si True, además reduce las mediciones a float32
+        """
+        self.source = source
+        self.compact = compact
+        self.float32 = float32
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        # Lotes recibidos por streaming desde la última publicación: se
+        # vuelven a agregar cuando refresh() relee la fuente
+        self._streamed = []
+
+    def get_snapshot(self):
+        """Retorna la foto actual, construyéndola una sola vez por versión"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            # Otro hilo pudo construirla mientras esperábamos el lock
+            if self._snapshot is None:
+                frame = self.source.load()
+                self._swap(frame, self.source.files())
+            return self._snapshot
+
+    def publish(self, frame):
+        """
+        Publica un nuevo DataFrame como la foto actual
+        Las lecturas en curso conservan la foto con la que empezaron. El
+        DataFrame reemplaza todo, incluidas las filas recibidas por streaming.
+        """
+        with self._lock:
+            self._streamed = []
+            return self._swap(frame)
+
+    def refresh(self):
+        """
+        Relee las partes modificadas de la fuente y publica una nueva foto
+        Las filas recibidas por streaming se conservan al final.
+        Returns:
+            La nueva foto, o None si la fuente no cambió
+        """
+        frame = self.source.poll()
+        if frame is None:
+            return None
+        with self._lock:
+            return self._swap(frame, self.source.files())
+
+    def append(self, batch):
+        """
+        Agrega un lote de filas nuevas (ingesta append-only)
+        Returns:
+            La nueva foto
+        """
+        if self.compact:
+            batch, _ = compact_frame(batch, float32=self.float32)
+
+        snapshot = self.get_snapshot()
+        with self._lock:
+            snapshot = self._snapshot or snapshot
+            self._streamed.append(batch)
+            self._version += 1
+            self._snapshot = snapshot.append(self._version, batch)
+            return self._snapshot
+
+    def invalidate(self):
+        """Descarta la foto actual; la siguiente lectura reconstruye el dataset"""
+        with self._lock:
+            self._snapshot = None
+
+    def _swap(self, frame, files=None):
+        """
+        Reemplaza la foto actual (se llama con el lock tomado)
+        Args:
+            frame: DataFrame de la nueva foto
+            files: Archivos de la fuente que forman frame (si se conocen)
+        """
+        report = None
+        if self.compact:
+            frame, report = compact_frame(frame, float32=self.float32)
+        if self._streamed:
+            frame = append_frames(frame, pd.concat(self._streamed, ignore_index=True))
+            files = None
+
+        self._version += 1
+        self._snapshot = DatasetSnapshot(self._version, frame, report, files=files)
+        # Construir el índice aquí y no en el primer callback que lo necesite
+        self._snapshot.index
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Versión de la última foto construida (0 si aún no hay ninguna)"""
+        return self._version
+
+
+def create_data_source(path=None, pattern=None):
+    """
+    Crea la fuente de datos según la configuración
+    Args:
+        path: Archivo o directorio; si None usa config.DATA_SOURCE_PATH
+        pattern: Patrón de archivos para directorios
+    Returns:
+        Instancia de DataSource
+    """
+    path = path or config.DATA_SOURCE_PATH
+
+    if path and os.path.isdir(path):
+        return DirectoryDataSource(path, pattern or config.DATA_SOURCE_PATTERN)
+    if path:
+        return FileDataSource(path)
+    if config.SYNTHETIC_ROWS:
+        return GeneratorDataSource(
+            lambda: generate_iris_frame(config.SYNTHETIC_ROWS, config.SYNTHETIC_SEED)
+        )
+    return GeneratorDataSource(_build_iris_frame)
+
+
+# Instancia global
+dataset_cache = DatasetCache(
+    create_data_source(),
+    compact=config.COMPACT_SCHEMA,
+    float32=config.COMPACT_FLOAT32
+)
+_refresher = None
+_ingestors = []
+
+# Vistas filtradas por (versión, especie, región), compartidas por todos los
+# callbacks que disparó el mismo cambio de filtros
+filtered_view_cache = LRUCache(config.FILTERED_VIEW_CACHE_SIZE)
+
+# KPIs por (versión, motor, especie, región)
+kpi_cache = LRUCache(config.FILTERED_VIEW_CACHE_SIZE)
+
+
+def get_dataset_snapshot():
+    """Retorna la foto versionada actual del dataset"""
+    return dataset_cache.get_snapshot()
+
+
+def invalidate_dataset_cache():
+    """Fuerza la reconstrucción del dataset en la próxima lectura"""
+    dataset_cache.invalidate()
+
+
+def get_memory_report(as_text=False):
+    """
+    Reporte de memoria ahorrada por el esquema compacto
+    Args:
+        as_text: Si True, retorna una línea legible en lugar del diccionario
+    Returns:
+        Reporte de la foto actual (None si el esquema compacto está desactivado)
+    """
+    report = get_dataset_snapshot().memory_report
+    if as_text and report is not None:
+        return format_memory_report(report)
+    return report
+
+
+def get_query_backend(snapshot=None):
+    """
+    Motor que responde los KPIs y agregados de una foto
+    Args:
+        snapshot: Foto a consultar; si None usa la actual
+    Returns:
+        KpiCube o SqlQueryBackend según config.QUERY_BACKEND (misma interfaz)
+    """
+    snapshot = snapshot or get_dataset_snapshot()
+    engine = config.QUERY_BACKEND
+
+    if engine not in ('duckdb', 'sqlite'):
+        return snapshot.cube
+
+    # Con DuckDB y una fuente en disco, las consultas leen los archivos
+    # directamente; si la foto tiene filas recibidas por streaming (files es
+    # None) se consulta el DataFrame
+    files = snapshot.files if engine == 'duckdb' else None
+    return snapshot.get_derived(
+        ('sql_backend', engine),
+        lambda frame: SqlQueryBackend(None if files else frame, engine=engine, files=files)
+    )
+
+
+def get_kpi_totals(species=None, region=None):
+    """
+    KPIs de una combinación de filtros (ver KpiCube.totals), calculados una
+    vez por versión del dataset
+    Returns:
+        Diccionario compartido entre callbacks (tratar como solo lectura)
+    """
+    snapshot = get_dataset_snapshot()
+    species = species or 'all'
+    region = region or 'all'
+
+    return kpi_cache.get_or_set(
+        (snapshot.version, config.QUERY_BACKEND, species, region),
+        lambda: get_query_backend(snapshot).totals(species, region)
+    )
+
+
+def get_histogram_counts(column, species=None, bins=20, edges=None):
+    """
+    Conteos por bin y especie de una medición (ver SortedColumns.histogram)
+    Los arreglos ordenados por especie se construyen una vez por versión.
+    Args:
+        column: Columna numérica
+        species: Filtro de especies ('all' o None para todas)
+        bins: Número de bins iguales
+        edges: Bordes explícitos (reemplaza a bins)
+    Returns:
+        DataFrame pequeño (group, bin_start, bin_end, count) con huella registrada
+    """
+    snapshot = get_dataset_snapshot()
+    species = species or 'all'
+    groups = None if species == 'all' else [species]
+
+    counts = _sorted_columns(snapshot).histogram(
+        column, bins=bins, edges=edges, groups=groups
+    )
+    edges_key = tuple(float(edge) for edge in edges) if edges is not None else None
+    return register_fingerprint(
+        counts, ('histogram', snapshot.version, species, column, bins, edges_key)
+    )
+
+
+def get_moments(species=None, region=None):
+    """
+    Momentos (conteo, medias, co-momentos, mínimos, máximos) de una
+    combinación de filtros, combinando las celdas especie × región
+    Returns:
+        data.moments.Moments (correlation, regression, describe)
+    """
+    snapshot = get_dataset_snapshot()
+    return snapshot.get_derived('moment_cube', MomentCube).moments(species, region)
+
+
+def get_correlation_matrix(species=None, region=None, columns=MEASUREMENTS):
+    """
+    Matriz de correlación de Pearson desde los momentos combinables
+    Returns:
+        DataFrame k × k con huella registrada (versión, filtros, columnas)
+    """
+    snapshot = get_dataset_snapshot()
+    species = species or 'all'
+    region = region or 'all'
+
+    matrix = get_moments(species, region).correlation(columns)
+    return register_fingerprint(
+        matrix, ('correlation', snapshot.version, species, region, tuple(columns))
+    )
+
+
+def _sorted_columns(snapshot):
+    return snapshot.get_derived('sorted_columns', SortedColumns)
+
+
+def get_box_summaries(column, groups=None):
+    """
+    Estadísticos de box plot por especie (ver SortedColumns.box_summary)
+    Cada (columna, especie) se calcula una vez por versión del dataset.
+    Args:
+        column: Columna numérica
+        groups: Especies a incluir (None = todas)
+    Returns:
+        DataFrame con una fila por especie (columna group) y huella registrada
+    """
+    snapshot = get_dataset_snapshot()
+    sorted_columns = _sorted_columns(snapshot)
+    groups = sorted_columns.groups if groups is None else [str(group) for group in groups]
+
+    rows = []
+    for group in groups:
+        summary = snapshot.get_derived(
+            ('box_summary', column, group),
+            lambda frame, group=group: sorted_columns.box_summary(column, group) or {}
+        )
+        if summary:
+            rows.append(dict(summary, group=group))
+
+    return register_fingerprint(
+        pd.DataFrame(rows), ('box_summary', snapshot.version, column, tuple(groups))
+    )
+
+
+def get_density_curves(column, groups=None, points=200, bandwidth=None):
+    """
+    Curvas de densidad por especie en una grilla común (KDE por FFT)
+    Todas las especies se calculan en una pasada y se guardan por
+    (columna, ancho de banda, puntos) una vez por versión del dataset.
+    Args:
+        column: Columna numérica
+        groups: Especies a incluir (None = todas)
+        points: Puntos de la grilla
+        bandwidth: Ancho de banda común; None = regla de plotly.js por especie
+    Returns:
+        DataFrame (group, value, density) con huella registrada
+    """
+    snapshot = get_dataset_snapshot()
+    grid, curves = snapshot.get_derived(
+        ('density', column, bandwidth, points),
+        lambda frame: _sorted_columns(snapshot).densities(column, points=points, bandwidth=bandwidth)
+    )
+    groups = list(curves) if groups is None else [str(group) for group in groups]
+
+    frames = [pd.DataFrame({'group': group, 'value': grid, 'density': curves[group]})
+              for group in groups if group in curves]
+    densities = (pd.concat(frames, ignore_index=True) if frames
+                 else pd.DataFrame(columns=['group', 'value', 'density']))
+    return register_fingerprint(
+        densities, ('density', snapshot.version, column, tuple(groups), points, bandwidth)
+    )
+
+
+def get_violin_densities(column, groups=None, points=100):
+    """Densidad por especie para violines (ver get_density_curves)"""
+    return get_density_curves(column, groups=groups, points=points)
+
+
+def start_data_refresher(interval=None):
+    """
+    Inicia (una sola vez) el hilo que refresca el dataset en caliente
+    Args:
+        interval: Segundos entre revisiones; si None usa la configuración
+    Returns:
+        El DataRefresher activo, o None si el refresco está desactivado
+    """
+    global _refresher
+
+    interval = config.DATA_REFRESH_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return None
+
+    if _refresher is None or not _refresher.is_alive():
+        _refresher = DataRefresher(dataset_cache, interval)
+        _refresher.start()
+    return _refresher
+
+
+def start_stream_ingestion():
+    """
+    Inicia (una sola vez) los hilos de ingesta en streaming configurados
+    Returns:
+        Lista de ingestores activos
+    """
+    if _ingestors:
+        return _ingestors
+
+    if config.STREAM_SPOOL_DIR:
+        _ingestors.append(SpoolDirectoryIngestor(dataset_cache, config.STREAM_SPOOL_DIR))
+    if config.STREAM_SOCKET_PORT:
+        _ingestors.append(SocketIngestor(
+            dataset_cache, config.STREAM_SOCKET_HOST, config.STREAM_SOCKET_PORT
+        ))
+
+    for ingestor in _ingestors:
+        ingestor.start()
+    return _ingestors
+
+
+def append_iris_data(batch):
+    """
+    Agrega un lote de filas al dataset (append-only)
+    Args:
+        batch: DataFrame con las mismas columnas que load_iris_data
+    Returns:
+        Versión de la nueva foto
+    """
+    return dataset_cache.append(batch).version
+
+
+def preload_dataset():
+    """
+    Construye la foto actual y sus estructuras derivadas (índice, cubos,
+    columnas ordenadas) de una vez
+    Pensado para el proceso maestro de gunicorn antes del fork: los workers
+    heredan esas páginas de memoria y las comparten mientras no se escriban.
+    Returns:
+        La foto precargada
+    """
+    snapshot = get_dataset_snapshot()
+    snapshot.index
+    snapshot.cube
+    snapshot.get_derived('moment_cube', MomentCube)
+    _sorted_columns(snapshot)
+    get_query_backend(snapshot)
+    get_kpi_totals()
+    return snapshot
+
+
+def load_iris_data(n_rows=None, seed=42):
+    """
+    Carga y prepara el dataset Iris (construido una vez por proceso)
+    Args:
+        n_rows: Si se indica, genera esa cantidad de filas sintéticas con la
+            misma distribución (no usa la cache; útil para pruebas de carga)
+        seed: Semilla del generador sintético
+    """
+    if n_rows is not None:
+        return generate_iris_frame(n_rows, seed)
+    return get_dataset_snapshot().data
+
+
+def filter_iris_data(species=None, region=None):
+    """
+    Filtra el dataset usando el índice de la foto actual
+    La vista se calcula una vez por (versión, filtros) y se comparte entre
+    todos los callbacks que la piden.
+    Args:
+        species: Filtro de especies ('all' o None para no filtrar)
+        region: Filtro de región ('all' o None para no filtrar)
+    Returns:
+        Copia superficial del DataFrame filtrado: agregar columnas no afecta
+        a la vista compartida, pero los valores deben tratarse como solo lectura
+    """
+    snapshot = get_dataset_snapshot()
+    species = species or 'all'
+    region = region or 'all'
+
+    view = filtered_view_cache.get_or_set(
+        (snapshot.version, species, region),
+        lambda: snapshot.select(species=species, region=region)
+    )
+
+    # La huella (versión, filtros) permite a las gráficas reconocer la vista
+    # sin recorrer sus filas (cache de figuras de BaseChart)
+    return register_fingerprint(
+        view.copy(deep=False), ('view', snapshot.version, species, region)
+    )
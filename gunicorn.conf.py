@@ -0,0 +1,45 @@
+"""
+Configuración de gunicorn para producción
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Variables de entorno:
+    IRIS_BIND: Dirección de escucha (por defecto 0.0.0.0:8050)
+    IRIS_WEB_WORKERS: Procesos worker (por defecto, uno por CPU)
+    IRIS_WEB_THREADS: Hilos por worker (por defecto 4)
+    IRIS_WEB_TIMEOUT: Segundos antes de reiniciar un worker bloqueado
+"""
+import multiprocessing
+import os
+
+# Los hilos de refresco e ingesta se inician en cada worker (post_fork), no
+# en el maestro al importar app.py
+os.environ.setdefault("IRIS_DEFER_BACKGROUND_SERVICES", "1")
+
+bind = os.environ.get("IRIS_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("IRIS_WEB_WORKERS", str(multiprocessing.cpu_count())))
+threads = int(os.environ.get("IRIS_WEB_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("IRIS_WEB_TIMEOUT", "120"))
+
+# Importar la app (y precargar el dataset) una sola vez antes del fork
+preload_app = True
+
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    """Inicia en el worker los hilos que no sobreviven al fork"""
+    import config
+    from app import start_background_services
+
+    # Cada worker tiene su propia copia del dataset: un spool o un socket de
+    # ingesta solo llegaría a uno de ellos
+    if config.STREAMING_ENABLED and workers > 1:
+        server.log.warning(
+            "La ingesta en streaming requiere IRIS_WEB_WORKERS=1; "
+            "este worker no la iniciará"
+        )
+        config.STREAMING_ENABLED = False
+
+    start_background_services()
@@ -3,6 +3,56 @@ Layout principal con sidebar y contenido
 """
 from dash import html, dcc
 import dash_bootstrap_components as dbc
+import config
+
+def get_background_status(prefix):
+    """
+    Barra de progreso y botón de cancelar de una gráfica calculada en segundo
+    plano (visible solo mientras se construye)
+    Args:
+        prefix: Prefijo de los ids ("{prefix}-status", "-progress", "-cancel-btn")
+    """
+    return html.Div([
+        dbc.Progress(
+            id=f"{prefix}-progress",
+            value=0,
+            max=1,
+            striped=True,
+            animated=True,
+            style={"height": "6px", "flex": "1"}
+        ),
+        dbc.Button(
+            html.I(className="fas fa-times"),
+            id=f"{prefix}-cancel-btn",
+            color="link",
+            size="sm",
+            disabled=True,
+            title="Cancelar",
+            className="p-0 ms-2"
+        )
+    ], id=f"{prefix}-status", className="align-items-center px-2", style={"display": "none"})
+
+def get_admin_panel():
+    """
+    Panel de rendimiento de los callbacks; "role-based-content" lo muestra
+    solo a los administradores
+    """
+    return html.Div([
+        dbc.Card([
+            dbc.CardHeader([
+                html.Div([
+                    html.H5("Rendimiento de Callbacks", style={"margin": "0", "font-weight": "600", "color": "#1e293b"}),
+                    dbc.Button([
+                        html.I(className="fas fa-sync-alt me-2"),
+                        "Actualizar"
+                    ], id="admin-metrics-refresh", color="outline-primary", size="sm")
+                ], className="d-flex justify-content-between align-items-center")
+            ], style={"background": "white", "border-bottom": "1px solid #e2e8f0"}),
+            dbc.CardBody([
+                html.Div(id="admin-metrics-table")
+            ], style={"padding": "15px"})
+        ], style={"border": "none", "box-shadow": "0 1px 3px rgba(0,0,0,0.1)"})
+    ], id="role-based-content", className="mb-5", style={"display": "none"})
 
 def get_main_layout():
     """Retorna el layout principal"""
@@ -132,7 +182,19 @@ def get_main_layout():
         html.Div(id="filter-warning", className="mt-2"),
 
         # Store para historial de filtros
-        dcc.Store(id="filter-history-store", data=[])
+        dcc.Store(id="filter-history-store", data=[]),
+
+        # Conteos especie × región para contador, validación y sugerencias
+        # calculados en el navegador (assets/custom.js)
+        dcc.Store(id="filter-summary-store"),
+
+        # Actualización en vivo: versión del dataset revisada periódicamente
+        dcc.Interval(
+            id="live-update-interval",
+            interval=config.LIVE_UPDATE_INTERVAL_MS,
+            disabled=not config.STREAMING_ENABLED
+        ),
+        dcc.Store(id="dataset-version-store")
         
         # ===============================================
         # ✅ AQUÍ TERMINAN LOS COMPONENTES NUEVOS
@@ -314,6 +376,7 @@ def get_main_layout():
                         })
                     ], style={"background": "white", "border-bottom": "1px solid #e2e8f0", "padding": "10px 15px"}),
                     dbc.CardBody([
+                        get_background_status("scatter"),
                         dcc.Graph(id="scatter-chart", style={"height": "280px"})
                     ], style={"padding": "5px"})
                 ], style={
@@ -334,6 +397,7 @@ def get_main_layout():
                         })
                     ], style={"background": "white", "border-bottom": "1px solid #e2e8f0", "padding": "10px 15px"}),
                     dbc.CardBody([
+                        get_background_status("heatmap"),
                         dcc.Graph(id="heatmap-chart", style={"height": "280px"})
                     ], style={"padding": "5px"})
                 ], style={
@@ -354,7 +418,9 @@ def get_main_layout():
                         })
                     ], style={"background": "white", "border-bottom": "1px solid #e2e8f0", "padding": "10px 15px"}),
                     dbc.CardBody([
-                        dcc.Graph(id="bar-chart", style={"height": "280px"})
+                        dcc.Graph(id="bar-chart", style={"height": "280px"}),
+                        # Trazas de la figura en el navegador (para decidir si parchearla)
+                        dcc.Store(id="bar-chart-traces")
                     ], style={"padding": "5px"})
                 ], style={
                     "border": "none", 
@@ -362,7 +428,10 @@ def get_main_layout():
                     "border-radius": "12px"
                 })
             ], width=4)
-        ], className="mb-5")
+        ], className="mb-5"),
+
+            # Panel de administración (latencia de callbacks)
+            get_admin_panel()
             
         ], style={"padding": "20px"})
         
@@ -374,5 +443,7 @@ def get_main_layout():
     
     return html.Div([
         sidebar,
-        content
+        content,
+        # Sesión del usuario (la escribe el login; define el rol)
+        dcc.Store(id="session-store", data={})
     ], style={"font-family": "'Inter', sans-serif"})
\ No newline at end of file
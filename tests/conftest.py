@@ -0,0 +1,29 @@
+"""
+Configuración de pytest: datos de prueba compartidos
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Los módulos del proyecto se importan desde la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.data_processor import append_frames, compact_frame  # noqa: E402
+from data.iris_data import generate_iris_frame  # noqa: E402
+
+
+@pytest.fixture
+def base_and_batch():
+    """
+    Dataset compacto y un lote de filas nuevas (con un NaN y solo dos regiones)
+    Returns:
+        Tupla (base, lote, base + lote)
+    """
+    base, _ = compact_frame(generate_iris_frame(2000, seed=1))
+    batch = generate_iris_frame(300, seed=2)
+    batch = batch[batch['region'].isin(batch['region'].cat.categories[:2])].reset_index(drop=True)
+    batch.loc[0, 'sepal width (cm)'] = np.nan
+    batch, _ = compact_frame(batch)
+    return base, batch, append_frames(base, batch)
@@ -0,0 +1,41 @@
+"""
+Pruebas de los resúmenes de box y violin calculados sobre columnas ordenadas
+"""
+import numpy as np
+import pytest
+
+from data.sorted_columns import SortedColumns
+
+
+def test_box_summary_matches_numpy(base_and_batch):
+    _, _, frame = base_and_batch
+    column = 'sepal width (cm)'
+    summary = SortedColumns(frame).box_summary(column, 'versicolor', max_outliers=10 ** 6)
+
+    values = frame.loc[frame['species'] == 'versicolor', column].dropna().to_numpy()
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= low) & (values <= high)]
+
+    assert summary['count'] == len(values)
+    assert summary['mean'] == pytest.approx(values.mean())
+    assert (summary['q1'], summary['median'], summary['q3']) == pytest.approx((q1, median, q3))
+    assert summary['lowerfence'] == inside.min()
+    assert summary['upperfence'] == inside.max()
+    assert summary['outlier_count'] == len(values) - len(inside)
+    np.testing.assert_array_equal(np.sort(summary['outliers']),
+                                  np.sort(values[(values < low) | (values > high)]))
+
+
+def test_box_summary_caps_outliers(base_and_batch):
+    _, _, frame = base_and_batch
+    summary = SortedColumns(frame).box_summary('sepal width (cm)', 'setosa', max_outliers=2)
+
+    assert len(summary['outliers']) <= 2
+    assert summary['outlier_count'] >= len(summary['outliers'])
+
+
+def test_box_summary_unknown_group(base_and_batch):
+    _, _, frame = base_and_batch
+
+    assert SortedColumns(frame).box_summary('sepal width (cm)', 'unknown') is None
@@ -0,0 +1,55 @@
+"""
+Pruebas de la medición de callbacks, incluidos los de segundo plano
+"""
+import pytest
+
+from utils.callback_metrics import CallbackMetrics, _InstrumentedApp
+
+
+class _FakeApp:
+    """App mínima: app.callback(...) registra la función tal cual"""
+
+    def __init__(self):
+        self.registered = []
+
+    def callback(self, *args, **kwargs):
+        def register(function):
+            self.registered.append(function)
+            return function
+        return register
+
+
+class _FakeManager:
+    def __init__(self, handle):
+        self.handle = handle
+
+
+def test_background_callback_is_timed_through_the_cache(tmp_path):
+    diskcache = pytest.importorskip('diskcache')
+    cache = diskcache.Cache(str(tmp_path))
+    metrics = CallbackMetrics()
+    app = _FakeApp()
+
+    @_InstrumentedApp(app, metrics).callback(background=True, manager=_FakeManager(cache))
+    def build_heatmap(set_progress, value):
+        set_progress((1, 1))
+        return value * 2
+
+    # En producción esta llamada ocurre en el proceso del manager
+    assert app.registered[0](lambda progress: None, 21) == 42
+
+    stats = metrics.stats()
+    assert stats['build_heatmap']['calls'] == 1
+    assert stats['build_heatmap']['errors'] == 0
+    # La cola quedó vacía: no se vuelve a sumar
+    assert metrics.stats()['build_heatmap']['calls'] == 1
+
+
+def test_quantile_uses_bucket_bounds():
+    metrics = CallbackMetrics(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.005, 0.05, 0.5):
+        metrics.record_call('update', seconds)
+
+    entry = metrics.stats()['update']
+    assert metrics.quantile(entry, 0.5) == 0.01
+    assert metrics.quantile(entry, 0.95) == 0.5
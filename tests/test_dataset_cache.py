@@ -0,0 +1,23 @@
+"""
+Pruebas de la cache versionada del dataset
+"""
+from data.iris_data import generate_iris_frame
+from data.sources import GeneratorDataSource
+from data_loader import DatasetCache
+
+
+def test_snapshot_built_once_per_version():
+    calls = []
+
+    def generator():
+        calls.append(1)
+        return generate_iris_frame(200, seed=len(calls))
+
+    cache = DatasetCache(GeneratorDataSource(generator))
+    first = cache.get_snapshot()
+
+    assert cache.get_snapshot() is first
+    assert first.version == cache.version == 1
+    assert len(calls) == 1
+    # Sin firma que cambie, refresh no publica una foto nueva
+    assert cache.refresh() is None
@@ -0,0 +1,46 @@
+"""
+Pruebas de la KDE por FFT contra la suma directa de gaussianas
+"""
+import numpy as np
+import pytest
+
+from data.density import binned_kde, density_grid, group_densities, rule_of_thumb_bandwidth
+
+
+def exact_kde(values, grid, bandwidth):
+    """Densidad gaussiana evaluada punto por punto"""
+    z = (grid[:, None] - values[None, :]) / bandwidth
+    return np.exp(-0.5 * z ** 2).sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def test_binned_kde_matches_exact():
+    rng = np.random.default_rng(3)
+    arrays = [np.sort(rng.normal(0, 1, 5000)),
+              np.sort(np.concatenate([rng.normal(-2, 0.3, 300), rng.normal(3, 0.8, 700)]))]
+    bandwidths = [rule_of_thumb_bandwidth(values) for values in arrays]
+    grid = density_grid(arrays, bandwidths, points=200)
+
+    matrix = binned_kde(arrays, grid, bandwidths)
+
+    assert matrix.shape == (2, 200)
+    for values, bandwidth, density in zip(arrays, bandwidths, matrix):
+        exact = exact_kde(values, grid, bandwidth)
+        assert np.abs(density - exact).max() < 0.01 * exact.max()
+        assert np.trapz(density, grid) == pytest.approx(1.0, abs=0.01)
+
+
+def test_group_densities_skips_empty_groups():
+    values = np.sort(np.random.default_rng(4).uniform(0, 10, 400))
+
+    grid, curves = group_densities({'a': values, 'b': np.array([])}, points=50, bandwidth=0.5)
+
+    assert len(grid) == 50
+    assert list(curves) == ['a']
+    np.testing.assert_allclose(curves['a'], exact_kde(values, grid, 0.5), atol=0.01 * curves['a'].max())
+
+
+def test_group_densities_without_values():
+    grid, curves = group_densities({'a': np.array([])})
+
+    assert len(grid) == 0
+    assert curves == {}
@@ -0,0 +1,69 @@
+"""
+Pruebas de FilterIndex: mismo resultado que filtrar con máscaras booleanas
+"""
+import pytest
+
+from data.filter_index import FilterIndex
+from data.iris_data import SPECIES, REGIONS
+
+
+@pytest.fixture
+def index(base_and_batch):
+    _, _, frame = base_and_batch
+    return FilterIndex(frame)
+
+
+@pytest.mark.parametrize('species', ('all',) + tuple(SPECIES))
+@pytest.mark.parametrize('region', ('all', None) + tuple(REGIONS))
+def test_select_equals_boolean_mask(index, species, region):
+    frame = index.frame
+    mask = frame['species'].notna()
+    if species != 'all':
+        mask &= frame['species'] == species
+    if region not in (None, 'all'):
+        mask &= frame['region'] == region
+
+    selected = index.select(species=species, region=region)
+
+    assert selected.equals(frame[mask])
+    assert index.count(species=species, region=region) == int(mask.sum())
+
+
+def test_select_does_not_share_columns(index):
+    selected = index.select()
+    selected['extra'] = 1
+
+    assert 'extra' not in index.frame.columns
+    assert 'extra' not in index.select(species='setosa').columns
+
+
+def test_values_present_after_filter(index):
+    frame = index.frame
+    expected = sorted(frame.loc[frame['species'] == 'virginica', 'region'].astype(str).unique())
+
+    assert [str(value) for value in index.values('region', species='virginica')] == expected
+
+
+@pytest.mark.parametrize('species', ('all', 'setosa'))
+@pytest.mark.parametrize('region', ('all',) + tuple(REGIONS))
+def test_merged_with_equals_boolean_mask(base_and_batch, species, region):
+    base, batch, _ = base_and_batch
+    merged = FilterIndex(base).merged_with(batch)
+    frame = merged.frame
+    mask = frame['species'].notna()
+    if species != 'all':
+        mask &= frame['species'] == species
+    if region != 'all':
+        mask &= frame['region'] == region
+
+    assert len(frame) == len(base) + len(batch)
+    assert merged.select(species=species, region=region).equals(frame[mask])
+
+
+def test_merged_with_keeps_existing_rows(base_and_batch):
+    base, batch, _ = base_and_batch
+    index = FilterIndex(base)
+    merged = index.merged_with(batch)
+
+    assert merged.frame.iloc[:len(base)].reset_index(drop=True).equals(index.frame)
+    assert list(merged.row_ids['region']) == sorted(merged.row_ids['region'])
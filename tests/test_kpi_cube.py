@@ -0,0 +1,38 @@
+"""
+Pruebas de KpiCube: el cubo actualizado con un lote = el cubo recalculado
+"""
+import pandas as pd
+import pytest
+
+from data.kpi_cube import COUNTERS, KpiCube
+
+
+@pytest.mark.parametrize('species, region', [
+    ('all', 'all'), ('versicolor', 'all'), ('all', 0), ('setosa', -1)
+])
+def test_merged_with_equals_recomputed(base_and_batch, species, region):
+    base, batch, frame = base_and_batch
+    if isinstance(region, int):
+        region = str(frame['region'].cat.categories[region])
+
+    merged = KpiCube(base).merged_with(batch).totals(species, region)
+    recomputed = KpiCube(frame).totals(species, region)
+
+    assert merged['count'] == recomputed['count']
+    assert merged['species_count'] == recomputed['species_count']
+    for statistic in ('sum', 'min', 'max', 'mean'):
+        assert merged[statistic] == pytest.approx(recomputed[statistic], rel=1e-12, nan_ok=True)
+
+
+def test_group_sum_equals_pandas(base_and_batch):
+    base, batch, frame = base_and_batch
+    cube = KpiCube(base).merged_with(batch)
+
+    for column in COUNTERS:
+        result = cube.group_sum('region', column)
+        expected = frame.groupby('region', observed=True)[column].sum()
+
+        assert dict(zip(result['region'], result[column])) == expected.to_dict()
+        assert list(result[column]) == sorted(result[column], reverse=True)
+        # Con enteros sin signo plotly.express dibujaría una traza por región
+        assert pd.api.types.is_signed_integer_dtype(result[column])
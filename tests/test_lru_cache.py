@@ -0,0 +1,60 @@
+"""
+Pruebas de LRUCache: descarte por uso y cálculo único por llave en curso
+"""
+import threading
+import time
+
+import pytest
+
+from utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_concurrent_get_or_set_computes_once():
+    cache = LRUCache(8)
+    calls = []
+    threads_count = 8
+    barrier = threading.Barrier(threads_count)
+    results = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_or_set('key', factory))
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == threads_count
+    assert all(result is results[0] for result in results)
+
+
+def test_failed_factory_is_retried():
+    cache = LRUCache(8)
+
+    def failing():
+        raise ValueError('falla')
+
+    with pytest.raises(ValueError):
+        cache.get_or_set('key', failing)
+
+    assert cache.get_or_set('key', lambda: 42) == 42
+    assert cache._inflight == {}
@@ -0,0 +1,72 @@
+"""
+Pruebas de Moments y MomentCube: combinar = recalcular desde las filas
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.kpi_cube import MEASUREMENTS
+from data.moments import MomentCube, Moments
+
+COLUMNS = list(MEASUREMENTS)
+
+
+def assert_same_moments(actual, expected):
+    assert actual.count == expected.count
+    np.testing.assert_allclose(actual.mean, expected.mean, rtol=1e-12)
+    np.testing.assert_allclose(actual.comoment, expected.comoment, rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(actual.minimum, expected.minimum)
+    np.testing.assert_array_equal(actual.maximum, expected.maximum)
+
+
+def test_merge_equals_recomputed():
+    rng = np.random.default_rng(0)
+    first = rng.normal(5, 2, (500, 4))
+    second = rng.normal(-3, 0.5, (37, 4))
+
+    merged = Moments.from_values(COLUMNS, first).merge(Moments.from_values(COLUMNS, second))
+
+    assert_same_moments(merged, Moments.from_values(COLUMNS, np.vstack([first, second])))
+
+
+def test_merge_with_empty():
+    values = np.arange(12, dtype=float).reshape(3, 4)
+    moments = Moments.from_values(COLUMNS, values)
+    empty = Moments.empty(COLUMNS)
+
+    assert moments.merge(empty) is moments
+    assert empty.merge(moments) is moments
+
+
+def test_statistics_match_pandas(base_and_batch):
+    _, _, frame = base_and_batch
+    values = frame[COLUMNS].dropna()
+    moments = Moments.from_values(COLUMNS, values.to_numpy())
+
+    pd.testing.assert_frame_equal(moments.correlation(), values.corr(), rtol=1e-10)
+    pd.testing.assert_frame_equal(moments.covariance(), values.cov(), rtol=1e-10)
+
+    describe = values.describe().loc[['count', 'mean', 'std', 'min', 'max']]
+    pd.testing.assert_frame_equal(moments.describe(), describe, rtol=1e-10)
+
+    x, y = values[COLUMNS[0]].to_numpy(), values[COLUMNS[2]].to_numpy()
+    slope, intercept = np.polyfit(x, y, 1)
+    regression = moments.regression(COLUMNS[0], COLUMNS[2])
+    assert regression['slope'] == pytest.approx(slope, rel=1e-9)
+    assert regression['intercept'] == pytest.approx(intercept, rel=1e-9)
+    assert regression['r2'] == pytest.approx(np.corrcoef(x, y)[0, 1] ** 2, rel=1e-9)
+
+
+@pytest.mark.parametrize('species, region', [
+    ('all', 'all'), ('setosa', 'all'), ('all', None), ('virginica', 0), ('setosa', -1)
+])
+def test_cube_merged_with_equals_recomputed(base_and_batch, species, region):
+    base, batch, frame = base_and_batch
+    if isinstance(region, int):
+        region = str(frame['region'].cat.categories[region])
+
+    merged = MomentCube(base).merged_with(batch)
+    recomputed = MomentCube(frame)
+
+    assert set(merged.cells) == set(recomputed.cells)
+    assert_same_moments(merged.moments(species, region), recomputed.moments(species, region))
@@ -0,0 +1,46 @@
+"""
+Pruebas de figure_patch: el parche solo lleva las rutas pedidas
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from charts.patching import figure_patch
+
+
+def operations(patch):
+    """Operaciones del parche como {ubicación: valor}"""
+    return {tuple(op['location']): op['params']['value']
+            for op in patch.to_plotly_json()['operations']}
+
+
+def test_patch_assigns_requested_paths():
+    fig = go.Figure([
+        go.Bar(x=['a', 'b'], y=np.array([1, 2]), marker=dict(color=np.array([1, 2]))),
+        go.Bar(x=['c'], y=np.array([3]), marker=dict(color=np.array([3])))
+    ])
+    fig.update_layout(xaxis_title_text='Región')
+
+    ops = operations(figure_patch(fig, trace_props=('x', 'y', 'marker.color'),
+                                  layout_props=('xaxis.title.text',)))
+
+    assert set(ops) == {
+        ('data', 0, 'x'), ('data', 0, 'y'), ('data', 0, 'marker', 'color'),
+        ('data', 1, 'x'), ('data', 1, 'y'), ('data', 1, 'marker', 'color'),
+        ('layout', 'xaxis', 'title', 'text')
+    }
+    assert list(ops[('data', 0, 'y')]) == [1, 2]
+    assert list(ops[('data', 1, 'x')]) == ['c']
+    assert ops[('layout', 'xaxis', 'title', 'text')] == 'Región'
+
+
+def test_patch_skips_paths_missing_from_trace_type():
+    fig = go.Figure([
+        go.Box(q1=[1.0], median=[2.0], q3=[3.0], x=['a']),
+        go.Scatter(x=[1.0], y=[5.0])
+    ])
+
+    ops = operations(figure_patch(fig, trace_props=('q1', 'x', 'y')))
+
+    assert ('data', 0, 'q1') in ops
+    assert ('data', 1, 'q1') not in ops
+    assert ('data', 1, 'y') in ops
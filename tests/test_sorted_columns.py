@@ -0,0 +1,42 @@
+"""
+Pruebas de SortedColumns: intercalar un lote = ordenar todo otra vez
+"""
+import numpy as np
+
+from data.sorted_columns import SortedColumns
+
+
+def test_merged_with_equals_recomputed(base_and_batch):
+    base, batch, frame = base_and_batch
+
+    merged = SortedColumns(base).merged_with(batch)
+    recomputed = SortedColumns(frame)
+
+    assert merged.groups == recomputed.groups
+    for group in recomputed.groups:
+        for column in recomputed.columns:
+            np.testing.assert_array_equal(merged.arrays[group][column],
+                                          recomputed.arrays[group][column])
+
+
+def test_merged_with_new_group(base_and_batch):
+    base, batch, _ = base_and_batch
+    base = base[base['species'] != 'setosa']
+
+    merged = SortedColumns(base).merged_with(batch)
+
+    assert 'setosa' in merged.groups
+    np.testing.assert_array_equal(merged.arrays['setosa']['petal length (cm)'],
+                                  SortedColumns(batch).arrays['setosa']['petal length (cm)'])
+
+
+def test_histogram_matches_numpy(base_and_batch):
+    _, _, frame = base_and_batch
+    column = 'sepal width (cm)'
+    columns = SortedColumns(frame)
+    counts = columns.histogram(column, bins=17)
+
+    low, high = columns.value_range(column)
+    for group, rows in frame.groupby('species', observed=True):
+        expected, _ = np.histogram(rows[column].dropna(), bins=17, range=(low, high))
+        np.testing.assert_array_equal(counts.loc[counts['group'] == group, 'count'], expected)
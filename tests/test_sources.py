@@ -0,0 +1,51 @@
+"""
+Pruebas de las fuentes de datos y del cambio atómico de foto
+"""
+import os
+
+from data.iris_data import generate_iris_frame
+from data.sources import FileDataSource, GeneratorDataSource
+from data_loader import DatasetCache
+
+
+def test_publish_keeps_previous_snapshot_intact():
+    cache = DatasetCache(GeneratorDataSource(lambda: generate_iris_frame(200, seed=1)))
+    old = cache.get_snapshot()
+    old_rows = old.data.copy()
+
+    new = cache.publish(generate_iris_frame(50, seed=2))
+
+    assert cache.get_snapshot() is new
+    assert new.version == old.version + 1
+    assert len(new) == 50
+    # Quien empezó con la foto anterior la sigue leyendo completa
+    assert len(old) == 200
+    assert old.data.equals(old_rows)
+    assert old.cube.count() == 200
+
+
+def test_vanished_file_keeps_snapshot(tmp_path):
+    path = tmp_path / 'iris.csv'
+    generate_iris_frame(120, seed=3).to_csv(path, index=False)
+    cache = DatasetCache(FileDataSource(str(path)))
+    snapshot = cache.get_snapshot()
+
+    os.remove(path)
+
+    assert cache.refresh() is None
+    assert cache.get_snapshot() is snapshot
+    assert len(cache.get_snapshot()) == 120
+
+
+def test_changed_file_publishes_new_snapshot(tmp_path):
+    path = tmp_path / 'iris.csv'
+    generate_iris_frame(120, seed=3).to_csv(path, index=False)
+    cache = DatasetCache(FileDataSource(str(path)))
+    cache.get_snapshot()
+
+    generate_iris_frame(80, seed=4).to_csv(path, index=False)
+    os.utime(path, ns=(1, 1))
+
+    snapshot = cache.refresh()
+    assert snapshot is not None
+    assert len(snapshot) == 80
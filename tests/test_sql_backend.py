@@ -0,0 +1,89 @@
+"""
+Pruebas del backend SQL: mismos KPIs que KpiCube y que pandas
+"""
+import pytest
+
+import config
+import data_loader
+from data.iris_data import generate_iris_frame
+from data.kpi_cube import COUNTERS, KpiCube
+from data.sources import DirectoryDataSource
+from data.sql_backend import SqlQueryBackend
+from data_loader import DatasetCache
+
+def _engines():
+    engines = ['sqlite']
+    try:
+        import duckdb  # noqa: F401
+        engines.append('duckdb')
+    except ImportError:
+        pass
+    return engines
+
+
+def _assert_same_totals(backend, cube, species, region):
+    totals = backend.totals(species, region)
+    expected = cube.totals(species, region)
+
+    assert totals['count'] == expected['count']
+    assert totals['species_count'] == expected['species_count']
+    for statistic in ('sum', 'min', 'max', 'mean'):
+        assert totals[statistic] == pytest.approx(expected[statistic], rel=1e-9, nan_ok=True)
+
+
+@pytest.mark.parametrize('engine', _engines())
+@pytest.mark.parametrize('species, region', [
+    ('all', 'all'), ('versicolor', 'all'), ('all', 'Asia'), ('setosa', 'Europe')
+])
+def test_totals_equal_kpi_cube(base_and_batch, engine, species, region):
+    _, _, frame = base_and_batch
+    backend = SqlQueryBackend(frame, engine=engine)
+
+    assert backend.engine == engine
+    _assert_same_totals(backend, KpiCube(frame), species, region)
+
+
+@pytest.mark.parametrize('engine', _engines())
+def test_group_sum_equals_pandas(base_and_batch, engine):
+    _, _, frame = base_and_batch
+    backend = SqlQueryBackend(frame, engine=engine)
+
+    for column in COUNTERS:
+        result = backend.group_sum('species', column, region='Asia')
+        selected = frame[frame['region'] == 'Asia']
+        expected = selected.groupby('species', observed=True)[column].sum()
+
+        assert dict(zip(result['species'], result[column])) == expected.to_dict()
+    assert backend.most_common('region') == frame['region'].value_counts().index[0]
+
+
+def test_duckdb_reads_source_files(tmp_path):
+    pytest.importorskip('duckdb')
+    folder = tmp_path / "datos d'iris"
+    folder.mkdir()
+    generate_iris_frame(150, seed=1).to_csv(folder / 'parte-1.csv', index=False)
+    generate_iris_frame(90, seed=2).to_csv(folder / "parte-2 l'autre.csv", index=False)
+    # No coincide con el patrón de la fuente: no debe consultarse
+    generate_iris_frame(500, seed=3).to_csv(folder / 'borrador.txt', index=False)
+
+    source = DirectoryDataSource(str(folder), '*.csv')
+    frame = source.load()
+    backend = SqlQueryBackend(engine='duckdb', files=source.files())
+
+    assert backend.count() == len(frame) == 240
+    _assert_same_totals(backend, KpiCube(frame), 'setosa', 'all')
+
+
+def test_query_backend_falls_back_to_frame_with_streamed_rows(tmp_path, monkeypatch):
+    pytest.importorskip('duckdb')
+    generate_iris_frame(150, seed=1).to_csv(tmp_path / 'parte-1.csv', index=False)
+    monkeypatch.setattr(config, 'QUERY_BACKEND', 'duckdb')
+
+    cache = DatasetCache(DirectoryDataSource(str(tmp_path), '*.csv'))
+    snapshot = cache.get_snapshot()
+    assert snapshot.files == (str(tmp_path / 'parte-1.csv'),)
+    assert data_loader.get_query_backend(snapshot).count() == 150
+
+    snapshot = cache.append(generate_iris_frame(30, seed=2))
+    assert snapshot.files is None
+    assert data_loader.get_query_backend(snapshot).count() == 180
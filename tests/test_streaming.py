@@ -0,0 +1,95 @@
+"""
+Pruebas de la ingesta en streaming: agregar lotes equivale a recargar todo
+"""
+import os
+import shutil
+
+import pytest
+
+from data.iris_data import generate_iris_frame
+from data.sources import FileDataSource, GeneratorDataSource
+from data.streaming import SpoolDirectoryIngestor
+from data_loader import DatasetCache
+
+
+def _rows(frame):
+    """Filas como objetos comparables, sin depender del orden ni de los dtypes"""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return sorted(map(repr, frame.itertuples(index=False)))
+
+
+def test_append_equals_full_reload(base_and_batch):
+    base, batch, frame = base_and_batch
+    half = len(batch) // 2
+
+    streamed = DatasetCache(GeneratorDataSource(lambda: base))
+    streamed.get_snapshot().cube
+    streamed.append(batch.iloc[:half])
+    snapshot = streamed.append(batch.iloc[half:])
+
+    full = DatasetCache(GeneratorDataSource(lambda: frame.copy())).get_snapshot()
+
+    assert len(snapshot) == len(full)
+    assert _rows(snapshot.data) == _rows(full.data)
+
+    for species, region in (('all', 'all'), ('setosa', 'all'), ('all', 'Asia')):
+        expected = full.cube.totals(species, region)
+        totals = snapshot.cube.totals(species, region)
+        assert totals['count'] == expected['count']
+        for column, value in expected['sum'].items():
+            assert totals['sum'][column] == pytest.approx(value)
+        assert snapshot.index.count(species=species, region=region) == expected['count']
+
+
+def test_refresh_keeps_streamed_rows(tmp_path):
+    path = tmp_path / 'iris.csv'
+    generate_iris_frame(120, seed=3).to_csv(path, index=False)
+    cache = DatasetCache(FileDataSource(str(path)))
+    cache.get_snapshot()
+    cache.append(generate_iris_frame(30, seed=5))
+
+    generate_iris_frame(80, seed=4).to_csv(path, index=False)
+    os.utime(path, ns=(1, 1))
+
+    snapshot = cache.refresh()
+    assert snapshot is not None
+    assert len(snapshot) == 80 + 30
+    assert snapshot.cube.count() == 80 + 30
+
+    # publish reemplaza todo, incluidas las filas recibidas por streaming
+    assert len(cache.publish(generate_iris_frame(10, seed=6))) == 10
+
+
+def test_spool_moves_files_and_ingests_once(tmp_path):
+    cache = DatasetCache(GeneratorDataSource(lambda: generate_iris_frame(100, seed=1)))
+    cache.get_snapshot()
+    generate_iris_frame(40, seed=2).to_csv(tmp_path / 'lote-1.csv', index=False)
+    (tmp_path / 'roto.csv').write_bytes(b'\xff\xfe\x00 no es un csv')
+
+    ingestor = SpoolDirectoryIngestor(cache, str(tmp_path))
+
+    assert ingestor.poll() == 1
+    assert len(cache.get_snapshot()) == 140
+    assert os.listdir(tmp_path / 'processed') == ['lote-1.csv']
+    assert os.listdir(tmp_path / 'failed') == ['roto.csv']
+
+    # Una segunda revisión no vuelve a agregar ni a leer nada
+    assert ingestor.poll() == 0
+    assert len(cache.get_snapshot()) == 140
+
+
+def test_spool_failed_move_does_not_reingest(tmp_path, monkeypatch):
+    cache = DatasetCache(GeneratorDataSource(lambda: generate_iris_frame(100, seed=1)))
+    cache.get_snapshot()
+    generate_iris_frame(40, seed=2).to_csv(tmp_path / 'lote-1.csv', index=False)
+
+    ingestor = SpoolDirectoryIngestor(cache, str(tmp_path))
+
+    def failing_move(source, target):
+        raise OSError('disco lleno')
+
+    monkeypatch.setattr(shutil, 'move', failing_move)
+
+    assert ingestor.poll() == 1
+    assert ingestor.poll() == 0
+    assert len(cache.get_snapshot()) == 140
@@ -0,0 +1,264 @@
+"""
+Latencia, llamadas, errores y bytes de cada callback
+
+instrument_callbacks(app, metrics) devuelve un objeto que se usa en lugar de
+la app en las funciones register_*: su .callback envuelve cada función con
+un cronómetro. Los callbacks en segundo plano (background=True) corren en
+otro proceso: su medición viaja por una cola en la cache del manager
+(diskcache) y el proceso web la suma al consultar los contadores.
+
+register_metrics_endpoint publica los contadores en formato de texto de
+Prometheus (por defecto en /metrics y solo para peticiones locales).
+"""
+import functools
+import threading
+import time
+
+from dash.exceptions import PreventUpdate
+from flask import Response, abort, g, request
+
+# Límites superiores (segundos) de las cubetas del histograma de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prefijo de la cola de diskcache con las mediciones de los background callbacks
+QUEUE_PREFIX = 'iris-callback-metrics'
+
+LOCAL_ADDRESSES = {'127.0.0.1', '::1', 'localhost'}
+
+
+class CallbackMetrics:
+    """Acumula latencias (histograma), llamadas, errores y bytes por callback"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Límites superiores de las cubetas de latencia, en segundos
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._stats = {}
+        self._queues = []
+        self._lock = threading.Lock()
+
+    def _entry(self, name):
+        return self._stats.setdefault(name, {
+            'calls': 0,
+            'errors': 0,
+            'seconds': 0.0,
+            'max_seconds': 0.0,
+            'bytes': 0,
+            'buckets': [0] * (len(self.buckets) + 1)
+        })
+
+    def record_call(self, name, seconds, error=False):
+        """Suma una ejecución de `seconds` segundos al callback indicado"""
+        position = next((i for i, bound in enumerate(self.buckets) if seconds <= bound),
+                        len(self.buckets))
+        with self._lock:
+            entry = self._entry(name)
+            entry['calls'] += 1
+            entry['errors'] += int(error)
+            entry['seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            entry['buckets'][position] += 1
+
+    def record_bytes(self, name, size):
+        """Suma `size` bytes de respuesta al callback indicado"""
+        with self._lock:
+            self._entry(name)['bytes'] += size
+
+    def attach_queue(self, cache, prefix=QUEUE_PREFIX):
+        """
+        Suma también las mediciones que otros procesos dejan en una cola
+        Args:
+            cache: diskcache.Cache compartida (p. ej. DiskcacheManager.handle)
+            prefix: Prefijo de la cola dentro de la cache
+        """
+        if not any(queue is cache for queue, _ in self._queues):
+            self._queues.append((cache, prefix))
+
+    def _drain(self):
+        """Pasa a los contadores las mediciones pendientes en las colas"""
+        for cache, prefix in self._queues:
+            while True:
+                try:
+                    _, record = cache.pull(prefix=prefix)
+                except Exception as e:
+                    print(f"Error al leer las métricas de los callbacks en segundo plano: {e}")
+                    break
+                if record is None:
+                    break
+                self.record_call(*record)
+
+    def stats(self):
+        """Copia de los contadores por callback"""
+        self._drain()
+        with self._lock:
+            return {name: dict(entry, buckets=list(entry['buckets']))
+                    for name, entry in self._stats.items()}
+
+    def quantile(self, entry, fraction):
+        """
+        Cuantil aproximado de latencia a partir del histograma
+        Returns:
+            Límite superior de la cubeta que contiene el cuantil (el máximo
+            observado si cae en la última), o None sin llamadas
+        """
+        if not entry['calls']:
+            return None
+
+        target = fraction * entry['calls']
+        cumulative = 0
+        for bound, count in zip(self.buckets, entry['buckets']):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, entry['max_seconds'])
+        return entry['max_seconds']
+
+    def summary(self):
+        """
+        Filas para mostrar, ordenadas por tiempo total
+        Returns:
+            Lista de diccionarios con callback, calls, errors, mean_ms, p50_ms,
+            p95_ms, max_ms y kb
+        """
+        rows = []
+        for name, entry in self.stats().items():
+            calls = entry['calls']
+            rows.append({
+                'callback': name,
+                'calls': calls,
+                'errors': entry['errors'],
+                'total_s': entry['seconds'],
+                'mean_ms': entry['seconds'] / calls * 1000 if calls else 0.0,
+                'p50_ms': (self.quantile(entry, 0.50) or 0.0) * 1000,
+                'p95_ms': (self.quantile(entry, 0.95) or 0.0) * 1000,
+                'max_ms': entry['max_seconds'] * 1000,
+                'kb': entry['bytes'] / 1024
+            })
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+    def format_prometheus(self, prefix='iris_callback'):
+        """Texto en formato de exposición de Prometheus (versión 0.0.4)"""
+        stats = sorted(self.stats().items())
+        lines = [
+            f"# HELP {prefix}_duration_seconds Latencia de la función del callback",
+            f"# TYPE {prefix}_duration_seconds histogram"
+        ]
+        for name, entry in stats:
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_duration_seconds_bucket{{callback="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_duration_seconds_sum{{callback="{label}"}} {entry["seconds"]!r}')
+            lines.append(f'{prefix}_duration_seconds_count{{callback="{label}"}} {entry["calls"]}')
+
+        for metric, key, description in (
+            ('calls_total', 'calls', 'Ejecuciones del callback'),
+            ('errors_total', 'errors', 'Ejecuciones que terminaron con una excepción'),
+            ('response_bytes_total', 'bytes', 'Bytes de las respuestas JSON sin comprimir')
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, entry in stats:
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}{{callback="{label}"}} {entry[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+class _InstrumentedApp:
+    """App Dash cuyo .callback mide cada función registrada"""
+
+    def __init__(self, app, metrics):
+        self._app = app
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+        background = bool(kwargs.get('background'))
+
+        if background:
+            # La función corre en un proceso del manager: la medición se deja
+            # en la cola de su cache y el proceso web la lee en stats()
+            cache = getattr(kwargs.get('manager'), 'handle', None)
+            if not hasattr(cache, 'push'):
+                print("El manager de background callbacks no usa diskcache; "
+                      "esos callbacks no se miden")
+                return register
+            self._metrics.attach_queue(cache)
+
+            def record(name, seconds, error):
+                cache.push((name, seconds, error), prefix=QUEUE_PREFIX)
+        else:
+            record = self._metrics.record_call
+
+        def decorator(function):
+            name = function.__name__
+
+            @functools.wraps(function)
+            def timed(*callback_args, **callback_kwargs):
+                if not background:
+                    g.callback_metric = name
+                start = time.perf_counter()
+                error = False
+                try:
+                    return function(*callback_args, **callback_kwargs)
+                except PreventUpdate:
+                    raise
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    try:
+                        record(name, time.perf_counter() - start, error)
+                    except Exception as e:
+                        print(f"Error al registrar la métrica de {name}: {e}")
+
+            return register(timed)
+
+        return decorator
+
+
+def instrument_callbacks(app, metrics):
+    """
+    App a pasar a las funciones register_* para medir sus callbacks
+    Args:
+        app: Aplicación Dash
+        metrics: CallbackMetrics (None = sin medición, retorna la app)
+    """
+    if metrics is None:
+        return app
+
+    @app.server.after_request
+    def record_callback_bytes(response):
+        name = g.get('callback_metric')
+        if name and response.status_code == 200 and not response.direct_passthrough:
+            try:
+                metrics.record_bytes(name, len(response.get_data()))
+            except Exception as e:
+                print(f"Error al medir la respuesta del callback: {e}")
+        return response
+
+    return _InstrumentedApp(app, metrics)
+
+
+def register_metrics_endpoint(app, metrics, path='/metrics', public=False):
+    """
+    Publica las métricas de los callbacks en texto de Prometheus
+    Args:
+        app: Aplicación Dash
+        metrics: CallbackMetrics
+        path: Ruta del endpoint
+        public: Si False, solo responde a peticiones desde la misma máquina
+    """
+    def callback_metrics():
+        if not public and request.remote_addr not in LOCAL_ADDRESSES:
+            abort(403)
+        return Response(metrics.format_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    app.server.add_url_rule(path, 'callback_metrics', callback_metrics)
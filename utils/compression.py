@@ -0,0 +1,135 @@
+"""
+Compresión y cache HTTP de las respuestas de Dash
+
+- Callbacks, layout, dependencias y archivos JS/CSS se comprimen con brotli
+  (si está instalado: `pip install brotli`) o gzip cuando superan un tamaño
+  mínimo y el navegador lo acepta.
+- /_dash-layout y /_dash-dependencies llevan un ETag: en una visita repetida
+  el navegador pregunta con If-None-Match y recibe un 304 sin cuerpo.
+- Los archivos de assets/ con versión en la URL (?m=<fecha>, la agrega Dash)
+  se guardan en la cache del navegador por mucho tiempo.
+
+Se registra con un hook after_request de Flask. Flask ejecuta esos hooks en
+orden inverso al de registro: register_compression debe llamarse antes que
+register_payload_report para que este mida las respuestas sin comprimir.
+"""
+import gzip
+import hashlib
+
+from flask import request
+
+from utils.lru_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/css',
+    'text/html',
+    'text/plain',
+    'image/svg+xml'
+}
+
+# Respuestas que cambian poco y se validan con ETag
+ETAG_PATHS = ('/_dash-layout', '/_dash-dependencies')
+
+
+def choose_encoding(accept_encoding):
+    """
+    Codificación a usar según el encabezado Accept-Encoding
+    Returns:
+        'br', 'gzip' o None
+    """
+    accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_body(data, encoding, static=False):
+    """
+    Comprime un cuerpo de respuesta
+    Args:
+        data: Bytes sin comprimir
+        encoding: 'br' o 'gzip'
+        static: Si True (archivos que se comprimen una vez y se guardan),
+            usa el nivel máximo; si no, uno rápido para respuestas dinámicas
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if static else 5)
+    return gzip.compress(data, compresslevel=9 if static else 6)
+
+
+def register_compression(app, min_size=1024, static_max_age=31536000, etags=True):
+    """
+    Activa compresión y cache HTTP en una app Dash
+    Args:
+        app: Aplicación Dash
+        min_size: Bytes mínimos para comprimir una respuesta (0 = no comprimir)
+        static_max_age: Segundos de cache para assets con versión en la URL
+            (0 = no cambiar los encabezados de cache)
+        etags: Si True, ETag y 304 para el layout y las dependencias
+    """
+    # Archivos JS/CSS (paquetes de componentes, assets) ya comprimidos
+    static_cache = LRUCache(64)
+
+    @app.server.after_request
+    def compress_and_cache(response):
+        try:
+            path = request.path
+
+            if etags and path.endswith(ETAG_PATHS) and response.status_code == 200:
+                # ETag débil: el mismo para el cuerpo comprimido o no
+                digest = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+                response.set_etag(digest, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.make_conditional(request)
+
+            is_asset = f"/{app.config.assets_url_path.strip('/')}/" in path
+            if static_max_age and is_asset and 'm' in request.args and response.status_code == 200:
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = static_max_age
+
+            if is_asset and response.direct_passthrough and response.status_code == 200:
+                # Flask envía los assets como archivo; son pequeños y la
+                # versión comprimida queda en static_cache
+                response.direct_passthrough = False
+
+            if (not min_size
+                    or response.status_code != 200
+                    or response.direct_passthrough
+                    or 'Content-Encoding' in response.headers
+                    or response.mimetype not in COMPRESSIBLE_TYPES):
+                return response
+
+            encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+            response.vary.add('Accept-Encoding')
+            if encoding is None:
+                return response
+
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+
+            if '/_dash-component-suites/' in path or is_asset:
+                key = (path, request.query_string, encoding, len(data))
+                body = static_cache.get_or_set(key, lambda: compress_body(data, encoding, static=True))
+            else:
+                body = compress_body(data, encoding)
+
+            if len(body) < len(data):
+                response.set_data(body)
+                response.headers['Content-Encoding'] = encoding
+        except Exception as e:
+            print(f"Error al comprimir la respuesta: {e}")
+
+        return response
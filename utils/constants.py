@@ -0,0 +1,25 @@
+"""
+Valores conocidos de los filtros del dashboard
+"""
+
+SPECIES = ('setosa', 'versicolor', 'virginica')
+
+REGIONS = ('North America', 'Europe', 'Asia', 'South America')
+
+# Variables numéricas de feature-selector y boxplot-feature-selector
+FEATURES = (
+    'sepal length (cm)',
+    'sepal width (cm)',
+    'petal length (cm)',
+    'petal width (cm)'
+)
+
+# Preset de filter-preset-dropdown -> (especie, región)
+FILTER_PRESETS = {
+    'all': ('all', 'all'),
+    'setosa-na': ('setosa', 'North America'),
+    'versicolor-eu': ('versicolor', 'Europe'),
+    'virginica-asia': ('virginica', 'Asia'),
+    'large-flowers': ('virginica', 'all'),  # Virginica tiene flores más grandes
+    'small-flowers': ('setosa', 'all')      # Setosa tiene flores más pequeñas
+}
@@ -0,0 +1,77 @@
+"""
+Funciones auxiliares compartidas por datos y gráficas
+"""
+import hashlib
+import threading
+import weakref
+
+# id(DataFrame) -> (referencia débil, huella) de las huellas registradas
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def register_fingerprint(df, fingerprint):
+    """
+    Asocia una huella conocida a un DataFrame (p. ej. versión y filtros de
+    una vista), para no tener que calcularla recorriendo los datos
+    La huella se olvida sola cuando el DataFrame deja de existir.
+    Args:
+        df: DataFrame de solo lectura
+        fingerprint: Valor hashable que identifica su contenido
+    Returns:
+        El mismo DataFrame
+    """
+    key = id(df)
+
+    def forget(ref):
+        with _fingerprints_lock:
+            entry = _fingerprints.get(key)
+            if entry is not None and entry[0] is ref:
+                del _fingerprints[key]
+
+    ref = weakref.ref(df, forget)
+    with _fingerprints_lock:
+        _fingerprints[key] = (ref, fingerprint)
+    return df
+
+
+def data_fingerprint(df):
+    """
+    Huella barata del contenido de un DataFrame
+    Usa la huella registrada si existe; si no, un hash de los valores
+    (pd.util.hash_pandas_object), las columnas y sus tipos.
+    Args:
+        df: DataFrame (o None)
+    Returns:
+        Valor hashable; DataFrames con el mismo contenido dan la misma huella
+    """
+    if df is None:
+        return None
+
+    with _fingerprints_lock:
+        entry = _fingerprints.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    import pandas as pd
+
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()
+    return ('hash', tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes), digest)
+
+
+def freeze(value):
+    """
+    Convierte listas, tuplas, conjuntos y diccionarios (anidados) en valores
+    hashables, para usarlos como llave de cache
+    Raises:
+        TypeError: Si algún valor no es hashable
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return value
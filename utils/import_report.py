@@ -0,0 +1,88 @@
+"""
+Reporte del costo de importación (arranque en frío) del dashboard
+
+Uso:
+    python -m utils.import_report            # importa app.py
+    python -m utils.import_report charts --top 15
+
+Ejecuta `python -X importtime` en un proceso nuevo y agrupa los tiempos por
+paquete de primer nivel, para ver qué librerías pesan en el arranque.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_imports(module='app'):
+    """
+    Importa un módulo en un proceso nuevo y mide cada importación
+    Returns:
+        Lista de diccionarios con module, self_us, cumulative_us y depth
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                'module': name,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': len(indent) // 2
+            })
+    return entries
+
+
+def summarize_by_package(entries):
+    """Suma el tiempo propio de cada módulo por paquete de primer nivel"""
+    totals = defaultdict(int)
+    for entry in entries:
+        totals[entry['module'].split('.')[0]] += entry['self_us']
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def format_report(entries, top=20):
+    """Texto del reporte: total, paquetes más costosos y módulos más costosos"""
+    total_us = sum(entry['self_us'] for entry in entries)
+    lines = [f"Tiempo total de importación: {total_us / 1000:,.1f} ms ({len(entries)} módulos)", ""]
+
+    lines.append(f"{'Paquete':<32}{'ms':>10}{'%':>8}")
+    for package, self_us in summarize_by_package(entries)[:top]:
+        lines.append(f"{package:<32}{self_us / 1000:>10,.1f}{self_us * 100 / total_us:>8.1f}")
+
+    lines.append("")
+    lines.append(f"{'Módulo (acumulado)':<48}{'ms':>10}")
+    slowest = sorted(entries, key=lambda entry: entry['cumulative_us'], reverse=True)
+    for entry in slowest[:top]:
+        lines.append(f"{entry['module']:<48}{entry['cumulative_us'] / 1000:>10,.1f}")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Costo de importación por módulo')
+    parser.add_argument('module', nargs='?', default='app', help='Módulo a importar')
+    parser.add_argument('--top', type=int, default=20, help='Filas por tabla')
+    args = parser.parse_args()
+
+    print(format_report(measure_imports(args.module), args.top))
+
+
+if __name__ == '__main__':
+    main()
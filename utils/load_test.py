@@ -0,0 +1,158 @@
+"""
+Prueba de carga de los callbacks del dashboard contra un servidor en marcha
+
+Uso:
+    python -m utils.load_test http://127.0.0.1:8050 --requests 2000 --concurrency 32
+
+Envía peticiones a /_dash-update-component con combinaciones de filtros al
+azar (histograma, box plot, dona, barras, mapa de calor y dispersión) desde
+varios hilos y reporta peticiones por segundo y latencias. Las gráficas se
+piden completas, como en la primera carga de la página; con
+IRIS_BACKGROUND_CALLBACKS=1 la dispersión y el mapa de calor responden con
+un trabajo en segundo plano y la medición no es comparable.
+"""
+import argparse
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.constants import FEATURES, REGIONS, SPECIES
+
+
+def _callback(output, inputs, state=(), extra_outputs=()):
+    """
+    Cuerpo de una petición de callback para una gráfica
+    Args:
+        output: id del dcc.Graph
+        inputs: Lista de (id, propiedad, valor) en el orden del callback
+        state: Lista de (id, propiedad, valor) de los State
+        extra_outputs: Lista de (id, propiedad) de otros outputs del callback
+    """
+    outputs = [(output, 'figure')] + list(extra_outputs)
+    if len(outputs) == 1:
+        output_key = f'{output}.figure'
+        output_spec = {'id': output, 'property': 'figure'}
+    else:
+        output_key = '..' + '...'.join(f'{component}.{prop}' for component, prop in outputs) + '..'
+        output_spec = [{'id': component, 'property': prop} for component, prop in outputs]
+
+    return {
+        'output': output_key,
+        'outputs': output_spec,
+        'inputs': [{'id': component, 'property': prop, 'value': value}
+                   for component, prop, value in inputs],
+        'changedPropIds': [],
+        'state': [{'id': component, 'property': prop, 'value': value}
+                  for component, prop, value in state]
+    }
+
+
+def random_request(rng):
+    """Petición al azar entre las gráficas principales"""
+    species = ('species-filter', 'value', rng.choice(('all',) + SPECIES))
+    region = ('region-filter', 'value', rng.choice(('all',) + REGIONS))
+    version = ('dataset-version-store', 'data', None)
+    feature = rng.choice(FEATURES)
+
+    return rng.choice([
+        _callback('histogram-chart', [species, ('feature-selector', 'value', feature)]),
+        _callback('box-plot-chart', [species, ('boxplot-feature-selector', 'value', feature)]),
+        _callback('pie-chart', [region, version]),
+        _callback('bar-chart', [species, version],
+                  state=[('bar-chart-traces', 'data', None)],
+                  extra_outputs=[('bar-chart-traces', 'data')]),
+        _callback('heatmap-chart', [species]),
+        _callback('scatter-chart', [species, region])
+    ])
+
+
+def _send(url, body, timeout):
+    """Envía una petición; retorna (segundos, bytes, error)"""
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            size = len(response.read())
+        return time.perf_counter() - start, size, None
+    except Exception as e:
+        return time.perf_counter() - start, 0, str(e)
+
+
+def run_load_test(base_url, requests=1000, concurrency=16, seed=0, timeout=60):
+    """
+    Ejecuta la prueba de carga
+    Args:
+        base_url: URL del dashboard (p. ej. http://127.0.0.1:8050)
+        requests: Número total de peticiones
+        concurrency: Peticiones simultáneas
+        seed: Semilla de la mezcla de peticiones
+        timeout: Segundos máximos por petición
+    Returns:
+        Diccionario con requests, errors, seconds, throughput, bytes y
+        latencias p50/p95/p99 (ms)
+    """
+    url = base_url.rstrip('/') + '/_dash-update-component'
+    rng = random.Random(seed)
+    bodies = [random_request(rng) for _ in range(requests)]
+
+    # Una petición previa: la primera figura paga importaciones y caches
+    _send(url, bodies[0], timeout)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda body: _send(url, body, timeout), bodies))
+    seconds = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, error in results if error is None)
+    errors = [error for _, _, error in results if error is not None]
+
+    def percentile(fraction):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    return {
+        'requests': requests,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'seconds': seconds,
+        'throughput': len(latencies) / seconds if seconds else 0.0,
+        'bytes': sum(size for _, size, _ in results),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99)
+    }
+
+
+def format_report(result):
+    """Texto del resultado de run_load_test"""
+    lines = [
+        f"Peticiones: {result['requests']:,} ({result['errors']:,} con error) "
+        f"en {result['seconds']:,.1f} s",
+        f"Rendimiento: {result['throughput']:,.1f} peticiones/s "
+        f"({result['bytes'] / result['seconds'] / 1024:,.0f} KB/s)",
+        f"Latencia: p50 {result['p50_ms']:,.0f} ms | p95 {result['p95_ms']:,.0f} ms "
+        f"| p99 {result['p99_ms']:,.0f} ms"
+    ]
+    if result['first_error']:
+        lines.append(f"Primer error: {result['first_error']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga de los callbacks')
+    parser.add_argument('url', nargs='?', default='http://127.0.0.1:8050', help='URL del dashboard')
+    parser.add_argument('--requests', type=int, default=1000, help='Peticiones totales')
+    parser.add_argument('--concurrency', type=int, default=16, help='Peticiones simultáneas')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de la mezcla')
+    args = parser.parse_args()
+
+    print(format_report(run_load_test(args.url, args.requests, args.concurrency, args.seed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Cache LRU acotada y segura entre hilos, con contadores de aciertos
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache con tamaño máximo que descarta primero lo menos usado"""
+
+    def __init__(self, maxsize=128):
+        """
+        Args:
+            maxsize: Número máximo de entradas (0 desactiva la cache)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def get(self, key, default=None):
+        """Retorna el valor guardado (y lo marca como recién usado)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Guarda un valor, descartando el menos usado si se supera el tamaño"""
+        if self.maxsize <= 0:
+            return value
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get_or_set(self, key, factory):
+        """
+        Retorna el valor guardado o lo calcula con factory()
+        Si varios hilos piden la misma llave a la vez, solo uno la calcula y
+        los demás esperan su resultado.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._data:
+                    return self._data[key]
+            try:
+                return self.set(key, factory())
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def clear(self):
+        """Vacía la cache (los contadores se conservan)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Contadores de uso de la cache"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / requests if requests else 0.0
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
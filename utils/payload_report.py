@@ -0,0 +1,83 @@
+"""
+Tamaño de las respuestas de cada callback (ancho de banda por gráfica)
+
+Se registra con un hook after_request de Flask sobre /_dash-update-component
+y acumula, por output del callback, llamadas, bytes totales y máximos.
+"""
+import threading
+
+from flask import request
+
+
+class PayloadReport:
+    """Acumula el tamaño de las respuestas por output de callback"""
+
+    def __init__(self, log=False):
+        """
+        Args:
+            log: Si True, imprime el tamaño de cada respuesta
+        """
+        self.log = log
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, output, size):
+        """Suma una respuesta de `size` bytes al output indicado"""
+        with self._lock:
+            entry = self._stats.setdefault(output, {'calls': 0, 'bytes': 0, 'max_bytes': 0})
+            entry['calls'] += 1
+            entry['bytes'] += size
+            entry['max_bytes'] = max(entry['max_bytes'], size)
+
+        if self.log:
+            print(f"Respuesta {output}: {size:,} bytes")
+
+    def stats(self):
+        """Copia de los contadores por output"""
+        with self._lock:
+            return {output: dict(entry) for output, entry in self._stats.items()}
+
+    def format_report(self):
+        """Texto con los outputs ordenados por bytes totales"""
+        stats = sorted(self.stats().items(), key=lambda item: item[1]['bytes'], reverse=True)
+
+        lines = [f"{'Output':<48}{'llamadas':>10}{'KB total':>12}{'KB prom.':>10}{'KB máx.':>10}"]
+        for output, entry in stats:
+            lines.append(
+                f"{output[:47]:<48}{entry['calls']:>10}{entry['bytes'] / 1024:>12,.1f}"
+                f"{entry['bytes'] / entry['calls'] / 1024:>10,.1f}{entry['max_bytes'] / 1024:>10,.1f}"
+            )
+        return "\n".join(lines)
+
+
+def register_payload_report(app, log=False):
+    """
+    Mide las respuestas de los callbacks de una app Dash
+    Args:
+        app: Aplicación Dash
+        log: Si True, imprime el tamaño de cada respuesta
+    Returns:
+        PayloadReport con los contadores
+    """
+    report = PayloadReport(log)
+
+    @app.server.after_request
+    def record_callback_payload(response):
+        if not request.path.endswith('/_dash-update-component') or response.status_code != 200:
+            return response
+
+        try:
+            data = response.get_data()
+            # Callbacks en segundo plano: solo cuenta la respuesta con el resultado
+            if data.startswith(b'{"cacheKey"') or (
+                    'cacheKey' in request.args and b'"response"' not in data):
+                return response
+
+            body = request.get_json(silent=True) or {}
+            report.record(body.get('output', '?'), len(data))
+        except Exception as e:
+            print(f"Error al medir la respuesta del callback: {e}")
+
+        return response
+
+    return report
@@ -0,0 +1,27 @@
+"""
+Punto de entrada WSGI para producción
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Con preload_app (gunicorn.conf.py) este módulo se importa una vez en el
+proceso maestro: el dataset y sus índices quedan construidos antes del fork
+y los workers comparten esa memoria (copy-on-write).
+"""
+import gc
+
+from app import app
+from callbacks.warmup import prime_builders
+from data_loader import preload_dataset
+
+# Dataset, índice de filtros, cubos y columnas ordenadas antes del fork
+preload_dataset()
+
+# Una figura de cada tipo: plantillas de plotly, plotly.express y sklearn
+# quedan cargados (su inicialización diferida no es segura entre hilos)
+prime_builders()
+
+# Los objetos ya creados pasan a la generación permanente: el recolector de
+# basura de cada worker no los toca y sus páginas siguen compartidas
+gc.freeze()
+
+application = app.server